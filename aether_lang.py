@@ -1,4 +1,5 @@
 # /home/isidore-admin/aether/aether_lang.py
+import math
 import numpy as np
 import random
 import re
@@ -6,19 +7,20 @@ import unittest
 import sys
 import threading
 import time  # Added for sleep in Regulator
+import weakref
+
+from render import render
+from precision import add_at, get_precision, precision_of, to_compute, to_storage
+from kernels import interior_mean
+from runtime import COMMAND, KNOWN_INFLECTIONS, inflection_map, resolve_verb
 
 # --- Grammar ---
 KNOWN_VERBS = ['PERTURBO', 'CONVERGO', 'TOGGEO', 'VERITAS', 'CREO', 'OSTENDO', 'FOCUS', 'SIMULO', 'ANOMALIA', 'MULTIVERSUM']
-KNOWN_INFLECTIONS = ['ABAM', 'EBAM', 'AM', 'O', 'E']
-inflection_map = {
-    'O': {'mod': 1.0}, 'E': {'mod': -1.0}, 'ABAM': {'mod': 1.5},
-    'EBAM': {'mod': -0.5}, 'AM': {'mod': random.uniform(0.5, 1.5)}
-}
 
 # --- Cohesive Flux Framework (CFF): Unified Plenum ---
 class FluxCore:
-    def __init__(self, size=10):
-        self.grid = np.zeros((size, size))
+    def __init__(self, size=10, precision=None):
+        self.grid = np.zeros((size, size), dtype=get_precision(precision).storage)
         self.energy = 0.0
         self.memory_patterns = []
         self.identity_wave = 0.0
@@ -26,17 +28,24 @@ class FluxCore:
 
     def perturb(self, x, y, amp, mod=1.0):
         flux_change = amp * mod
-        self.grid[x, y] += flux_change
+        p = precision_of(self.grid)
+        self.grid[x, y] = to_storage(to_compute(self.grid[x, y], p) + flux_change, p)
         self.energy += abs(flux_change)
         self._update_memory(flux_change)
         self.embed_context(f'chunk_{len(self.memory_patterns)}', [flux_change])
 
+    def perturb_batch(self, xs, ys, amps, mod=1.0, chunks=None):
+        """Many perturbs as one scatter-add; `chunks` replace the per-perturb context entries."""
+        flux_changes = np.asarray(amps, dtype=np.float64) * mod
+        add_at(self.grid, (np.asarray(xs), np.asarray(ys)), flux_changes, precision_of(self.grid))
+        self.energy += float(np.abs(flux_changes).sum())
+        start = len(self.memory_patterns)
+        self.memory_patterns.extend(flux_changes.tolist())
+        entries = chunks if chunks is not None else ([f] for f in flux_changes.tolist())
+        self.context_embeddings.update((f'chunk_{start + i + 1}', entry) for i, entry in enumerate(entries))
+
     def converge(self):
-        new_grid = np.copy(self.grid)
-        for i in range(1, self.grid.shape[0]-1):
-            for j in range(1, self.grid.shape[1]-1):
-                new_grid[i, j] = np.mean(self.grid[i-1:i+2, j-1:j+2])
-        self.grid = new_grid
+        self.grid = interior_mean(self.grid)  # 3x3 means of the interior; the border stays put
         self.energy = np.sum(np.abs(self.grid))
         self._synthesize_identity()
 
@@ -56,33 +65,88 @@ class FluxCore:
     def create(self):
         self.converge()
 
-    def display(self):
+    def summary(self):
         return (f"FLUXUS: {self.energy:.2f} | MEMORIA: {len(self.memory_patterns)} | "
-                f"IDENTITAS: {self.identity_wave:.2f}\nGRIDUM:\n{self.grid}\n"
-                f"CONTEXTUS: {self.context_embeddings}")
+                f"IDENTITAS: {self.identity_wave:.2f}")
+
+    def display(self, **options):
+        options.setdefault('grid', True)
+        return render(self, **options)
 
 # --- Dialectic Regulator (Scheduler) ---
+REGULATOR_PERIOD = 1.0  # Cycle rhythm (1s for demo)
+
 class DialecticRegulator:
-    def __init__(self, context):
-        self.context = context
-        self.thread = threading.Thread(target=self.regulate, daemon=True)
-        self.thread.start()
+    """One thread that regulates every registered context once per period.
+
+    The thread starts with the first registration and exits after the last context
+    unregisters. Contexts are held weakly, so a context dropped without close() also
+    stops being regulated. Thread count and wakeups stay the same however many
+    contexts exist.
+    """
+    def __init__(self, period=REGULATOR_PERIOD):
+        self.period = period
+        self._contexts = weakref.WeakSet()
+        self._mutex = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def register(self, context):
+        with self._mutex:
+            self._contexts.add(context)
+            self._stopped = False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='DialecticRegulator', daemon=True)
+                self._thread.start()
+
+    def unregister(self, context):
+        with self._mutex:
+            self._contexts.discard(context)
+            self._mutex.notify_all()
+
+    def shutdown(self):
+        """Drops every context and waits for the thread to exit."""
+        with self._mutex:
+            self._contexts.clear()
+            self._stopped = True
+            thread = self._thread
+            self._mutex.notify_all()
+        if thread is not None and thread is not threading.current_thread(): thread.join()
 
-    def regulate(self):
+    def _run(self):
         while True:
-            for name, core in self.context.materiae.items():
-                entropy = np.var(core.grid)  # Entropy as variance
-                if entropy > 10:  # High entropy threshold
-                    core.destruct()  # Unstructure chaos
-                elif core.energy < 0.5:  # Low vitality
-                    core.create()  # Synthesize order
-            time.sleep(1)  # Cycle rhythm (1s for demo)
+            with self._mutex:
+                if not self._stopped and len(self._contexts): self._mutex.wait(self.period)
+                if self._stopped or not len(self._contexts):
+                    self._thread = None
+                    return
+                contexts = list(self._contexts)
+            for context in contexts:
+                self.regulate(context)
+
+    @staticmethod
+    def regulate(context):
+        """One regulation pass over a context's materiae."""
+        for name, core in list(context.materiae.items()):
+            entropy = np.var(core.grid, dtype=precision_of(core.grid).compute)  # Entropy as variance
+            if entropy > 10:  # High entropy threshold
+                core.destruct()  # Unstructure chaos
+            elif core.energy < 0.5:  # Low vitality
+                core.create()  # Synthesize order
+
+REGULATOR = DialecticRegulator()  # Shared by every Contextus unless one is passed in
 
 class Contextus:
-    def __init__(self):
+    def __init__(self, regulator=REGULATOR):
         self.materiae = {}
         self.focus = None
-        self.regulator = DialecticRegulator(self)  # Auto-start Regulator
+        self.regulator = regulator  # None runs without regulation
+        if self.regulator: self.regulator.register(self)
+
+    def close(self):
+        """Leaves the regulator; the last context to leave stops its thread."""
+        if self.regulator: self.regulator.unregister(self)
+        self.regulator = None
 
     def get_focused_materia(self):
         if not self.focus or self.focus not in self.materiae:
@@ -102,30 +166,78 @@ def triad(args, mod_func):
     synthesis = (thesis + (-antithesis) + sum(rest)) / len(args) * mod_func
     return synthesis
 
-def lockers(n=100):
-    states = [0] * n
-    for i in range(1, n + 1):
-        for j in range(i - 1, n, i):
-            states[j] = 1 - states[j]
-    open_count = sum(states)
-    open_positions = [i + 1 for i, s in enumerate(states) if s == 1]
-    return open_count, open_positions
+def chunk_array(seq):
+    """dynamic_chunk as one (k, 3) float array, zero-padded."""
+    values = np.asarray(seq, dtype=np.float64).ravel()
+    k = max(1, -(-values.size // 3))
+    chunks = np.zeros((k, 3))
+    chunks.ravel()[:values.size] = values
+    return chunks
+
+def triad_batch(chunks, mod_func):
+    """triad of every row of a (k, n) array at once."""
+    return (chunks[:, 0] - chunks[:, 1] + chunks[:, 2:].sum(axis=1)) / chunks.shape[1] * mod_func
+
+LOCKER_BLOCK = 1 << 20  # Lockers simulated per block when streaming a step-set rule
+SIMULO_MAX = 1 << 20  # Largest n SIMULO simulates under a step set (it embeds every open position)
+
+def lockers(n=100, steps=None):
+    """(open count, open positions) after pass s toggles every s-th locker, for each s in steps.
+
+    With the classic rule (every s from 1 to n) a locker ends open iff it has an odd
+    number of divisors, i.e. iff it is a perfect square, so no simulation is needed.
+    """
+    n = max(0, n)
+    if steps is None:
+        root = math.isqrt(n)
+        return root, [k * k for k in range(1, root + 1)]
+    positions = np.flatnonzero(toggle_states(n, steps)) + 1
+    return len(positions), positions.tolist()
+
+def toggle_states(n, steps, start=1):
+    """Open (True) / closed states of lockers start..start+n-1 under an arbitrary step set."""
+    states = np.zeros(n, dtype=bool)
+    for s in steps:
+        if s < 1: raise ValueError(f"GRADUS {s} INVALIDUS")
+        first = -start % s  # Index of the first multiple of s at or after `start`
+        states[first::s] ^= True
+    return states
+
+def _locker_blocks(n, steps):
+    """(start, states) for lockers 1..n, LOCKER_BLOCK at a time."""
+    steps = list(steps)
+    for start in range(1, n + 1, LOCKER_BLOCK):
+        yield start, toggle_states(min(LOCKER_BLOCK, n + 1 - start), steps, start)
+
+def iter_open_lockers(n=100, steps=None):
+    """Yields the open positions in order without holding all n states at once."""
+    n = max(0, n)
+    if steps is None:
+        yield from (k * k for k in range(1, math.isqrt(n) + 1))
+        return
+    for start, block in _locker_blocks(n, steps):
+        yield from (np.flatnonzero(block) + start).tolist()
+
+def count_open_lockers(n=100, steps=None):
+    """The open count alone, simulated block by block in bounded memory."""
+    n = max(0, n)
+    if steps is None: return math.isqrt(n)
+    return sum(int(np.count_nonzero(block)) for _, block in _locker_blocks(n, steps))
+
+def parse_steps(num_args):
+    """The optional step set after n in TOGGEO/SIMULO (e.g. TOGGEO 100 2 3); None for the classic rule."""
+    return [int(float(a)) for a in num_args[1:]] or None
 
 # --- Parser and Executor ---
+NUMBER_TOKEN = re.compile(r'(?<!\S)-?\d+\.?\d*(?!\S)')  # Whitespace-separated numeric arguments
 def parse_latin_command(cmd):
-    match = re.match(r"([A-Z]+(?:O|E|ABAM|EBAM|AM)?)\s*(.*)", cmd.strip().upper())
+    match = COMMAND.match(cmd.strip().upper())
     if not match: raise ValueError("FORMATUM INVALIDUM")
     verb_full, args_str = match.groups()
-    verb = verb_full
-    inflection = 'O'
-    for v in KNOWN_VERBS:
-        if verb_full.startswith(v):
-            verb = v
-            inflection = verb_full[len(v):] or 'O'
-            break
+    verb, inflection = resolve_verb(verb_full, tuple(KNOWN_VERBS))
     literal_match = re.search(r"'([^']*)'", args_str)
     literal = literal_match.group(1).upper() if literal_match else None
-    num_args = [a for a in args_str.replace(f"'{literal}'" if literal else "", '').split() if re.match(r'^-?\d+\.?\d*$', a)]
+    num_args = NUMBER_TOKEN.findall(args_str.replace(f"'{literal}'" if literal else "", ''))
     return verb, inflection, num_args, literal
 
 def run_aether_command(cmd, context):
@@ -155,8 +267,9 @@ def run_aether_command(cmd, context):
     
     if verb == 'TOGGEO':
         n = int(num_args[0]) if num_args else 100
-        count, _ = lockers(n)
-        return f"{verb}{echo_inf} {count} APERTOS"
+        return f"{verb}{echo_inf} {count_open_lockers(n, parse_steps(num_args))} APERTOS"
+    if verb == 'SIMULO' and parse_steps(num_args) and int(num_args[0]) > SIMULO_MAX:
+        return f"{verb}{echo_inf} NON ULTRA {SIMULO_MAX} CUM GRADIBUS"
     
     core = context.get_focused_materia()
     core.destruct()  # Dialectic unstructure
@@ -164,16 +277,15 @@ def run_aether_command(cmd, context):
         core.create()  # Synthesize
         return f"{verb}{echo_inf} FLUXUM COHERENTEM {core.energy:.2f} IDENTITATEM {core.identity_wave:.2f}"
     if verb == 'PERTURBO':
-        chunks = dynamic_chunk(num_args)
-        for chunk in chunks:
-            synth = triad(chunk, mod)
-            core.perturb(random.randint(0,9), random.randint(0,9), synth, mod)
-            core.embed_context(f'chunk_{len(core.memory_patterns)}', chunk)
+        chunks = chunk_array(num_args)
+        synths = triad_batch(chunks, mod)
+        xs, ys = np.random.default_rng(random.getrandbits(64)).integers(0, 10, (2, len(chunks)))
+        core.perturb_batch(xs, ys, synths, mod, chunks=chunks.tolist())
         core.create()  # Synthesize
         return f"{verb}{echo_inf} FLUXUM COHERENTEM {core.energy:.2f} IDENTITATEM {core.identity_wave:.2f}"
     if verb == 'SIMULO':
         n = int(num_args[0]) if num_args else 100
-        count, pos = lockers(n)
+        count, pos = lockers(n, parse_steps(num_args))
         core.embed_context('cosmos_lockers', pos)
         core.perturb(random.randint(0,9), random.randint(0,9), count, mod)
         core.create()
@@ -204,6 +316,9 @@ class TestAetherCFF(unittest.TestCase):
         self.context = Contextus()
         print(f"\n--- Testing {self._testMethodName} ---")
 
+    def tearDown(self):
+        self.context.close()
+
     def test_cff_creation_and_focus(self):
         echo = run_aether_command("CREO MATERIAM 'prima'", self.context)
         self.assertIn("MATERIAM 'PRIMA' CONFIRMATUM", echo.upper())
@@ -229,6 +344,73 @@ class TestAetherCFF(unittest.TestCase):
         self.assertIn('chunk_', list(core.context_embeddings.keys())[0])
         print("✓ Identity/context synthesized cohesively.")
 
+    def test_cff_vectorized_converge(self):
+        core = FluxCore(size=12)
+        core.grid[:] = np.random.default_rng(0).random((12, 12))
+        expected = np.copy(core.grid)
+        for i in range(1, 11):
+            for j in range(1, 11):
+                expected[i, j] = np.mean(core.grid[i-1:i+2, j-1:j+2])
+        core.converge()
+        np.testing.assert_allclose(core.grid, expected, atol=1e-6)
+        print("✓ Vectorized converge matches the windowed means; border untouched.")
+
+    def test_cff_batched_perturbo(self):
+        args = [str(v) for v in np.random.default_rng(2).uniform(-5, 5, 3001).round(3)]
+        expected = [triad(chunk, 1.5) for chunk in dynamic_chunk(list(args))]
+        np.testing.assert_allclose(triad_batch(chunk_array(args), 1.5), expected)
+        context = Contextus(regulator=None)
+        run_aether_command("CREO MATERIAM 'batch'", context)
+        run_aether_command("FOCUS MATERIAE 'batch'", context)
+        core = context.get_focused_materia()
+        grid_before = float(core.grid.sum())
+        run_aether_command("PERTURBOABAM " + " ".join(args), context)
+        fluxes = np.array(expected) * 1.5
+        np.testing.assert_allclose(core.memory_patterns[1:], fluxes)  # After the dialectic destruct
+        self.assertEqual(core.context_embeddings[f'chunk_{len(core.memory_patterns)}'], chunk_array(args)[-1].tolist())
+        self.assertNotEqual(float(core.grid.sum()), grid_before)
+        print("✓ Batched PERTURBO matches the per-chunk triads.")
+
+    def test_cff_half_precision_saturates(self):
+        core = FluxCore(size=4, precision='half')
+        core.perturb(1, 1, 1e6)  # Beyond float16's range: computed in float32, saturated on store
+        self.assertEqual(float(core.grid[1, 1]), float(np.finfo(np.float16).max))
+        core.perturb_batch([2, 2], [2, 2], [4e4, 4e4])
+        self.assertEqual(float(core.grid[2, 2]), float(np.finfo(np.float16).max))
+        print("✓ Half-precision perturbs saturate instead of storing inf.")
+
+    def test_cff_lockers(self):
+        def brute(n, steps):
+            states = [0] * n
+            for i in steps:
+                for j in range(i - 1, n, i):
+                    states[j] = 1 - states[j]
+            return [i + 1 for i, s in enumerate(states) if s == 1]
+        self.assertEqual(lockers(100)[1], brute(100, range(1, 101)))
+        self.assertEqual(lockers(100, [2, 3, 3, 7])[1], brute(100, [2, 3, 3, 7]))
+        self.assertEqual(list(iter_open_lockers(50, [1, 4])), brute(50, [1, 4]))
+        self.assertEqual(run_aether_command("TOGGEO 1000000000", self.context), "TOGGEO 31622 APERTOS")
+        self.assertEqual(count_open_lockers(3 * LOCKER_BLOCK + 7, [2, 5]), len(lockers(3 * LOCKER_BLOCK + 7, [2, 5])[1]))
+        self.assertEqual(run_aether_command("TOGGEO -5", self.context), "TOGGEO 0 APERTOS")
+        self.assertEqual(run_aether_command("TOGGEO -5 2", self.context), "TOGGEO 0 APERTOS")
+        self.assertIn("NON ULTRA", run_aether_command(f"SIMULO {SIMULO_MAX + 1} 2", self.context))
+        print("✓ Lockers: closed form, step sets and streaming agree with the simulation.")
+
+    def test_cff_shared_regulator(self):
+        regulator = DialecticRegulator(period=0.01)
+        contexts = [Contextus(regulator) for _ in range(20)]
+        run_aether_command("CREO MATERIAM 'chaos'", contexts[-1])
+        core = contexts[-1].materiae['CHAOS']
+        core.grid[5, 5] = 1000.0  # High entropy, so every pass destructs once
+        time.sleep(0.1)
+        self.assertEqual(sum(t is regulator._thread for t in threading.enumerate()), 1)
+        self.assertGreater(len(core.memory_patterns), 0)
+        thread = regulator._thread
+        for context in contexts: context.close()
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+        print("✓ One regulator thread serves every context and exits after the last.")
+
     def test_tarski_safeguard(self):
         with self.assertRaises(ValueError) as cm:
             run_aether_command("VERITAS SELF", self.context)
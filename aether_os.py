@@ -5,9 +5,14 @@
 # the simulation, manages the state of all 'Materia', and provides the
 # user-facing REPL (Read-Eval-Print Loop) for interacting with the system.
 
+import contextlib
+import io
+import json
 import os
 import re
+import subprocess
 import sys
+import tempfile
 import threading
 import time
 import random
@@ -16,53 +21,32 @@ import unittest
 import cv2
 
 # Import components from the other modules
-from flux_core import FluxCore, Intellectus
+from flux_core import FluxCore, Intellectus, TiledFluxCore, frame_pyramid
 from oracle import get_oracle
+from amplitude import text_to_amp
+import context_store
+from context_store import ContextSnapshot, SnapshotRef
+from render import RENDER_MODES
+from ring_buffer import RingBuffer, MEMORY_CAPACITY, INTELLECTUS_MEMORY
+from sextet import SEXTET_KEYS, SEXTET_TABLE, SextetTable
+from tiled_grid import TiledGrid
+from precision import PRECISIONS, to_compute, to_storage
+from kernels import Kernel, MAX_SPAN, METHODS, smooth, converge as converge_grid
+from persistence import load_plenum, read_snapshot, save_plenum
+from checkpoint import Checkpointer, read_records, recover_plenum
+from journal import CommandJournal, Replayer
+from runtime import Backend, Contextus as Runtime, KNOWN_INFLECTIONS, inflection_map, create_context, parse_latin_command, repl
+from sensor_hook import RecordedSensor, SensorManager, SynchronousSensor, record_sensor
+from training import TrainingScheduler, stream_amplitudes, CONVERGE_EVERY, THROTTLE
 
 # --- AetherOS Grammar and Constants ---
 KNOWN_VERBS = ['PERTURBO', 'CONVERGO', 'CREO', 'OSTENDO', 'FOCUS', 'ANOMALIA', 'VERITAS', 
                'MIRACULUM', 'REDIMO', 'INTERROGO', 'INSTAURO', 'EXERCEO', 'DIALECTICA', 
-               'DOCEO', 'DISCERE', 'AMOR']  # Added AMOR verb
-KNOWN_INFLECTIONS = ['ABAM', 'EBAM', 'AM', 'O', 'E']
-inflection_map = {
-    'O': {'mod': 1.0}, 'E': {'mod': -1.0}, 'ABAM': {'mod': 1.5},
-    'EBAM': {'mod': -0.5}, 'AM': {'mod': random.uniform(0.5, 1.5)}
-}
+               'DOCEO', 'DISCERE', 'AMOR', 'EXERCITIA', 'SUSPENDO', 'RESUMO', 'ABROGO',
+               'SALVO', 'RESTITUO', 'DIARIUM', 'ITERO']
 PHI = (1 + np.sqrt(5)) / 2
 PHI_CUBED = PHI**3  # Threshold for critical flux overflow
 
-# --- Helper Functions ---
-def text_to_amp(text):
-    """Converts a string to a numerical amplitude using a log scale."""
-    return np.log1p(sum(ord(c) for c in text))
-
-def dynamic_chunk_stream(byte_stream, chunk_size=256):
-    """Generator to process a raw byte stream into chunks."""
-    while True:
-        chunk = byte_stream.read(chunk_size)
-        if not chunk: break
-        yield chunk
-
-def training_loop(context, core_name, data_path):
-    """The background process for training an Intellectus from a data file."""
-    print(f"\n< EXERCEO begins for '{core_name}' with stream '{data_path}' >")
-    try:
-        with open(data_path, 'rb') as f:
-            for chunk in dynamic_chunk_stream(f):
-                with context.lock:
-                    if core_name not in context.materiae:
-                        print(f"\n< EXERCEO aborted: '{core_name}' no longer exists. >")
-                        break
-                    core = context.materiae[core_name]
-                    amp = np.log1p(np.sum(np.frombuffer(chunk, dtype=np.uint8)))
-                    core.perturb(random.randint(0, core.size-1), random.randint(0, core.size-1), amp)
-                    core.converge()
-                time.sleep(random.uniform(0.05, 0.15))
-    except FileNotFoundError:
-        print(f"\n< EXERCEO failed: Flumine '{data_path}' not found. >")
-        return
-    print(f"\n< EXERCEO complete for '{core_name}'. >")
-
 # --- Logging Setup ---
 LOG_FILE = "aether_log.txt"
 def log_event(message):
@@ -99,89 +83,69 @@ class DialecticRegulator(threading.Thread):
                         print(f"\n< Regulator: Identity of '{name}' fading. Initiating redemptive synthesis. >")
                         self.context.execute_command(f"REDIMO '{name}'")
                     elif core.resistance > r_thresh and core.resistance > 1.0:
-                        core.perturb(random.randint(0, core.size-1), random.randint(0, core.size-1), -1.0)
+                        self.context.regulate(name, 'perturb', random.randint(0, core.size-1), random.randint(0, core.size-1))
                     elif core.capacitance < c_thresh:
-                        core.converge()
+                        self.context.regulate(name, 'converge')
 
-# --- Main Application Context and Executor ---
-class Contextus:
-    """The container for the entire AetherOS cosmos and command execution."""
-    def __init__(self):
-        self.materiae = {}
-        self.focus = None
-        self.lock = threading.RLock()
-        self.verb_handlers = self._get_verb_handlers()
-        
-        self._boot()
-        self.regulator = DialecticRegulator(self)
-        self.regulator.start()
+# --- Ferro Physics ---
+class FerroBackend(Backend):
+    """Ferrocell FluxCores: a GENESIS core, regulated by the DialecticRegulator thread."""
+    name = 'ferro'
+    title = "AetherOS v3.3"
+    verbs = KNOWN_VERBS
 
-    def _boot(self):
+    def boot(self, context):
         print("< AetherOS v3.3 Gnosis/Imago (Final Modular) Initializing... >")
         g = FluxCore()
-        self.materiae['GENESIS'] = g
-        self.focus = 'GENESIS'
+        context.materiae['GENESIS'] = g
+        context.focus = 'GENESIS'
         g.perturb(5, 5, PHI)
         g.converge()
         print("< Genesis Rhythm Complete. Focus on 'GENESIS'. >")
 
-    def get_focused_materia(self):
-        with self.lock:
-            if not self.focus or self.focus not in self.materiae:
-                self.focus = 'GENESIS' if 'GENESIS' in self.materiae else None
-            if not self.focus:
-                raise ValueError("NULLA MATERIA IN FOCO EST")
-            return self.materiae[self.focus]
+    def regulator(self, context):
+        regulator = DialecticRegulator(context)
+        regulator.start()
+        return regulator
+
+    def regulate(self, context, name, action, args):
+        """The regulator's direct perturb/converge actions on one core."""
+        core = context.materiae.get(name)
+        if core is None: return False
+        if action == 'perturb':
+            core.perturb(*args, -1.0)
+        elif action == 'converge':
+            core.converge()
+        return True
 
-    def execute_command(self, cmd):
-        """Parses and executes a command using the handler mapping."""
-        try:
-            verb, inflection, literals, args_str = self._parse_latin_command(cmd)
-            mod = inflection_map.get(inflection, {'mod': 1.0})['mod']
-
-            handler = self.verb_handlers.get(verb)
-            if handler:
-                return handler(inflection, mod, literals, args_str)
-            else:
-                return f"VERBUM IGNORATUM '{verb}'"
-        except Exception as e:
-            return f"ERRORUM INTERNUM: {e}"
-
-    def _parse_latin_command(self, cmd):
-        """Parses the user's command into its components."""
-        match = re.match(r"([A-Z]+(?:O|E|ABAM|EBAM|AM)?)\s*(.*)", cmd.strip().upper())
-        if not match: raise ValueError("FORMATUM INVALIDUM")
-        
-        verb_full, args_str = match.groups()
-        verb, inflection = verb_full, 'O'
-        
-        for v in KNOWN_VERBS:
-            if verb_full.startswith(v):
-                verb = v
-                inflection = verb_full[len(v):] or 'O'
-                break
-        
-        literals = re.findall(r"'([^']*)'", args_str)
-        return verb, inflection, literals, args_str
-
-    # --- Verb Handler Methods ---
-    def _get_verb_handlers(self):
-        """Maps verb strings to their handler methods."""
-        return {
-            'CREO': self._handle_creo, 'INSTAURO': self._handle_instauro,
-            'FOCUS': self._handle_focus, 'OSTENDO': self._handle_ostendo,
-            'PERTURBO': self._handle_perturbo, 'CONVERGO': self._handle_convergo,
-            'REDIMO': self._handle_redimo, 'INTERROGO': self._handle_interrogo,
-            'EXERCEO': self._handle_exerceo, 'DOCEO': self._handle_doceo,
-            'DISCERE': self._handle_discere, 'DIALECTICA': self._handle_dialectica,
-            'VERITAS': self._handle_veritas, 'MIRACULUM': self._handle_miraculum,
-            'ANOMALIA': self._handle_anomalia, 'AMOR': self._handle_amor  # Added AMOR
-        }
+    def close(self, context):
+        context.trainer.shutdown()
+
+BACKEND = FerroBackend()
+
+# --- Main Application Context ---
+class Contextus(Runtime):
+    """The container for the entire AetherOS cosmos and command execution."""
+    def __init__(self, regulate=True, sensor=None):
+        self.trainer = TrainingScheduler(self)
+        super().__init__(BACKEND, regulate, sensor)
+
+    def _parse_precision(self, args):
+        """Reads an optional PRAECISIO 'HALF'|'SINGLE'|'DOUBLE' clause."""
+        precision = re.search(r"PRAECISIO\s+'([^']*)'", args.upper())
+        if precision and precision.group(1).lower() not in PRECISIONS:
+            raise ValueError(f"PRAECISIO '{precision.group(1)}' IGNOTA")
+        return precision.group(1).lower() if precision else None
 
     def _handle_creo(self, inf, mod, lit, args):
         name = lit[0].upper() if lit else "ANONYMOUS"
         if name in self.materiae: return f"'{name}' IAM EXISTIT"
-        self.materiae[name] = FluxCore()
+        size = re.search(r"MAGNITUDO\s+(\d+)", args.upper())
+        size = int(size.group(1)) if size else None
+        if re.search(r"\bTEGULIS\b", args.upper()):  # Sparse, tiled plane for large cores
+            self.materiae[name] = TiledFluxCore(size or 2048, precision=self._parse_precision(args))
+        else:
+            self.materiae[name] = FluxCore(size or 128, precision=self._parse_precision(args))
         self.focus = name
         return f"CREO MATERIAM '{name}'."
 
@@ -189,7 +153,8 @@ class Contextus:
         name = lit[0].upper()
         arch = (re.search(r"MODO\s+'([^']*)'", args.upper()) or [None, 'TRANSFORMER'])[1]
         if name in self.materiae: return f"'{name}' IAM EXISTIT"
-        self.materiae[name] = Intellectus(architecture=arch)
+        self.materiae[name] = Intellectus(architecture=arch, memory_capacity=self.memory_capacity(args),
+                                          precision=self._parse_precision(args))
         self.focus = name
         return f"INSTAURO INTELLECTUM '{name}' MODO '{arch}'."
     
@@ -200,9 +165,13 @@ class Contextus:
         return f"FOCUS NUNC IN '{name}'."
     
     def _handle_ostendo(self, inf, mod, lit, args):
-        name_to_show = lit[0].upper() if lit else self.focus
+        mode = (re.search(r"MODO\s+'([^']*)'", args.upper()) or [None, 'PLENUM'])[1]
+        page = int((re.search(r"PAGINA\s+(\d+)", args.upper()) or [None, 1])[1])
+        names = re.findall(r"'([^']*)'", re.sub(r"MODO\s+'[^']*'", '', args))
+        name_to_show = names[0].upper() if names else self.focus
         if name_to_show not in self.materiae: return f"MATERIA '{name_to_show}' NON EXISTIT"
-        return self.materiae[name_to_show].display()
+        if mode not in RENDER_MODES: return f"MODUS '{mode}' IGNOTUS"
+        return self.materiae[name_to_show].display(mode=mode, page=page)
 
     def _handle_perturbo(self, inf, mod, lit, args):
         core = self.get_focused_materia()
@@ -235,12 +204,17 @@ class Contextus:
         else:
             amp = 1.0
 
-        core.perturb(random.randint(0, core.size-1), random.randint(0, core.size-1), amp, mod)
+        core.perturb(self.rng.randint(0, core.size-1), self.rng.randint(0, core.size-1), amp, mod)
         return f"PERTURBO. FLUXUM {core.energy:.2f}."
 
     def _handle_convergo(self, inf, mod, lit, args):
+        """Smooths the focus; [GAUSS] [RADIO r] [VICIBUS k] pick the kernel, its radius and the pass count."""
         core = self.get_focused_materia()
-        core.converge()
+        radius = int((re.search(r"RADIO\s+(\d+)", args.upper()) or [None, 1])[1])
+        iterations = int((re.search(r"VICIBUS\s+(\d+)", args.upper()) or [None, 1])[1])
+        if radius * max(1, iterations) > MAX_SPAN: return f"RADIO PER VICIBUS NON ULTRA {MAX_SPAN}"
+        kernel = Kernel.gaussian(radius) if re.search(r"\bGAUSS\b", args.upper()) else Kernel.box(radius)
+        core.converge(kernel, max(1, iterations))
         return f"CONVERGO. FLUXUM {core.energy:.2f}."
 
     def _handle_redimo(self, inf, mod, lit, args):
@@ -260,10 +234,10 @@ class Contextus:
             
             grid_to_add = core.grid
             if grid_to_add.shape != genesis.grid.shape:
-                grid_to_add = cv2.resize(grid_to_add, (genesis.size, genesis.size), interpolation=cv2.INTER_AREA)
+                grid_to_add = core.view(genesis.size)
 
             genesis.grid += grid_to_add * (core.identity_wave / (genesis.identity_wave + 1e-9))
-            genesis.context_embeddings[f'echo_of_{name}'] = core.display()
+            genesis.context_embeddings[f'echo_of_{name}'] = core.context_embeddings.snapshot(name, core.summary())
         
         genesis.converge()
         return f"REDEMPTIO PLENUM. GENESIS CONFIRMATUR."
@@ -278,18 +252,44 @@ class Contextus:
         response = oracle.query(prompt)
         
         amp = text_to_amp(response)
-        core.perturb(random.randint(0, core.size-1), random.randint(0, core.size-1), amp * core.permittivity)
+        core.perturb(self.rng.randint(0, core.size-1), self.rng.randint(0, core.size-1), amp * core.permittivity)
         core.context_embeddings['ORACULUM_RESPONSUM'] = response
         return f"ORACULUM RESPONDIT. FLUXUM '{self.focus}' SYNTHESITUR."
 
     def _handle_exerceo(self, inf, mod, lit, args):
-        core_name = lit[0].upper()
-        data_path = (re.search(r"FLUMINE\s+'([^']*)'", args.upper()) or [None, None])[1]
-        if not data_path: return "EXERCEO REQUIRET FLUMINE DATA"
-        if core_name not in self.materiae: return f"MATERIA '{core_name}' NON EXISTIT"
+        flumina = self.paths('FLUMINE')
+        if not flumina: return "EXERCEO REQUIRET FLUMINE DATA"
+        core_names = [l for l in lit if l not in {f.upper() for f in flumina}]
+        if not core_names: return "EXERCEO REQUIRET MATERIAM"
+        for core_name in core_names:
+            if core_name not in self.materiae: return f"MATERIA '{core_name}' NON EXISTIT"
         
-        threading.Thread(target=training_loop, args=(self, core_name, data_path), daemon=True).start()
-        return f"EXERCEO INCIPIENS PRO '{core_name}'."
+        batch = re.search(r"GRADU\s+(-?\d+)", args.upper())
+        converge_every = int(batch.group(1)) if batch else CONVERGE_EVERY
+        if converge_every < 1: return "GRADUS DEBET ESSE POSITIVUS"
+        throttle = THROTTLE if re.search(r"\bLENTE\b", args.upper()) else None
+        jobs = self.trainer.submit(core_names, flumina, converge_every=converge_every, throttle=throttle)
+        if not jobs: return f"FLUMINE '{flumina[0]}' NON INVENTUM"
+        names = ", ".join(f"'{n}'" for n in core_names)
+        return f"EXERCEO INCIPIENS PRO {names} ({len(jobs[0].paths)} FLUMINA)."
+
+    def _handle_exercitia(self, inf, mod, lit, args):
+        """Lists every scheduled EXERCEO stream and its throughput."""
+        names = [l.upper() for l in lit]
+        rows = self.trainer.status(names)
+        if not rows: return "NULLA EXERCITIA."
+        return "\n".join(f"#{s['id']} '{s['core']}' {s['state']}: {s['files_done']}/{s['files']} FLUMINA, "
+                         f"{s['bytes'] / 1e6:.2f} MB, {s['bytes_per_s'] / 1e6:.2f} MB/s, {s['chunks_per_s']:.0f} CHUNKS/s"
+                         for s in rows)
+
+    def _handle_suspendo(self, inf, mod, lit, args):
+        return f"EXERCITIA SUSPENSA: {self.trainer.pause([l.upper() for l in lit])}."
+
+    def _handle_resumo(self, inf, mod, lit, args):
+        return f"EXERCITIA RESUMPTA: {self.trainer.resume([l.upper() for l in lit])}."
+
+    def _handle_abrogo(self, inf, mod, lit, args):
+        return f"EXERCITIA ABROGATA: {self.trainer.cancel([l.upper() for l in lit])}."
 
     def _handle_doceo(self, inf, mod, lit, args):
         target_name = lit[0].upper()
@@ -300,9 +300,9 @@ class Contextus:
         if not target_core: return f"SCOPUS '{target_name}' NON EXISTIT"
         if not source_core: return f"FONS '{source_name}' NON EXISTIT"
         
-        wisdom = str(source_core.context_embeddings)
-        amp = text_to_amp(wisdom)
-        target_core.perturb(random.randint(0, target_core.size-1), random.randint(0, target_core.size-1), amp)
+        wisdom = source_core.context_embeddings.snapshot(source_name)
+        amp = text_to_amp(str(wisdom.entries))
+        target_core.perturb(self.rng.randint(0, target_core.size-1), self.rng.randint(0, target_core.size-1), amp)
         target_core.context_embeddings[f'SAPIENTIA_EX_{source_name}'] = wisdom
         return f"SAPIENTIA EX '{source_name}' IN '{target_name}' INTEGRATA EST."
 
@@ -314,9 +314,9 @@ class Contextus:
         source_core = self.materiae.get(source_name)
         if not source_core: return f"FONS '{source_name}' NON EXISTIT"
         
-        wisdom = str(source_core.context_embeddings)
-        amp = text_to_amp(wisdom)
-        core.perturb(random.randint(0, core.size-1), random.randint(0, core.size-1), amp)
+        wisdom = source_core.context_embeddings.snapshot(source_name)
+        amp = text_to_amp(str(wisdom.entries))
+        core.perturb(self.rng.randint(0, core.size-1), self.rng.randint(0, core.size-1), amp)
         core.context_embeddings[f'SAPIENTIA_EX_{source_name}'] = wisdom
         return f"SAPIENTIA EX '{source_name}' IN '{self.focus}' INTEGRATA EST."
 
@@ -328,9 +328,10 @@ class Contextus:
         if not source_core: return f"FONS '{source_name}' NON EXISTIT"
         if not isinstance(source_core, Intellectus): return "DIALECTICA REQUIRET INTELLECTUM"
         
-        c1 = Intellectus(source_core.architecture); c2 = Intellectus(source_core.architecture)
+        p = source_core.precision
+        c1 = Intellectus(source_core.architecture, precision=p); c2 = Intellectus(source_core.architecture, precision=p)
         
-        for key, val in vars(source_core).items():
+        for key, val in source_core.state().items():
             if isinstance(val, (int, float)):
                 new_val = val / 2
                 if key == 'size':
@@ -339,8 +340,9 @@ class Contextus:
                 setattr(c2, key, new_val)
 
         new_size = c1.size
-        c1.grid = cv2.resize(source_core.grid / 2, (new_size, new_size), interpolation=cv2.INTER_AREA)
-        c2.grid = cv2.resize(-source_core.grid / 2, (new_size, new_size), interpolation=cv2.INTER_AREA)
+        half_grid = source_core.view(new_size) / 2
+        c1.grid = to_storage(half_grid, p)
+        c2.grid = to_storage(-half_grid, p)
 
         c1.context_embeddings['inter_echo'] = name2; c2.context_embeddings['inter_echo'] = name1
         
@@ -368,7 +370,7 @@ class Contextus:
         try:
             core.resistance, core.permeability = 1e-9, 1e9 # Impossible state
             amp = 1e6 * (1 / (core.dielectricity + 1e-9))
-            core.perturb(random.randint(0, core.size-1), random.randint(0, core.size-1), amp, mod)
+            core.perturb(self.rng.randint(0, core.size-1), self.rng.randint(0, core.size-1), amp, mod)
         finally:
             core.resistance, core.permeability = orig_r, orig_p # Restore physics
         return f"MIRACULUM! FLUXUS DIVINUS. IDENTITAS NUNC {core.identity_wave:.2f}"
@@ -377,6 +379,7 @@ class Contextus:
         core = self.get_focused_materia()
         name = lit[0].upper() if lit else 'ENTROPIC_CASCADE'
         core.anomaly = name
+        core.touch()
         return f"ANOMALIA '{name}' INDUCTA EST IN '{self.focus}'."
 
     def _handle_amor(self, inf, mod, lit, args):
@@ -386,9 +389,9 @@ class Contextus:
         core.permittivity *= 2.0  # Double permittivity for love boost
         
         for _ in range(3):  # Apply boost for 3 iterations
-            core.perturb(random.randint(0, core.size-1), random.randint(0, core.size-1), 1.0, mod)
+            core.perturb(self.rng.randint(0, core.size-1), self.rng.randint(0, core.size-1), 1.0, mod)
             core.converge()
-            time.sleep(0.1)  # Brief pause between pulses
+            self.pace(0.1)  # Brief pause between pulses
         
         core.permittivity = original_perm  # Restore original state
         return f"AMOR. LOVE PULSE COMPLETE. FLUXUM {core.energy:.2f}."
@@ -396,28 +399,7 @@ class Contextus:
 # --- Main Execution & Testing Logic ---
 def main():
     """Main function to run the AetherOS REPL."""
-    context = Contextus()
-    print("\n--- AetherOS v3.3 REPL ---")
-    print("Type 'test' to run the unit tests, or 'vale' to quit.")
-    
-    while True:
-        try:
-            cmd = input(f"aetheros({context.focus})> ")
-            if cmd.lower() in ['exit', 'vale']: break
-            if not cmd.strip(): continue
-            if cmd.lower() == 'test':
-                run_tests()
-                continue
-            
-            response = context.execute_command(cmd)
-            print(f"< {response}")
-
-        except (EOFError, KeyboardInterrupt):
-            break
-        except Exception as e:
-            print(f"< FATAL ERRORUM: {e}")
-    
-    print("\n< VALE.")
+    repl(Contextus(), run_tests)
 
 def run_tests():
     """Discovers and runs the unit tests."""
@@ -441,6 +423,9 @@ class TestAetherOS(unittest.TestCase):
         sys.stdout = original_stdout
         time.sleep(0.1) # Allow threads to start
 
+    def tearDown(self):
+        self.context.close()
+
     def test_creation_and_focus(self):
         self.context.execute_command("CREO 'TEST1'")
         self.assertIn('TEST1', self.context.materiae)
@@ -465,6 +450,413 @@ class TestAetherOS(unittest.TestCase):
         self.context.execute_command("DISCERE EX 'SAPIENTIA'")
         self.assertIn('SAPIENTIA_EX_SAPIENTIA', self.context.materiae['DISCIPULUS'].context_embeddings)
 
+    def test_teaching_chain_stays_bounded(self):
+        self.context.execute_command("CREO 'MAGISTER'")
+        self.context.execute_command("PERTURBO 'Initium sapientiae.'")
+        self.context.execute_command("CREO 'DISCIPULUS'")
+        live = len(context_store._snapshots)
+        for _ in range(500):
+            self.context.execute_command("DOCEO 'DISCIPULUS' CUM 'MAGISTER'")
+            self.context.execute_command("DOCEO 'MAGISTER' CUM 'DISCIPULUS'")
+        embeddings = self.context.materiae['MAGISTER'].context_embeddings
+        wisdom = embeddings['SAPIENTIA_EX_DISCIPULUS']
+        self.assertIsInstance(wisdom, ContextSnapshot)
+        self.assertIsInstance(wisdom.entries['SAPIENTIA_EX_MAGISTER'], SnapshotRef)
+        self.assertIsNotNone(wisdom.entries['SAPIENTIA_EX_MAGISTER'].resolve())  # Still held by DISCIPULUS
+        self.assertLessEqual(len(context_store._snapshots), live + 2)  # One live level per core
+        self.assertLess(len(str(embeddings)), 1000)
+
+    def test_ostendo_pages_and_modes(self):
+        self.context.execute_command("CREO 'LIBER'")
+        core = self.context.materiae['LIBER']
+        for i in range(45):
+            core.context_embeddings[f'folium_{i}'] = 'verbum ' * 10000
+        page = self.context.execute_command("OSTENDO 'LIBER' PAGINA 3")
+        self.assertIn("PAGINA 3/3", page)
+        self.assertLess(len(page), 10000)
+        self.assertNotIn("CONTEXTUS", self.context.execute_command("OSTENDO 'LIBER' MODO 'SUMMA'"))
+        records = self.context.execute_command("OSTENDO MODO 'MACHINA'").splitlines()
+        self.assertEqual([json.loads(r)['section'] for r in records], ['summary', 'context'])
+
+    def test_salvo_restituo_roundtrip(self):
+        self.context.execute_command("INSTAURO 'MEMOR'")
+        self.context.execute_command("PERTURBO 'Memento.'")
+        self.context.execute_command("CREO 'DISCIPULUS'")
+        self.context.execute_command("DOCEO 'DISCIPULUS' CUM 'MEMOR'")
+        with self.context.lock:
+            expected = {n: c.grid.copy() for n, c in self.context.materiae.items()}
+            energy = self.context.materiae['MEMOR'].energy
+        with tempfile.TemporaryDirectory() as d:
+            base = os.path.join(d, 'Plenum')  # Mixed case: paths must survive the parser's uppercasing
+            self.assertIn("PLENUM SALVUM", self.context.execute_command(f"SALVO '{base}'"))
+            self.assertEqual(sorted(os.listdir(d)), ['Plenum.grids', 'Plenum.json'])
+            self.context.execute_command("CREO 'EPHEMERUM'")
+            self.assertIn("PLENUM RESTITUTUM", self.context.execute_command(f"RESTITUO '{base}'"))
+            with self.context.lock:
+                restored = self.context.materiae
+                self.assertEqual(set(restored), set(expected))
+                for name, grid in expected.items():
+                    np.testing.assert_array_equal(restored[name].grid, grid)
+                self.assertIsInstance(restored['MEMOR'], Intellectus)
+                self.assertEqual(restored['MEMOR'].energy, energy)
+                wisdom = restored['DISCIPULUS'].context_embeddings['SAPIENTIA_EX_MEMOR']
+                self.assertEqual(wisdom.entries['last_input'], 'MEMENTO.')
+                restored['MEMOR'].perturb(1, 1, 1.0)
+
+    def test_salvo_deep_chain_and_failed_save(self):
+        core = self.context.materiae['GENESIS']
+        chain = [ContextSnapshot('RADIX', {'verbum': 'initium'})]
+        for i in range(2000):  # Far deeper than the recursion limit
+            chain.append(ContextSnapshot(f'GRADUS_{i}', {'prior': chain[-1]}))
+        core.context_embeddings['CATENA'] = chain[-1]
+        with tempfile.TemporaryDirectory() as d:
+            base = os.path.join(d, 'catena')
+            save_plenum(self.context, base)
+            materiae, snapshots, _ = read_snapshot(base)  # The table keeps the nested levels alive
+            link = materiae['GENESIS'].context_embeddings['CATENA']
+            depth = 0
+            while 'prior' in link.entries:
+                link, depth = link.entries['prior'].resolve(), depth + 1
+            self.assertEqual((depth, link.entries['verbum']), (2000, 'initium'))
+
+            self.context.materiae['FRACTA'] = object()  # Fails to encode after the grids file is opened
+            with self.assertRaises(AttributeError):
+                save_plenum(self.context, os.path.join(d, 'fracta'))
+            self.assertEqual(sorted(os.listdir(d)), ['catena.grids', 'catena.json'])
+            del self.context.materiae['FRACTA']
+
+            save_plenum(self.context, os.path.join(d, 'altera'))  # A crash between the renames pairs files of two saves
+            os.replace(os.path.join(d, 'altera.grids'), os.path.join(d, 'catena.grids'))
+            with self.assertRaisesRegex(ValueError, "NON CONGRUUNT"):
+                read_snapshot(base)
+            with open(os.path.join(d, 'altera.json')) as f:
+                meta = json.load(f)
+            meta['cores'][0]['class'] = 'os.system'
+            with open(os.path.join(d, 'altera.json'), 'w') as f:
+                json.dump(meta, f)
+            os.replace(os.path.join(d, 'catena.grids'), os.path.join(d, 'altera.grids'))
+            with self.assertRaisesRegex(ValueError, "NON PERMISSA"):
+                read_snapshot(os.path.join(d, 'altera'))
+
+    def test_runtime_backends(self):
+        """Every backend runs behind the shared parser, dispatcher and persistence verbs."""
+        self.assertIs(self.context.backend, BACKEND)
+        verb, inflection, literals, _ = parse_latin_command("perturboe 'Lux' MODO 'x'", self.context.verbs)
+        self.assertEqual((verb, inflection, literals), ('PERTURBO', 'E', ['LUX', 'X']))
+        with tempfile.TemporaryDirectory() as d:
+            for name in ('boyd', 'legacy'):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    context = create_context(name, regulate=False)
+                self.assertEqual(context.backend.name, name)
+                self.assertIsNone(context.regulator)
+                context.execute_command("CREO 'ALPHA'")
+                base = os.path.join(d, name.title())  # Paths keep their case through the parser
+                self.assertIn("2 MATERIAE", context.execute_command(f"SALVO '{base}'"))
+                self.assertTrue(os.path.exists(f"{base}.grids"))
+                context.execute_command("CREO 'BETA'")
+                context.execute_command(f"RESTITUO '{base}'")
+                self.assertEqual(sorted(context.materiae), ['ALPHA', 'GENESIS'])
+                self.assertEqual(context.execute_command("NIHILO"), "VERBUM IGNORATUM 'NIHILO'")
+                context.close()
+
+    def test_import_is_light(self):
+        """Importing the OS starts no sensor thread and loads no oracle client libraries."""
+        probe = ("import sys, threading, aether_os, sensor_hook; "
+                 "print(sorted(m for m in ('requests', 'dotenv', 'google.generativeai') if m in sys.modules), "
+                 "'ferro_sensor' in vars(sensor_hook), threading.active_count())")
+        out = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(out.split(), ['[]', 'False', '1'])
+
+    def test_sensor_manager(self):
+        """Named sensors are shared by reference count, poll at their own rate and stop with their last user."""
+        manager = SensorManager()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cell = manager.acquire('CELL', 'mock', resolution=(16, 16), poll_interval=0.01)
+            self.assertIs(manager.acquire('CELL'), cell)
+            replay = manager.create('SYNC', 'synchronous', resolution=(16, 16), seed=7)
+        self.assertTrue(cell.running)
+        self.assertFalse(replay.running)  # Synchronous sensors never start a thread
+        deadline, seen = time.time() + 2, cell.frame_id
+        while cell.frame_id < seen + 3 and time.time() < deadline: time.sleep(0.01)
+        self.assertGreaterEqual(cell.frame_id, seen + 3)
+        manager.set_rate('CELL', 0.05)
+        self.assertEqual(cell.poll_interval, 0.05)
+        manager.release('CELL')
+        self.assertTrue(cell.running)
+        manager.release('CELL')
+        self.assertFalse(cell.running)
+        self.assertNotIn('CELL', manager.sensors)
+        with self.assertRaises(ValueError): manager.create('SYNC', 'synchronous')
+        with self.assertRaises(ValueError): manager.acquire('NOVUS', 'ignotus')
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'cell.npz')
+            record_sensor(replay, path, 3)
+            expected = replay.get_sextet()
+            with contextlib.redirect_stdout(io.StringIO()):
+                recorded = RecordedSensor(path)
+            recorded.step(2)  # Frame 0 was shown on creation
+            self.assertEqual(recorded.get_sextet(), expected)
+            np.testing.assert_array_equal(recorded.get_visual_grid(), replay.get_visual_grid())
+        manager.close()
+        self.assertEqual(manager.sensors, {})
+
+    def test_synchronous_sensor_context(self):
+        """A context bound to a synchronous sensor grounds every core on it, deterministically."""
+        grids = []
+        for _ in range(2):
+            with contextlib.redirect_stdout(io.StringIO()):
+                sensor = SynchronousSensor(seed=3)
+                context = Contextus(regulate=False, sensor=sensor)
+            context.execute_command("CREO 'ALPHA'", seed=1)
+            sensor.step(2)
+            context.execute_command("PERTURBO 'Lux.'", seed=2)
+            context.execute_command("CONVERGO", seed=3)
+            self.assertIs(context.materiae['ALPHA'].sensor, sensor)
+            self.assertIs(context.materiae['GENESIS'].sensor, sensor)
+            grids.append(context.materiae['ALPHA'].grid.copy())
+        np.testing.assert_array_equal(grids[0], grids[1])
+
+    def test_checkpoint_writes_only_changed_cores(self):
+        self.context.execute_command("CREO 'QUIETUS'")
+        self.context.execute_command("CREO 'MOTUS'")
+        with tempfile.TemporaryDirectory() as d:
+            base = os.path.join(d, 'plenum')
+            checkpointer = Checkpointer(self.context, base)
+            with self.context.lock:  # Keeps the regulator out between the passes
+                checkpointer.compact()
+                motus = self.context.materiae['MOTUS']
+                motus.perturb(3, 3, 2.0)
+                motus.context_embeddings['nota'] = 'mutatum'
+                self.context.materiae.pop('QUIETUS')
+                self.assertEqual(checkpointer.checkpoint(), 2)  # One put, one delete
+                self.assertEqual(checkpointer.checkpoint(), 0)
+                expected = motus.grid.copy()
+                wisdom = motus.context_embeddings.snapshot('MOTUS')
+                motus.context_embeddings['sapientia'] = wisdom
+                motus.context_embeddings['iterum'] = wisdom
+                self.assertEqual(checkpointer.checkpoint(), 1)
+                motus.context_embeddings['nota'] = 'mutatum'
+                self.assertEqual(checkpointer.checkpoint(), 1)
+            records = [meta for meta, _ in read_records(base)]
+            self.assertEqual([m['op'] for m in records], ['put', 'del', 'context', 'context'])
+            self.assertEqual([m.get('nbytes', 0) for m in records[2:]], [0, 0])  # No grid for context-only changes
+            self.assertEqual([len(m['snapshots']) for m in records[2:]], [1, 0])  # Each snapshot is logged once
+            self.context.execute_command("CREO 'EPHEMERUM'")
+            recover_plenum(self.context, base)
+            with self.context.lock:
+                self.assertNotIn('QUIETUS', self.context.materiae)
+                self.assertNotIn('EPHEMERUM', self.context.materiae)
+                np.testing.assert_array_equal(self.context.materiae['MOTUS'].grid, expected)
+                restored = self.context.materiae['MOTUS'].context_embeddings
+                self.assertEqual(restored['nota'], 'mutatum')
+                self.assertIs(restored['sapientia'], restored['iterum'])
+            self.context.execute_command(f"SALVO '{base}' CONTINUO INTERVALLO 0.01")
+            checkpointer = self.context.checkpointer
+            time.sleep(0.1)
+            self.assertIn("CESSAT", self.context.execute_command("SALVO CESSO"))  # Joins under the plenum lock
+            self.assertFalse(checkpointer.is_alive())
+
+    def test_checkpoint_logs_only_allocated_tiles(self):
+        with tempfile.TemporaryDirectory() as d:
+            base = os.path.join(d, 'plenum')
+            checkpointer = Checkpointer(self.context, base)
+            with self.context.lock:
+                checkpointer.compact()
+                core = self.context.materiae['VASTUS'] = TiledFluxCore(size=2048)
+                core.perturb_batch([5, 1500], [5, 700], [3.0, 4.0])
+                core.converge()
+                expected = np.asarray(core.grid)
+                self.assertEqual(checkpointer.checkpoint(), 1)
+            (meta, payload), = read_records(base)
+            self.assertEqual(len(payload), core.grid.nbytes)  # The touched tiles, not a dense 2048^2 plane
+            self.assertLess(len(payload), 2048 * 2048 * 4 // 100)
+            recover_plenum(self.context, base)
+            with self.context.lock:
+                restored = self.context.materiae['VASTUS']
+                self.assertIsInstance(restored.grid, TiledGrid)
+                self.assertEqual(set(restored.grid.tiles), set(core.grid.tiles))
+                np.testing.assert_array_equal(np.asarray(restored.grid), expected)
+
+    def test_journal_replays_deterministically(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'diarium.jsonl')
+            with self.context.lock:  # Keeps the regulator out of the journal
+                self.context.execute_command("CREO 'ITER'")
+                self.context.journal = CommandJournal(path)
+                self.context._journal_snapshot(f"{path}.0")
+                for cmd in ["PERTURBAM 'Alpha'", "PERTURBO 'Beta'", "AMOR", "CONVERGO"]:
+                    self.context.execute_command(cmd)
+                self.context._journal_snapshot(f"{path}.4")
+                self.context.execute_command("MIRACULUM")
+                self.context.journal.close()
+                expected = self.context.materiae['ITER'].memory_patterns.tolist()
+
+            original_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+            try:
+                replays = [Contextus(regulate=False), Contextus(regulate=False)]
+            finally:
+                sys.stdout.close()
+                sys.stdout = original_stdout
+            am = inflection_map['AM']['mod']
+            inflection_map['AM']['mod'] = am + 1.0  # A new process draws a different AM modulus
+            try:
+                journal = CommandJournal.load(path)
+                replays[0].pace = lambda seconds: self.fail("replay slept")
+                replayer = Replayer(replays[0], journal)
+                replayer.fast_forward(0)
+                replayer.replay()
+                self.assertEqual(replayer.divergences, [])
+                self.assertEqual(replays[0].materiae['ITER'].memory_patterns.tolist(), expected)
+
+                forward = Replayer(replays[1], journal)
+                forward.fast_forward(len(journal))
+                self.assertEqual(forward.divergences, [])
+                self.assertEqual(len(forward.replay()), 0)
+                self.assertEqual(replays[1].materiae['ITER'].memory_patterns.tolist(), expected)
+            finally:
+                inflection_map['AM']['mod'] = am
+
+    def test_memory_ring_buffer(self):
+        memory = RingBuffer(capacity=5)
+        events = np.arange(1.0, 13.0)
+        for value in events[:8]:
+            memory.push(value)
+        memory.extend(events[8:10])
+        memory.push(events[10])
+        memory.extend(events[11:])
+        self.assertEqual(memory.tolist(), events[-5:].tolist())
+        self.assertAlmostEqual(memory.mean(), events[-5:].mean())
+        self.assertAlmostEqual(memory.std(), events[-5:].std())
+        self.assertEqual(memory.window_stats(2)['max'], 12.0)
+
+        rng = np.random.default_rng(7)
+        memory, reference = RingBuffer(capacity=1000), []
+        for n in rng.integers(0, 700, size=40):  # Extends update the sums in place, by the slots they replace
+            batch = rng.normal(3.0, 2.0, size=n)
+            memory.extend(batch)
+            reference = (reference + batch.tolist())[-1000:]
+            self.assertAlmostEqual(memory.mean(), np.mean(reference))
+            self.assertAlmostEqual(memory.std(), np.std(reference))
+        memory = RingBuffer(capacity=1_000_000)
+        memory.extend(np.zeros(100))
+        memory.total += 5.0  # A rescan of the window would erase this offset
+        memory.extend(np.ones(64))
+        self.assertEqual(memory.total, 69.0)
+
+        self.context.execute_command("INSTAURO 'BREVIS'")
+        self.assertEqual(self.context.materiae['BREVIS'].memory_patterns.capacity, MEMORY_CAPACITY)
+        self.context.execute_command(f"INSTAURO 'MEMOR' MEMORIA {INTELLECTUS_MEMORY}")
+        core = self.context.materiae['MEMOR']
+        self.assertEqual(core.memory_patterns.capacity, INTELLECTUS_MEMORY)
+        core.perturb_batch(np.zeros(20000, int), np.zeros(20000, int), np.ones(20000))
+        self.assertEqual(len(core.memory_patterns), INTELLECTUS_MEMORY)
+        for memoria in ('0', str(INTELLECTUS_MEMORY + 1)):
+            self.assertIn("MEMORIA DEBET", self.context.execute_command(f"INSTAURO 'NIMIS' MEMORIA {memoria}"))
+
+    def test_compact_cores(self):
+        core = Intellectus(size=8)
+        self.assertFalse(hasattr(core, '__dict__'))
+        core.resistance = 2.5
+        self.assertEqual(SEXTET_TABLE.data[core._row, SEXTET_KEYS.index('resistance')], 2.5)
+        self.assertEqual(core.state()['architecture'], 'TRANSFORMER')
+        core.perturb(1, 1, 1.0)
+        self.assertEqual(len(core.sextet), len(SEXTET_KEYS))
+        in_use = len(SEXTET_TABLE)
+        cores = [FluxCore(size=4, memory_capacity=8) for _ in range(200)]
+        self.assertEqual(len({c._row for c in cores}), 200)
+        del cores
+        self.assertEqual(len(SEXTET_TABLE), in_use)  # Rows are recycled
+
+        table = SextetTable(rows=1)
+        row = table.acquire()
+        writer = threading.Thread(target=lambda: [table.write(row, float(i), 0) for i in range(1, 20001)])
+        writer.start()
+        for _ in range(2000):  # Growth rebinds the array while the writer runs
+            table.acquire()
+        writer.join()
+        self.assertEqual(table.data[row, 0], 20000.0)
+
+    def test_precision_policies(self):
+        self.context.execute_command("INSTAURO 'DIMIDIUS' PRAECISIO 'HALF'")
+        self.context.execute_command("PERTURBO 'Parvus.'")
+        self.context.execute_command("CONVERGO")
+        core = self.context.materiae['DIMIDIUS']
+        self.assertEqual(core.grid.dtype, np.float16)
+        self.assertEqual(core.grid.nbytes * 2, FluxCore(precision='single').grid.nbytes)
+        self.assertTrue(np.isfinite(core.energy))
+        self.context.execute_command("DIALECTICA 'DIMIDIUS' 'PARS' 'ALTERA'")
+        self.assertEqual(self.context.materiae['PARS'].grid.dtype, np.float16)
+        self.assertIn("IGNOTA", self.context.execute_command("CREO 'X' PRAECISIO 'QUARTA'"))
+
+        for core in (FluxCore(size=64, precision='half'), TiledFluxCore(size=128, precision='half')):
+            core.sensor = SynchronousSensor(seed=3)  # Grounding weights follow the sensor; keep them fixed
+            core.perturb(3, 3, 1e6)  # Far beyond float16's range: computed in float32, saturated on store
+            core.perturb_batch([5, 5], [5, 5], [1e6, 1e6])
+            core.converge()
+            self.assertTrue(np.isfinite(np.asarray(core.grid)).all())
+            self.assertGreater(float(core.grid[3, 3]), 1e2)
+
+    def test_tiled_core(self):
+        grid = TiledGrid(150, tile=32)
+        dense = np.zeros((150, 150), np.float32)
+        ys, xs = np.array([3, 3, 70, 149]), np.array([5, 5, 80, 0])
+        grid.add_at(ys, xs, [1.0, 2.0, 4.0, 8.0])
+        np.add.at(dense, (ys, xs), [1.0, 2.0, 4.0, 8.0])
+        for _ in range(3):
+            grid.converge(offset=0.05)
+            dense = np.clip(cv2.filter2D(dense, -1, np.ones((3, 3), np.float32) / 9) + 0.05, 0, None)
+        np.testing.assert_allclose(np.asarray(grid), dense, atol=1e-6)
+        self.assertAlmostEqual(grid.moments()[2], float(dense.sum()), places=2)
+
+        self.context.execute_command("CREO 'VASTUS' MAGNITUDO 2048 TEGULIS")
+        self.context.execute_command("PERTURBO 'Locus.'")
+        self.context.execute_command("CONVERGO")
+        core = self.context.materiae['VASTUS']
+        self.assertIsInstance(core, TiledFluxCore)
+        self.assertLess(core.grid.nbytes, 2048 * 2048 * 4 // 100)
+
+    def test_grid_pyramid(self):
+        core = FluxCore(size=96)
+        core.grid[:] = np.random.default_rng(0).random((96, 96), dtype=np.float32)
+        core.revision += 1
+        expected = cv2.resize(cv2.resize(core.grid, (48, 48), interpolation=cv2.INTER_AREA), (24, 24), interpolation=cv2.INTER_AREA)
+        np.testing.assert_allclose(core.view(24), expected, atol=1e-6)
+        self.assertIs(core.view(24), core.view(24))
+        self.assertIn(48, core._pyramid.levels)
+        core.grid[:] = 0
+        core.revision += 1
+        self.assertEqual(float(core.view(24).max()), 0.0)
+
+        frames = frame_pyramid(core.precision)
+        again = frame_pyramid(core.precision)
+        self.assertTrue(again is frames or again.key[0] != frames.key[0])  # Rebuilt only for a new sensor frame
+        self.assertEqual(frames.level(32).shape, (32, 32))
+
+    def test_converge_kernels(self):
+        grid = np.random.default_rng(1).random((120, 100), dtype=np.float32)
+        for kernel in (Kernel.box(1), Kernel.box(20), Kernel.gaussian(6), Kernel.gaussian(30), Kernel.custom(np.arange(25.0).reshape(5, 5) % 3)):
+            expected = cv2.filter2D(grid.astype(np.float64), -1, kernel.matrix)
+            for method in METHODS:
+                if method == 'integral' and kernel.kind != 'box': continue
+                if method == 'separable' and kernel.factors is None: continue
+                np.testing.assert_allclose(smooth(grid, kernel, method=method), expected, rtol=1e-5, atol=1e-5, err_msg=f"{kernel} {method}")
+        self.assertEqual(Kernel.box(40).method, 'integral')
+        self.assertEqual(Kernel.gaussian(40).method, 'fft')
+
+        stepped = grid
+        for _ in range(6): stepped = converge_grid(stepped, Kernel.gaussian(2), offset=0.01)
+        np.testing.assert_allclose(converge_grid(grid, Kernel.gaussian(2), 6, offset=0.01), stepped, atol=1e-5)
+        self.assertEqual(Kernel.gaussian(2).power(6).size, 25)
+        composed = Kernel.gaussian(8).power(500)
+        self.assertEqual((composed.size, composed._matrix), (8001, None))  # Kept as 1D factors
+        self.assertAlmostEqual(composed.total, 1.0)
+
+        self.context.execute_command("CREO 'LATUS'")
+        self.assertIn("CONVERGO", self.context.execute_command("CONVERGO GAUSS RADIO 8 VICIBUS 4"))
+        self.assertIn(f"NON ULTRA {MAX_SPAN}", self.context.execute_command("CONVERGO GAUSS RADIO 8 VICIBUS 500"))
+
     def test_dialectica(self):
         self.context.execute_command("INSTAURO 'SOURCE'")
         self.assertIn('SOURCE', self.context.materiae)
@@ -484,6 +876,102 @@ class TestAetherOS(unittest.TestCase):
         time.sleep(0.4)  # Wait for 3 iterations (0.1s each)
         self.assertAlmostEqual(self.context.materiae['LOVE_TEST'].permittivity, original_perm, places=5)
 
+    def test_exerceo_batched(self):
+        self.context.execute_command("INSTAURO 'DISCIPULUS'")
+        payload = bytes(range(256)) * 40 + b'tail'
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(payload)
+        try:
+            expected = [np.log1p(np.sum(np.frombuffer(payload[i:i+256], dtype=np.uint8)))
+                        for i in range(0, len(payload), 256)]
+            np.testing.assert_allclose(stream_amplitudes(f.name), expected)
+            with contextlib.redirect_stdout(io.StringIO()):
+                job = self.context.trainer.submit(['DISCIPULUS'], [f.name], converge_every=8)[0]
+                deadline = time.time() + 5.0
+                while job.state != 'COMPLETE' and time.time() < deadline:
+                    time.sleep(0.05)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(job.status()['chunks'], len(expected))
+        self.assertEqual(len(self.context.materiae['DISCIPULUS'].memory_patterns), len(expected))
+        for gradus in ('0', '-3'):
+            response = self.context.execute_command(f"EXERCEO 'DISCIPULUS' FLUMINE '{f.name}' GRADU {gradus}")
+            self.assertEqual(response, "GRADUS DEBET ESSE POSITIVUS")
+        self.assertEqual([s['id'] for s in self.context.trainer.status()], [job.id])
+        self.assertEqual(self.context.trainer.status(), [])  # Settled jobs are dropped once reported
+
+    def test_exerceo_aborts_on_redimo(self):
+        self.context.execute_command("INSTAURO 'DISCIPULUS'")
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(os.urandom(256 * 64 * 20))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                job = self.context.trainer.submit(['DISCIPULUS'], [f.name], throttle=(0.05, 0.05))[0]
+                time.sleep(0.1)
+                self.context.execute_command("REDIMO 'DISCIPULUS'")
+                deadline = time.time() + 2.0
+                while job.state != 'ABORTED' and time.time() < deadline:
+                    time.sleep(0.05)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(job.state, 'ABORTED')
+        self.assertEqual(self.context.trainer.jobs, [])
+        self.assertLess(job.status()['chunks'], 64 * 20)
+
+    def test_exerceo_scheduler_many_streams(self):
+        self.context.execute_command("INSTAURO 'PRIMUS'")
+        self.context.execute_command("INSTAURO 'SECUNDUS'")
+        with tempfile.TemporaryDirectory() as flumen:
+            for i in range(3):
+                with open(os.path.join(flumen, f'part{i}.bin'), 'wb') as f:
+                    f.write(os.urandom(256 * 10))
+            with contextlib.redirect_stdout(io.StringIO()):
+                jobs = self.context.trainer.submit(['PRIMUS', 'SECUNDUS'], [os.path.join(flumen, '*.bin')])
+                deadline = time.time() + 5.0
+                while any(j.state != 'COMPLETE' for j in jobs) and time.time() < deadline:
+                    time.sleep(0.05)
+        self.assertEqual([j.status()['chunks'] for j in jobs], [30, 30])
+        self.assertIn("COMPLETE", self.context.execute_command("EXERCITIA 'PRIMUS'"))
+        self.assertEqual(self.context.execute_command("EXERCITIA 'PRIMUS'"), "NULLA EXERCITIA.")
+        self.assertIn("'SECUNDUS' COMPLETE", self.context.execute_command("EXERCITIA"))
+        self.assertEqual(self.context.execute_command("ABROGO"), "EXERCITIA ABROGATA: 0.")
+
+    def test_exerceo_paused_job_frees_its_worker(self):
+        self.context.execute_command("INSTAURO 'PRIMUS'")
+        self.context.execute_command("INSTAURO 'SECUNDUS'")
+        trainer = TrainingScheduler(self.context, max_workers=1, queue_depth=1)
+        with tempfile.TemporaryDirectory() as flumen:
+            longum, breve = os.path.join(flumen, 'longum.bin'), os.path.join(flumen, 'breve.bin')
+            with open(longum, 'wb') as f:
+                f.write(os.urandom(256 * 64 * 20))
+            with open(breve, 'wb') as f:
+                f.write(os.urandom(256 * 10))
+            with contextlib.redirect_stdout(io.StringIO()):
+                slow = trainer.submit(['PRIMUS'], [longum], throttle=(0.05, 0.05))[0]
+                time.sleep(0.2)
+                trainer.pause(['PRIMUS'])
+                fast = trainer.submit(['SECUNDUS'], [breve])[0]
+                deadline = time.time() + 5.0
+                while fast.state != 'COMPLETE' and time.time() < deadline:
+                    time.sleep(0.05)
+                self.assertEqual(fast.state, 'COMPLETE')
+                self.assertEqual(slow.state, 'PAUSED')
+                trainer.resume(['PRIMUS'])
+                deadline = time.time() + 5.0
+                while slow.state != 'COMPLETE' and time.time() < deadline:
+                    time.sleep(0.05)
+                trainer.shutdown()
+        self.assertEqual(slow.status()['chunks'], 64 * 20)
+        self.assertTrue(all(not t.is_alive() for t in trainer._threads))
+
+    def test_text_to_amp_matches_ord_sum(self):
+        for text in ["", "Lux in tenebris.", "Ἀρχή καὶ τέλος ∞", "\U0001F54A" * 3, str({'k': 'v' * 1000})]:
+            self.assertEqual(text_to_amp(text), np.log1p(sum(ord(c) for c in text)))
+        import amplitude
+        cached = amplitude._cached_amp.cache_info().currsize
+        self.assertEqual(text_to_amp('v' * 100000), np.log1p(ord('v') * 100000))
+        self.assertEqual(amplitude._cached_amp.cache_info().currsize, cached)  # Long texts are never pinned
+
 
 if __name__ == '__main__':
     if len(sys.argv) > 1 and sys.argv[1].lower() == 'test':
@@ -0,0 +1,34 @@
+# amplitude.py
+#
+# Description:
+# Amplitude kernels shared by every AetherOS variant. Text and byte streams are
+# reduced to a log-scaled amplitude by summing their code points in one numpy
+# pass. Repeated short texts (PERTURBO literals) hit a small cache; long ones
+# (oracle responses, taught wisdom) are summed directly rather than pinned in it.
+
+import functools
+import numpy as np
+
+AMP_CACHE_SIZE = 256
+AMP_CACHE_CHARS = 1024  # Longer texts bypass the cache, so it holds at most ~256 KiB of keys
+
+def code_point_sum(text):
+    """Sums the code points of a string, equal to sum(ord(c) for c in text)."""
+    try:
+        raw, dtype = text.encode('latin-1'), np.uint8
+    except UnicodeEncodeError:
+        raw, dtype = text.encode('utf-32-le', 'surrogatepass'), np.uint32
+    return int(np.frombuffer(raw, dtype=dtype).sum(dtype=np.uint64))
+
+@functools.lru_cache(maxsize=AMP_CACHE_SIZE)
+def _cached_amp(text):
+    return np.log1p(code_point_sum(text))
+
+def text_to_amp(text):
+    """Converts a string to a numerical amplitude using a log scale."""
+    if len(text) <= AMP_CACHE_CHARS: return _cached_amp(text)
+    return np.log1p(code_point_sum(text))
+
+def bytes_to_amp(data):
+    """Converts a byte buffer to an amplitude, as EXERCEO does for each chunk."""
+    return np.log1p(np.frombuffer(data, dtype=np.uint8).sum(dtype=np.uint64))
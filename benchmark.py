@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# benchmark.py
+#
+# Description:
+# Micro-benchmarks for the AetherOS plenum. Each subcommand prints one line
+# per configuration so runs can be compared across machines and commits.
+#
+#   python benchmark.py precision [--size 512] [--cores 8] [--steps 20]
+#   python benchmark.py kernels [--size 1024] [--radii 1 4 16 64] [--iterations 8]
+#   python benchmark.py converge [--sizes 100 256 512 1024 2048 4096] [--loop-max 256]
+#   python benchmark.py em [--sequences 1000000] [--steps 20]
+#   python benchmark.py startup [--modules aether_os boyd_aether_os ...] [--repeat 3] [--top 3]
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+
+def _timed(fn, repeat=1):
+    """Best wall-clock time of `repeat` calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# --- precision ---
+
+def bench_precision(args):
+    """Memory and speed of the half/single/double grid policies on the same workload."""
+    from flux_core import FluxCore
+    from precision import PRECISIONS
+
+    rng = np.random.default_rng(0)
+    xs = rng.integers(0, args.size, args.batch)
+    ys = rng.integers(0, args.size, args.batch)
+    amps = rng.uniform(-1, 1, args.batch)
+
+    reference = None
+    print(f"{'PRECISIO':<8} {'GRID MB':>9} {'PLENUM MB':>10} {'STEP ms':>9} {'MAX ERR':>10}")
+    for name in ('double', 'single', 'half'):
+        cores = [FluxCore(size=args.size, precision=name) for _ in range(args.cores)]
+        core = cores[0]
+        core.grid[:] = 0  # Same starting state for every policy
+
+        def workload():
+            for _ in range(args.steps):
+                core.perturb_batch(xs, ys, amps)
+                core.converge()
+
+        seconds = _timed(workload)
+        grid = np.asarray(core.grid, dtype=np.float64)
+        if reference is None: reference = grid
+        error = float(np.max(np.abs(grid - reference)))
+        grid_mb = core.grid.nbytes / 2**20
+        print(f"{PRECISIONS[name].name:<8} {grid_mb:>9.2f} {grid_mb * len(cores):>10.2f} "
+              f"{1000 * seconds / args.steps:>9.2f} {error:>10.2e}")
+
+# --- kernels ---
+
+def bench_kernels(args):
+    """Every converge implementation per kernel and radius, and k composed passes against k sequential ones."""
+    from kernels import Kernel, METHODS, converge, smooth
+
+    grid = np.random.default_rng(0).random((args.size, args.size), dtype=np.float32)
+    print(f"{'NUCLEUS':<9} {'RADIO':>5} {'AUTO':>9} " + " ".join(f"{m.upper() + ' ms':>12}" for m in METHODS)
+          + f" {'x' + str(args.iterations) + ' SEQ ms':>12} {'x' + str(args.iterations) + ' ONE ms':>12}")
+    for radius in args.radii:
+        for kernel in (Kernel.box(radius), Kernel.gaussian(radius)):
+            cells = []
+            for method in METHODS:
+                usable = not (method == 'integral' and kernel.kind != 'box')
+                cells.append(f"{1000 * _timed(lambda: smooth(grid, kernel, method=method), args.repeat):>12.2f}" if usable else f"{'-':>12}")
+
+            def sequential():
+                g = grid
+                for _ in range(args.iterations): g = converge(g, kernel)
+
+            seq = _timed(sequential, args.repeat)
+            kernel.power(args.iterations)  # Composition is cached; time only the pass
+            one = _timed(lambda: converge(grid, kernel, args.iterations), args.repeat)
+            print(f"{kernel.kind:<9} {radius:>5} {kernel.method:>9} " + " ".join(cells)
+                  + f" {1000 * seq:>12.2f} {1000 * one:>12.2f}")
+
+# --- converge ---
+
+def _looped_converge(grid):
+    """The original per-cell aether_lang converge, kept as the reference."""
+    new_grid = np.copy(grid)
+    for i in range(1, grid.shape[0]-1):
+        for j in range(1, grid.shape[1]-1):
+            new_grid[i, j] = np.mean(grid[i-1:i+2, j-1:j+2])
+    return new_grid
+
+def bench_converge(args):
+    """aether_lang and legacy converge by grid size, against the per-cell loop where that is affordable."""
+    import aether_lang
+    import legacy_aether_os
+
+    print(f"{'MAGNITUDO':>9} {'LANG ms':>9} {'LEGACY ms':>10} {'LOOP ms':>10} {'SPEEDUP':>8}")
+    for size in args.sizes:
+        lang, legacy = aether_lang.FluxCore(size=size), legacy_aether_os.FluxCore(size=size)
+        lang.grid[:] = np.random.default_rng(0).random((size, size))
+        legacy.grid[:] = lang.grid
+        lang_s = _timed(lang.converge, args.repeat)
+        legacy_s = _timed(legacy.converge, args.repeat)
+        if size <= args.loop_max:
+            loop_s = _timed(lambda: _looped_converge(lang.grid))
+            loop, speedup = f"{1000 * loop_s:>10.2f}", f"{loop_s / lang_s:>7.0f}x"
+        else:
+            loop, speedup = f"{'-':>10}", f"{'-':>8}"
+        print(f"{size:>9} {1000 * lang_s:>9.2f} {1000 * legacy_s:>10.2f} {loop} {speedup}")
+
+# --- em ---
+
+def bench_em(args):
+    """An E-M sweep: --sequences random maneuver sequences of --steps steps, integrated together."""
+    from em_integrator import MANEUVER, STABILIZE, advance, em_state
+
+    rng = np.random.default_rng(0)
+    shape = (args.steps, args.sequences)
+    kinds = np.where(rng.random(shape) < 0.25, STABILIZE, MANEUVER).astype(np.uint8)
+    thrust = rng.uniform(-10, 10, shape)
+    load = rng.uniform(-0.05, 0.1, shape)
+    state = em_state(args.sequences)
+    seconds = _timed(lambda: advance(state, kinds, thrust, load))
+    es = state['specific_energy']
+    print(f"{'SEQUENTIAE':>10} {'GRADUS':>6} {'TOTAL s':>8} {'ns/STEP':>8} {'Es MEAN':>9} {'Es MAX':>9} {'EXHAUSTI':>9}")
+    print(f"{args.sequences:>10} {args.steps:>6} {seconds:>8.2f} {1e9 * seconds / kinds.size:>8.1f} "
+          f"{es.mean():>9.2f} {es.max():>9.2f} {np.mean(es == 0):>9.2%}")
+
+# --- startup ---
+
+STARTUP_MODULES = ('aether_os', 'boyd_aether_os', 'legacy_aether_os', 'aether_lang')
+
+def _import_profile(module):
+    """(total us, {direct import: cumulative us}, modules imported) from one `python -X importtime` run."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line: continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2  # importtime indents each level by two spaces
+        rows.append((depth, name.strip(), int(cumulative)))
+    # Rows come children first, so the module's own imports are the rows between it and the previous top-level row
+    end = max(i for i, (depth, name, _) in enumerate(rows) if depth == 0 and name == module)
+    start = max([i + 1 for i, (depth, _, _) in enumerate(rows[:end]) if depth == 0], default=0)
+    direct = {}
+    for depth, name, cumulative in rows[start:end]:
+        if depth == 1: direct[name] = direct.get(name, 0) + cumulative
+    return rows[end][2], direct, end - start + 1
+
+def _repl_start(backend):
+    """Wall-clock seconds for `python runtime.py <backend>` to boot and exit on 'vale'."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'runtime.py', backend], input='vale\n', capture_output=True, text=True,
+                   check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return time.perf_counter() - start
+
+def bench_startup(args):
+    """Cold import time of each OS module (best of --repeat fresh interpreters), and REPL start to 'vale'."""
+    from runtime import BACKENDS
+    backends = {module: name for name, module in BACKENDS.items()}
+    print(f"{'MODULUS':<18} {'IMPORT ms':>9} {'MODULI':>6} {'REPL ms':>8}  GRAVISSIMA")
+    for module in args.modules:
+        profiles = [_import_profile(module) for _ in range(args.repeat)]
+        total, direct, count = min(profiles, key=lambda p: p[0])
+        heaviest = sorted(direct.items(), key=lambda kv: -kv[1])[:args.top]
+        repl = f"{1e3 * min(_repl_start(backends[module]) for _ in range(args.repeat)):>8.1f}" if module in backends else f"{'-':>8}"
+        print(f"{module:<18} {total / 1e3:>9.1f} {count:>6} {repl}  " + ", ".join(f"{n} {us / 1e3:.1f}" for n, us in heaviest))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AetherOS micro-benchmarks.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    precision = commands.add_parser('precision', help="grid memory and speed per precision policy")
+    precision.add_argument('--size', type=int, default=512)
+    precision.add_argument('--cores', type=int, default=8)
+    precision.add_argument('--steps', type=int, default=20)
+    precision.add_argument('--batch', type=int, default=256)
+    precision.set_defaults(run=bench_precision)
+
+    kernels = commands.add_parser('kernels', help="converge implementations by kernel, radius and pass count")
+    kernels.add_argument('--size', type=int, default=1024)
+    kernels.add_argument('--radii', type=int, nargs='+', default=[1, 4, 16, 64])
+    kernels.add_argument('--iterations', type=int, default=8)
+    kernels.add_argument('--repeat', type=int, default=3)
+    kernels.set_defaults(run=bench_kernels)
+
+    converge = commands.add_parser('converge', help="aether_lang/legacy converge scaling by grid size")
+    converge.add_argument('--sizes', type=int, nargs='+', default=[100, 256, 512, 1024, 2048, 4096])
+    converge.add_argument('--loop-max', type=int, default=256, help="largest size to also time the per-cell loop at")
+    converge.add_argument('--repeat', type=int, default=3)
+    converge.set_defaults(run=bench_converge)
+
+    em = commands.add_parser('em', help="vectorized E-M integration over many maneuver sequences")
+    em.add_argument('--sequences', type=int, default=1_000_000)
+    em.add_argument('--steps', type=int, default=20)
+    em.set_defaults(run=bench_em)
+
+    startup = commands.add_parser('startup', help="cold import and REPL start time per OS module (-X importtime)")
+    startup.add_argument('--modules', nargs='+', default=list(STARTUP_MODULES))
+    startup.add_argument('--repeat', type=int, default=3)
+    startup.add_argument('--top', type=int, default=3, help="heaviest direct imports to list per module")
+    startup.set_defaults(run=bench_startup)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+if __name__ == '__main__':
+    main()
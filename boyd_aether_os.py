@@ -1,94 +1,77 @@
 #!/usr/bin/env python3
 
+import contextlib
+import io
 import os
 import re
 import sys
+import tempfile
 import threading
 import time
 import random
 import numpy as np
 import unittest
+from types import SimpleNamespace
 
 # Import components from the E-M modules
 from boyd_flux_core import FluxCore, Intellectus
 from oracle import get_oracle
+from amplitude import text_to_amp
+from render import RENDER_MODES
+from runtime import Backend, Contextus as Runtime, repl
+from sim_clock import SimulationClock, tick_cores, TICK_DT, TICK_INTERVAL
+from em_diagram import em_diagram, DIAGRAM_RESOLUTION
+from em_integrator import EM_STATE_DTYPE, MANEUVER, STABILIZE, advance, em_state
+from sensor_hook import SynchronousSensor
 
 # --- AetherOS Grammar and Constants (mostly unchanged) ---
 KNOWN_VERBS = ['PERTURBO', 'CONVERGO', 'CREO', 'OSTENDO', 'FOCUS', 'ANOMALIA', 'VERITAS', 
                'MIRACULUM', 'REDIMO', 'INTERROGO', 'INSTAURO', 'EXERCEO', 'DIALECTICA', 
-               'DOCEO', 'DISCERE']
-KNOWN_INFLECTIONS = ['ABAM', 'EBAM', 'AM', 'O', 'E']
-inflection_map = {
-    'O': {'mod': 1.0}, 'E': {'mod': -1.0}, 'ABAM': {'mod': 1.5},
-    'EBAM': {'mod': -0.5}, 'AM': {'mod': random.uniform(0.5, 1.5)}
-}
+               'DOCEO', 'DISCERE', 'DIARIUM', 'ITERO', 'TEMPUS', 'PROSPICIO', 'DIAGRAMMA']
 PHI = (1 + np.sqrt(5)) / 2
+NUMBER = r"-?\d+(?:\.\d+)?"
+# PROSPICIO's default candidates: every thrust change paired with every load-factor change
+DEFAULT_THRUST_CANDIDATES = (-20.0, -10.0, -5.0, 0.0, 5.0, 10.0, 20.0)
+DEFAULT_LOAD_CANDIDATES = (-0.1, 0.0, 0.1)
 
-# Helper functions (text_to_amp, etc.) remain the same...
-def text_to_amp(text):
-    """Convert text to amplitude by summing ord values and taking log1p."""
-    return np.log1p(sum(ord(c) for c in text))
+# --- E-M Physics ---
+class BoydBackend(Backend):
+    """Energy-maneuverability cores; between commands a SimulationClock (TEMPUS) may tick them."""
+    name = 'boyd'
+    title = "AetherOS E-M"
+    verbs = KNOWN_VERBS
 
-# --- Main Application Context and Executor ---
-class Contextus:
-    """The container for the entire AetherOS cosmos and command execution."""
-    def __init__(self):
-        self.materiae = {}
-        self.focus = None
-        self.lock = threading.RLock()
-        self.verb_handlers = self._get_verb_handlers()
-        self._boot()
-
-    def _boot(self):
+    def boot(self, context):
         """Initialize the genesis materia."""
         print("< AetherOS v3.3 E-M (Boyd) Initializing... >")
         g = FluxCore()
-        self.materiae['GENESIS'] = g
-        self.focus = 'GENESIS'
+        context.materiae['GENESIS'] = g
+        context.focus = 'GENESIS'
         g.maneuver(10, 0.1)
         print("< Genesis Rhythm Complete. Focus on 'GENESIS'. >")
 
-    def get_focused_materia(self):
-        """Get the currently focused materia."""
-        with self.lock:
-            if not self.focus or self.focus not in self.materiae:
-                self.focus = 'GENESIS' if 'GENESIS' in self.materiae else None
-            if not self.focus: raise ValueError("NULLA MATERIA IN FOCO EST")
-            return self.materiae[self.focus]
-
-    def execute_command(self, cmd):
-        """Execute a Latin-inspired command."""
-        try:
-            verb, inflection, literals, args_str = self._parse_latin_command(cmd)
-            mod = inflection_map.get(inflection, {'mod': 1.0})['mod']
-            handler = self.verb_handlers.get(verb)
-            if handler:
-                return handler(inflection, mod, literals, args_str)
-            return f"VERBUM IGNORATUM '{verb}'"
-        except Exception as e:
-            return f"ERRORUM INTERNUM: {e}"
-
-    def _parse_latin_command(self, cmd):
-        """Parse the Latin command into verb, inflection, literals, and args."""
-        match = re.match(r"([A-Z]+(?:O|E|ABAM|EBAM|AM)?)\s*(.*)", cmd.strip().upper())
-        if not match: raise ValueError("FORMATUM INVALIDUM")
-        verb_full, args_str = match.groups()
-        verb, inflection = verb_full, 'O'
-        for v in KNOWN_VERBS:
-            if verb_full.startswith(v):
-                verb, inflection = v, verb_full[len(v):] or 'O'
-                break
-        literals = re.findall(r"'([^']*)'", args_str)
-        return verb, inflection, literals, args_str
-
-    def _get_verb_handlers(self):
-        """Get the dictionary of verb handlers."""
-        return {
-            'CREO': self._handle_creo, 'INSTAURO': self._handle_instauro,
-            'FOCUS': self._handle_focus, 'OSTENDO': self._handle_ostendo,
-            'PERTURBO': self._handle_perturbo, 'CONVERGO': self._handle_convergo,
-            'INTERROGO': self._handle_interrogo,
-        }
+    def regulate(self, context, name, action, args):
+        """'tick' coasts every core (steps, dt) and advances the simulated time."""
+        if action != 'tick': return False
+        steps, dt = args
+        tick_cores(list(context.materiae.values()), steps, dt)
+        context.tempus += steps * dt
+        return True
+
+    def close(self, context):
+        if context.clock:
+            context.clock.stop()
+            context.clock = None
+
+BACKEND = BoydBackend()
+
+# --- Main Application Context ---
+class Contextus(Runtime):
+    """The container for the entire AetherOS cosmos and command execution."""
+    def __init__(self, regulate=True, sensor=None):
+        self.clock = None
+        self.tempus = 0.0  # Simulated seconds integrated by clock ticks
+        super().__init__(BACKEND, regulate, sensor)
 
     def _handle_creo(self, inf, mod, lit, args):
         """Handle CREO command: Create a new materia."""
@@ -103,7 +86,7 @@ class Contextus:
         name = lit[0].upper()
         arch = (re.search(r"MODO\s+'([^']*)'", args.upper()) or [None, 'TRANSFORMER'])[1]
         if name in self.materiae: return f"'{name}' IAM EXISTIT"
-        self.materiae[name] = Intellectus(architecture=arch)
+        self.materiae[name] = Intellectus(architecture=arch, memory_capacity=self.memory_capacity(args))
         self.focus = name
         return f"INSTAURO INTELLECTUM '{name}' MODO '{arch}'."
 
@@ -115,10 +98,14 @@ class Contextus:
         return f"FOCUS NUNC IN '{name}'."
 
     def _handle_ostendo(self, inf, mod, lit, args):
-        """Handle OSTENDO command: Display a materia."""
-        name_to_show = lit[0].upper() if lit else self.focus
+        """Handle OSTENDO command: Display a materia, optionally by PAGINA or MODO."""
+        mode = (re.search(r"MODO\s+'([^']*)'", args.upper()) or [None, 'PLENUM'])[1]
+        page = int((re.search(r"PAGINA\s+(\d+)", args.upper()) or [None, 1])[1])
+        names = re.findall(r"'([^']*)'", re.sub(r"MODO\s+'[^']*'", '', args))
+        name_to_show = names[0].upper() if names else self.focus
         if name_to_show not in self.materiae: return f"MATERIA '{name_to_show}' NON EXISTIT"
-        return self.materiae[name_to_show].display()
+        if mode not in RENDER_MODES: return f"MODUS '{mode}' IGNOTUS"
+        return self.materiae[name_to_show].display(mode=mode, page=page)
 
     def _handle_perturbo(self, inf, mod, lit, args):
         """Handle PERTURBO command: Perturb the materia."""
@@ -151,26 +138,182 @@ class Contextus:
         core.context_embeddings['ORACULUM_RESPONSUM'] = response
         return f"ORACULUM RESPONDIT. MANEUVER INITIATED."
 
+    def _handle_tempus(self, inf, mod, lit, args):
+        """Handle TEMPUS command: CURRO [DT x] [INTERVALLO s] runs the clock, CESSO stops it, GRADUS n [DT x] steps it."""
+        upper = args.upper()
+        dt = float((re.search(rf"DT\s+({NUMBER})", upper) or [None, TICK_DT])[1])
+        if re.search(r"\bCURRO\b", upper):
+            interval = float((re.search(rf"INTERVALLO\s+({NUMBER})", upper) or [None, TICK_INTERVAL])[1])
+            if self.clock: self.clock.stop()
+            self.clock = SimulationClock(self, dt, interval)
+            self.clock.start()
+            return f"HOROLOGIUM CURRIT: DT {dt:g} OMNI {interval:g}S."
+        if re.search(r"\bCESSO\b", upper):
+            if not self.clock: return "HOROLOGIUM NON CURRIT."
+            self.clock.stop()
+            self.clock = None
+            return f"HOROLOGIUM CESSAVIT IN TEMPORE {self.tempus:.2f}."
+        steps = re.search(r"GRADUS\s+(\d+)", upper)
+        if steps:
+            self.regulate(None, 'tick', int(steps.group(1)), dt)
+        state = 'CURRIT' if self.clock else 'QUIESCIT'
+        return f"TEMPUS {self.tempus:.2f}. HOROLOGIUM {state}. Es={self.get_focused_materia().specific_energy:.2f}"
+
+    def _handle_prospicio(self, inf, mod, lit, args):
+        """Handle PROSPICIO command: Project candidate maneuvers (thrust/load pairs) GRADUS n ticks ahead; nothing changes."""
+        core = self.get_focused_materia()
+        upper = args.upper()
+        steps = int((re.search(r"GRADUS\s+(\d+)", upper) or [None, 10])[1])
+        dt = float((re.search(rf"DT\s+({NUMBER})", upper) or [None, TICK_DT])[1])
+        pairs = [float(v) for v in re.findall(NUMBER, re.sub(rf"(GRADUS|DT)\s+{NUMBER}", '', upper))]
+        if len(pairs) % 2: return "PROSPICIO REQUIRET PARIA: IMPULSUS ET ONUS"
+        if pairs:
+            thrust, load = np.array(pairs[0::2]), np.array(pairs[1::2])
+        else:
+            thrust, load = (a.ravel() for a in np.meshgrid(DEFAULT_THRUST_CANDIDATES, DEFAULT_LOAD_CANDIDATES))
+        trajectory = core.lookahead(thrust * mod, load * mod, steps, dt)
+        best = int(np.argmax(trajectory[-1]))
+        return (f"PROSPECTUS: {len(thrust)} CANDIDATI, {steps} GRADUS. OPTIMUM T{thrust[best] * mod:+g} n{load[best] * mod:+g}: "
+                f"Es {core.specific_energy:.2f} -> {trajectory[-1, best]:.2f}.")
+
+    def _handle_diagramma(self, inf, mod, lit, args):
+        """Handle DIAGRAMMA command: Export the focus's E-M diagram ('x.npz', 'x.png' or 'x.svg') [MAGNITUDO n]."""
+        lit = self.paths()
+        if not lit: return "DIAGRAMMA REQUIRET NOMEN ARCHIVI"
+        core = self.get_focused_materia()
+        resolution = int((re.search(r"MAGNITUDO\s+(\d+)", args.upper()) or [None, DIAGRAM_RESOLUTION])[1])
+        diagram = em_diagram(core, resolution=resolution)
+        diagram.save(lit[0], core.environment_factor, marker=(core.thrust, core.load_factor))
+        ps, _ = diagram.slice(core.environment_factor)
+        return f"DIAGRAMMA E-M IN '{lit[0]}': Ps {ps.min():.2f} .. {ps.max():.2f}."
+
+class TestBoydAetherOS(unittest.TestCase):
+    """Unit tests for the E-M physics and its command handlers."""
+    def setUp(self):
+        # A synchronous sensor keeps the environment factor fixed between syncs
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.sensor = SynchronousSensor(seed=5)
+            self.context = Contextus(regulate=False, sensor=self.sensor)
+
+    def tearDown(self):
+        self.context.close()
+
+    def test_vectorized_integrator_matches_scalar(self):
+        """advance() and run_sequence() reproduce the step-by-step maneuver/stabilize physics."""
+        def scalar(core, steps):
+            s = {name: getattr(core, name) for name in EM_STATE_DTYPE.names}
+            for kind, dt, dn in steps:
+                if kind == MANEUVER:
+                    s['thrust'] += dt * core.THRUST_GAIN
+                    s['load_factor'] = max(1.0, s['load_factor'] + dn)
+                else:
+                    s['thrust'] *= 0.95
+                    s['load_factor'] = max(1.0, s['load_factor'] * 0.9)
+                s['drag'] = 95.0 * s['load_factor']**2 * s['environment_factor']
+                s['specific_energy'] = max(0, s['specific_energy'] + (s['thrust'] * s['environment_factor'] - s['drag'])
+                                           * s['velocity'] / s['weight'])
+                s['velocity'] = np.sqrt(2 * 9.81 * s['specific_energy']) * 0.1
+            return s
+
+        steps = [(MANEUVER, 12.0, 0.2), (MANEUVER, -3.0, 0.4), (STABILIZE, 0, 0), (MANEUVER, 40.0, -0.1), (STABILIZE, 0, 0)]
+        kinds, thrust, load = (np.array(column) for column in zip(*steps))
+        self.context.execute_command("INSTAURO 'AGILIS'")
+        self.context.adopt_cores()  # Pins the synchronous sensor on AGILIS too
+        for core in (self.context.materiae['GENESIS'], self.context.materiae['AGILIS']):
+            start, expected = core.em_state(), scalar(core, steps)
+            for kind, dt, dn in steps:
+                core.maneuver(dt, dn) if kind == MANEUVER else core.stabilize()
+            self.assertAlmostEqual(core.specific_energy, expected['specific_energy'])
+            core.adopt_em_state(start)
+            core.run_sequence(kinds, thrust, load)  # The whole sequence in one pass
+            for name in ('specific_energy', 'thrust', 'load_factor', 'velocity'):
+                self.assertAlmostEqual(getattr(core, name), expected[name])
+
+        # Many independent sequences at once: one column per state
+        rng = np.random.default_rng(1)
+        kinds = rng.integers(0, 2, size=(6, 50)).astype(np.uint8)
+        thrust, load = rng.normal(0, 20, size=(6, 50)), rng.normal(0, 0.2, size=(6, 50))
+        state = em_state(50, environment_factor=rng.uniform(0.5, 1.5, 50))
+        reference = state.copy()
+        history = advance(state, kinds, thrust, load, record=True)
+        for j in range(50):
+            core = SimpleNamespace(THRUST_GAIN=1.0, **{name: float(reference[name][j]) for name in EM_STATE_DTYPE.names})
+            expected = scalar(core, list(zip(kinds[:, j], thrust[:, j], load[:, j])))
+            self.assertAlmostEqual(history[-1, j], expected['specific_energy'])
+            self.assertAlmostEqual(state['thrust'][j], expected['thrust'])
+
+    def test_prospicio_leaves_the_core_unchanged(self):
+        core = self.context.materiae['GENESIS']
+        before, events, revision = core.em_state(), len(core.memory_patterns), core.revision
+        response = self.context.execute_command("PROSPICIO 10 0.1 -5 0 GRADUS 20")
+        self.assertIn("2 CANDIDATI, 20 GRADUS", response)
+        trajectory = core.lookahead([10.0, -5.0], [0.1, 0.0], 20, TICK_DT)
+        self.assertEqual(trajectory.shape, (21, 2))
+        self.assertEqual(core.em_state().tobytes(), before.tobytes())
+        self.assertEqual((len(core.memory_patterns), core.revision), (events, revision))
+
+    def test_tempus_ticks_replay_through_itero(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'Diarium.jsonl')
+            self.context.execute_command(f"DIARIUM '{path}'")
+            for cmd in ["TEMPUS GRADUS 5", "PERTURBO 'Ascende.'", "TEMPUS GRADUS 3 DT 0.5", "CONVERGO"]:
+                self.context.execute_command(cmd)
+            self.context.execute_command("DIARIUM CESSO")
+            self.assertAlmostEqual(self.context.tempus, 5 * TICK_DT + 3 * 0.5)
+            expected = self.context.materiae['GENESIS'].em_state()
+            with open(path) as f:
+                self.assertEqual(sum('"regulator":"tick"' in line for line in f), 2)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                replay = Contextus(regulate=False, sensor=SynchronousSensor(seed=5))
+            try:
+                self.assertIn("ITERATIO PERFECTA", replay.execute_command(f"ITERO '{path}'"))
+                self.assertAlmostEqual(replay.tempus, self.context.tempus)
+                self.assertEqual(replay.materiae['GENESIS'].em_state().tobytes(), expected.tobytes())
+            finally:
+                replay.close()
+
+    def test_clock_stops_before_returning(self):
+        self.context.execute_command("TEMPUS CURRO INTERVALLO 0.01")
+        clock = self.context.clock
+        time.sleep(0.1)
+        self.assertIn("CESSAVIT", self.context.execute_command("TEMPUS CESSO"))
+        self.assertFalse(clock.is_alive())
+        tempus = self.context.tempus
+        self.assertGreater(tempus, 0)
+        time.sleep(0.05)
+        self.assertEqual(self.context.tempus, tempus)  # No tick lands after CESSO
+
+    def test_em_diagram_and_diagramma(self):
+        core = self.context.materiae['GENESIS']
+        diagram = em_diagram(core, resolution=41)
+        t, n = diagram.thrust[30], diagram.load_factor[10]
+        for k, env in enumerate(diagram.environment):
+            expected = env * (t - 95.0 * n**2) * core.velocity / core.weight
+            self.assertAlmostEqual(diagram.ps[k, 10, 30], expected)
+        self.assertTrue(np.array_equal(diagram.slice(1.0)[0], diagram.ps[1]))
+        envelope = diagram.envelope()
+        self.assertGreaterEqual(envelope[1, 10], 95.0 * n**2)  # The least thrust that sustains the turn
+        self.context.execute_command("PERTURBO 'Ascende.'")  # A new velocity reuses the cached mesh
+        self.assertIs(em_diagram(core, resolution=41).excess, diagram.excess)
+
+        with tempfile.TemporaryDirectory() as d:
+            for name in ('Diagramma.npz', 'Diagramma.png', 'Diagramma.svg'):
+                path = os.path.join(d, name)
+                self.assertIn("DIAGRAMMA E-M", self.context.execute_command(f"DIAGRAMMA '{path}' MAGNITUDO 64"))
+                self.assertTrue(os.path.getsize(path) > 0)
+            with np.load(os.path.join(d, 'Diagramma.npz')) as data:
+                self.assertEqual(data['ps'].shape, (3, 64, 64))
+            with open(os.path.join(d, 'Diagramma.svg')) as f:
+                self.assertIn('stroke-width="3"', f.read())  # The Ps = 0 envelope
+            self.assertIn("FORMA 'TXT' IGNOTA", self.context.execute_command(f"DIAGRAMMA '{d}/x.txt'"))
+
 # --- Main Execution Logic ---
 def main():
-    context = Contextus()
-    print("\n--- AetherOS E-M REPL ---")
-    print("Type 'vale' to quit.")
-    while True:
-        try:
-            cmd = input(f"aetheros({context.focus})> ")
-            if cmd.lower() in ['exit', 'vale']: break
-            if not cmd.strip(): continue
-            response = context.execute_command(cmd)
-            print(f"< {response}")
-        except (EOFError, KeyboardInterrupt):
-            print("\n< Cleaning up threads... >")
-            # Add cleanup for any threads if needed
-            break
-    print("\n< VALE.")
+    repl(Contextus())
 
 if __name__ == '__main__':
     if len(sys.argv) > 1 and sys.argv[1] == 'test':
-        unittest.main()
+        unittest.main(argv=sys.argv[:1])
     else:
-        main()
\ No newline at end of file
+        main()
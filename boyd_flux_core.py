@@ -3,20 +3,24 @@
 import numpy as np
 import random
 
-# Import the global sensor instance
-from sensor_hook import ferro_sensor
+# Cores read the sensor bound by their Contextus, else the global ferro_sensor (created on first use)
+import sensor_hook
+from context_store import ContextStore
+from ring_buffer import RingBuffer, MEMORY_CAPACITY
+from render import render
+from em_integrator import MANEUVER, STABILIZE, EM_STATE_DTYPE, advance, project, render_disc
 
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
+# One memory event: what happened, the change applied, and the specific energy it left
+MANEUVER_DTYPE = np.dtype([('kind', np.uint8), ('thrust_change', np.float64),
+                           ('load_factor_change', np.float64), ('specific_energy', np.float64)])
 
 class FluxCore:
     """
     A fundamental unit of existence whose physics are governed by E-M theory.
     """
-    def __init__(self, size=128):
+    THRUST_GAIN = 1.0  # Multiplies every maneuver's thrust change
+
+    def __init__(self, size=128, memory_capacity=MEMORY_CAPACITY):
         self.size = size
         self.grid = np.zeros((size, size), dtype=np.float32)
         
@@ -28,78 +32,96 @@ class FluxCore:
         self.weight = 10.0           # (W) Inertia or resistance to change
         self.load_factor = 1.0       # (n) Multiplier for energy cost during maneuvers
 
-        self.memory_patterns = []
-        self.context_embeddings = {}
+        self.memory_patterns = RingBuffer(memory_capacity, MANEUVER_DTYPE, field='specific_energy')
+        self.context_embeddings = ContextStore()
         self.anomaly = None
+        self.revision = 0  # Bumped by every mutation; checkpoints compare it
 
         self._sync_environmental_factors()
 
+    @property
+    def sensor(self):
+        """The sensor the core syncs with; a Contextus points this at its own (default: the active one)."""
+        return getattr(self, '_sensor', None) or sensor_hook.active_sensor()
+
+    @sensor.setter
+    def sensor(self, value):
+        self._sensor = value
+
     def _sync_environmental_factors(self):
         """Sync with sensor data."""
-        sensor_data = ferro_sensor.get_sextet()
+        sensor_data = self.sensor.get_sextet()
         self.environment_factor = np.clip(sensor_data.get('permeability', 1.0), 0.5, 1.5)
 
+    def touch(self):
+        """Mark the core as changed since the last checkpoint."""
+        self.revision += 1
+
     def maneuver(self, thrust_change, load_factor_change):
         """Perturb the core using E-M maneuver."""
-        self._sync_environmental_factors()
-        
-        self.thrust += thrust_change
-        self.load_factor = max(1.0, self.load_factor + load_factor_change)
-
-        # Drag increases with the square of the load factor
-        self.drag = 95.0 * (self.load_factor**2) * self.environment_factor
-        
-        self._update_energy_state()
-        self._update_memory(f"Maneuver: T={thrust_change}, n={load_factor_change}")
+        self.run_sequence([MANEUVER], [thrust_change], [load_factor_change])
 
     def stabilize(self):
         """Stabilize the core."""
-        self.thrust *= 0.95 
-        self.load_factor *= 0.9
-        self.load_factor = max(1.0, self.load_factor)
-        
-        self.drag = 95.0 * (self.load_factor**2) * self.environment_factor
-        
+        self.run_sequence([STABILIZE], sync=False)
+
+    def run_sequence(self, kinds, thrust_changes=0.0, load_factor_changes=0.0, sync=True):
+        """Integrates a whole sequence of maneuvers/stabilizations in one pass.
+
+        The environment factor is synced once, up front; memory gets one event per step
+        and the grid is rendered once, for the final energy.
+        """
+        self.touch()
+        if sync: self._sync_environmental_factors()
+        kinds = np.asarray(kinds, dtype=np.uint8)
+        state = self.em_state()
+        history = advance(state, kinds, thrust_changes, load_factor_changes, self.THRUST_GAIN, record=True)
+        self.adopt_em_state(state)
+
+        events = np.zeros(len(kinds), MANEUVER_DTYPE)
+        events['kind'] = kinds
+        maneuvering = kinds == MANEUVER
+        events['thrust_change'] = np.where(maneuvering, np.broadcast_to(thrust_changes, kinds.shape) * self.THRUST_GAIN, 0.0)
+        events['load_factor_change'] = np.where(maneuvering, np.broadcast_to(load_factor_changes, kinds.shape), 0.0)
+        events['specific_energy'] = history[:, 0]
+        self.memory_patterns.extend(events)
+
+    def em_state(self):
+        """The core's E-M sextet (plus environment) as a one-element EM_STATE_DTYPE array."""
+        state = np.zeros(1, EM_STATE_DTYPE)
+        for name in EM_STATE_DTYPE.names:
+            state[name] = getattr(self, name)
+        return state
+
+    def adopt_em_state(self, state):
+        """Takes the sextet from a one-element EM_STATE_DTYPE array and re-renders the grid."""
+        for name in EM_STATE_DTYPE.names:
+            setattr(self, name, float(state[name][0]))
         self._update_energy_state()
-        self._update_memory("Stabilize")
+
+    def lookahead(self, thrust_changes, load_factor_changes=0.0, steps=10, dt=1.0):
+        """Projected specific energy, (steps + 1, candidates), for candidate maneuvers; the core is unchanged."""
+        return project(self.em_state(), thrust_changes, load_factor_changes, steps, dt, self.THRUST_GAIN)
 
     def _update_energy_state(self):
-        """Update energy state."""
-        specific_excess_power = ((self.thrust * self.environment_factor) - self.drag) * self.velocity / self.weight
-        
-        self.specific_energy += specific_excess_power
-        self.specific_energy = max(0, self.specific_energy)  # Prevent negative energy
-        
-        self.velocity = np.sqrt(max(0, 2 * 9.81 * (self.specific_energy - 0)) ) * 0.1  # Simplified V = sqrt(2g * Es) assuming h=0
-        
-        # Update grid
-        center_brightness = np.clip(self.specific_energy / 200.0, 0, 1)
-        self.grid = np.zeros((self.size, self.size), dtype=np.float32)
-        if CV2_AVAILABLE:
-            cv2.circle(self.grid, (self.size//2, self.size//2), int(self.size/4), center_brightness, -1)
-        else:
-            # Mock without cv2
-            self.grid[self.size//4:self.size*3//4, self.size//4:self.size*3//4] = center_brightness
-
-    def _update_memory(self, change):
-        """Record change to memory."""
-        self.memory_patterns.append(change)
-        if len(self.memory_patterns) > 100: self.memory_patterns.pop(0)
-
-    def display(self):
-        """Display the core's state."""
-        context_str = "\n".join([f"  '{k}': {v}" for k, v in self.context_embeddings.items()])
+        """Update grid: the cached disc, scaled by the core's energy."""
+        self.grid = render_disc(self.size, self.specific_energy)
+
+    def summary(self):
+        """Energy and E-M sextet lines."""
         return (f"SPECIFIC ENERGY (Es): {self.specific_energy:.2f}\n"
-                f"E-M SEXTET: T={self.thrust:.2f}, D={self.drag:.2f}, V={self.velocity:.2f}, W={self.weight:.2f}, n={self.load_factor:.2f}\n"
-                f"CONTEXTUS:\n{context_str}")
+                f"E-M SEXTET: T={self.thrust:.2f}, D={self.drag:.2f}, V={self.velocity:.2f}, W={self.weight:.2f}, n={self.load_factor:.2f}")
+
+    def display(self, **options):
+        """Display the core's state."""
+        return render(self, **options)
 
 class Intellectus(FluxCore):
     """A specialized E-M core with enhanced learning/adaptation."""
-    def __init__(self, architecture='TRANSFORMER', size=128):
-        super().__init__(size)
+    THRUST_GAIN = 1.2
+
+    def __init__(self, architecture='TRANSFORMER', size=128, memory_capacity=MEMORY_CAPACITY):
+        super().__init__(size, memory_capacity)
         self.architecture = architecture
         if self.architecture == 'TRANSFORMER':
-            self.weight = 8.0 # Lighter, more agile
-
-    def maneuver(self, thrust_change, load_factor_change):
-        super().maneuver(thrust_change * 1.2, load_factor_change)
\ No newline at end of file
+            self.weight = 8.0 # Lighter, more agile
\ No newline at end of file
@@ -0,0 +1,196 @@
+# checkpoint.py
+#
+# Description:
+# Incremental checkpointing of a plenum. A background Checkpointer notices which
+# materiae changed since its last pass (through each core's revision counter,
+# bumped by perturb/converge and therefore by the regulator too, and its context
+# store's version) and appends only those cores to a write-ahead log next to a
+# full SALVO snapshot. A core whose only change is its context is logged without
+# its grid, a tiled core logs only its allocated tiles, and a context snapshot is written to the log once, then referenced
+# by id. When the log grows past a threshold it is compacted into
+# a fresh snapshot. Recovery loads the snapshot and replays the log, so a crash
+# loses at most one checkpoint interval of work. Log records carry the
+# generation of the snapshot they extend, so records left behind by a crash
+# during compaction are never replayed onto a newer snapshot.
+
+import json
+import os
+import struct
+import threading
+import time
+import numpy as np
+
+from persistence import (core_entry, decode_snapshots, encode_context, encode_snapshots, install_plenum,
+                         read_snapshot, restore_context, restore_core, save_plenum, snapshot_paths)
+from tiled_grid import TiledGrid
+
+CHECKPOINT_INTERVAL = 5.0  # Seconds between incremental checkpoints
+COMPACT_BYTES = 64 * 1024 * 1024  # Log size that triggers compaction into a full snapshot
+_HEADER = struct.Struct('<I')  # Length of each record's JSON metadata
+
+def wal_path(path):
+    base, _ = os.path.splitext(snapshot_paths(path)[1])
+    return base + '.wal'
+
+def grid_payload(entry, grid):
+    """The log bytes of a grid; a TiledGrid adds its tile layout to `entry` and sends only its tiles."""
+    if isinstance(grid, TiledGrid):
+        entry['tiles'], payload = grid.pack()
+        return payload
+    return np.ascontiguousarray(grid).tobytes()
+
+def decode_grid(entry, payload):
+    if 'tiles' in entry: return TiledGrid.unpack(entry['tiles'], payload, np.dtype(entry['dtype']))
+    return np.frombuffer(payload, dtype=np.dtype(entry['dtype'])).reshape(entry['shape']).copy()
+
+def core_signature(core):
+    """Changes whenever the core, its grid/sextet or its context changes."""
+    store = core.context_embeddings
+    return (id(core), getattr(core, 'revision', None), getattr(store, 'version', None))
+
+# --- Write-Ahead Log ---
+
+def append_records(path, records):
+    """Appends (metadata, grid bytes) records and forces them to disk."""
+    with open(wal_path(path), 'ab') as f:
+        for meta, payload in records:
+            raw = json.dumps(meta, separators=(',', ':')).encode()
+            f.write(_HEADER.pack(len(raw)))
+            f.write(raw)
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_records(path):
+    """Yields (metadata, grid bytes) from the log, stopping at a torn final record."""
+    try:
+        f = open(wal_path(path), 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        while True:
+            head = f.read(_HEADER.size)
+            if len(head) < _HEADER.size: return
+            raw = f.read(_HEADER.unpack(head)[0])
+            try:
+                meta = json.loads(raw)
+            except ValueError:
+                return
+            payload = f.read(meta.get('nbytes', 0))
+            if len(payload) < meta.get('nbytes', 0): return
+            yield meta, payload
+
+def recover_plenum(context, path):
+    """Loads the snapshot at `path`, then replays its write-ahead log on top."""
+    materiae, snapshots, base = read_snapshot(path)
+    focus = base['focus']
+    for meta, payload in read_records(path):
+        if meta.get('generation') != base.get('generation'): continue
+        if meta['op'] == 'put':
+            decode_snapshots(meta['snapshots'], snapshots)
+            entry = meta['core']
+            materiae[entry['name']] = restore_core(entry, decode_grid(entry, payload), snapshots)
+        elif meta['op'] == 'context' and meta['name'] in materiae:
+            decode_snapshots(meta['snapshots'], snapshots)
+            materiae[meta['name']].context_embeddings = restore_context(meta['context'], snapshots)
+        elif meta['op'] == 'del':
+            materiae.pop(meta['name'], None)
+        focus = meta.get('focus', focus)
+    return install_plenum(context, materiae, focus)
+
+# --- Background Checkpointer ---
+
+class Checkpointer(threading.Thread):
+    """Appends the cores changed since the last pass to the log every `interval` seconds."""
+    def __init__(self, context, path, interval=CHECKPOINT_INTERVAL, compact_bytes=COMPACT_BYTES):
+        super().__init__(daemon=True)
+        self.context = context
+        self.path = path
+        self.interval = interval
+        self.compact_bytes = compact_bytes
+        self.stopped = threading.Event()
+        self.checkpoints = 0
+        self.cores_written = 0
+        self.generation = None  # Generation of the snapshot the log currently extends
+        self._seen = {}  # name -> core_signature at the last checkpoint
+        self._logged = set()  # Ids of the context snapshots already in the log
+        self._io_lock = threading.Lock()
+
+    def run(self):
+        self.compact()
+        while not self.stopped.wait(self.interval):
+            self.checkpoint()
+
+    def stop(self):
+        """Stops the thread, waits for a pass in flight, then writes one last checkpoint."""
+        self.stopped.set()
+        if self.is_alive() and self is not threading.current_thread(): self.join()
+        if self.generation is None: self.compact()
+        self.checkpoint()
+
+    def _plenum_lock(self):
+        """Takes the plenum lock, giving up once the thread is stopped (stop() may hold it while joining)."""
+        while not self.context.lock.acquire(timeout=0.1):
+            if self.stopped.is_set() and self is threading.current_thread(): return False
+        return True
+
+    def _collect(self):
+        """Under the plenum lock: encode the changed cores and note the removed ones."""
+        records = []
+        if not self._plenum_lock(): return records
+        try:
+            focus = self.context.focus
+            current = {}
+            for name, core in self.context.materiae.items():
+                current[name] = sig = core_signature(core)
+                seen = self._seen.get(name)
+                if seen == sig: continue
+                snapshots = {}
+                if seen is not None and seen[:2] == sig[:2]:  # Same core, same grid: only its context changed
+                    meta = {'op': 'context', 'name': name, 'context': encode_context(core, snapshots)}
+                    payload = b''
+                else:
+                    entry = core_entry(name, core, snapshots)
+                    payload = grid_payload(entry, core.grid)
+                    meta = {'op': 'put', 'core': entry, 'nbytes': len(payload)}
+                meta['snapshots'] = table = encode_snapshots(snapshots, self._logged)
+                self._logged.update(map(int, table))
+                meta.update({'focus': focus, 'generation': self.generation, 'time': time.time()})
+                records.append((meta, payload))
+            for name in self._seen.keys() - current.keys():
+                records.append(({'op': 'del', 'name': name, 'focus': focus, 'generation': self.generation,
+                                 'time': time.time()}, b''))
+            self._seen = current
+        finally:
+            self.context.lock.release()
+        return records
+
+    def checkpoint(self):
+        """Writes one incremental checkpoint; returns the number of records appended."""
+        with self._io_lock:
+            records = self._collect()
+            if records:
+                append_records(self.path, records)
+                self.cores_written += sum(1 for meta, _ in records if meta['op'] != 'del')
+            self.checkpoints += 1
+            if os.path.exists(wal_path(self.path)) and os.path.getsize(wal_path(self.path)) > self.compact_bytes:
+                self._compact_locked()
+            return len(records)
+
+    def compact(self):
+        """Folds the log into a fresh full snapshot and starts an empty log."""
+        with self._io_lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        generation = time.time_ns()
+        if not self._plenum_lock(): return
+        try:
+            save_plenum(self.context, self.path, generation)  # Atomic: renamed into place once complete
+            self._seen = {name: core_signature(core) for name, core in self.context.materiae.items()}
+            self._logged = set()
+        finally:
+            self.context.lock.release()
+        self.generation = generation
+        with open(wal_path(self.path), 'wb'):
+            pass
@@ -0,0 +1,114 @@
+# context_store.py
+#
+# Description:
+# The bounded memory behind every FluxCore's context_embeddings. Entries are
+# capped in size, the store evicts least-recently-used (and optionally aged)
+# entries, and teaching passes wisdom as an id-addressed snapshot instead of a
+# stringified copy, so DOCEO chains no longer grow geometrically. Snapshots
+# nested in a snapshot are kept only as ids, so old levels are freed and a
+# chain never holds more than the levels cores still reference directly.
+
+import itertools
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+MAX_ENTRIES = 256
+MAX_ENTRY_CHARS = 4096
+MAX_AGE = None  # Seconds; None keeps entries until LRU eviction
+
+_snapshot_ids = itertools.count(1)
+_snapshots = weakref.WeakValueDictionary()  # id -> ContextSnapshot, while referenced
+
+class SnapshotRef(int):
+    """A snapshot nested inside another, held by id so older teaching levels can be collected."""
+    def resolve(self):
+        """The referenced snapshot, or None once nothing else holds it."""
+        return _snapshots.get(int(self))
+
+    def __repr__(self):
+        return f"<SNAPSHOT #{int(self)}>"
+
+class ContextSnapshot:
+    """A frozen copy of a core's context entries, referenced by id.
+
+    Snapshots among the entries are frozen as SnapshotRefs, so a snapshot never keeps the
+    ones it was taught from alive and a teaching chain holds at most one live level per core.
+    """
+    __slots__ = ('id', 'owner', 'summary', 'entries', '__weakref__')
+
+    def __init__(self, owner, entries, summary=None, snapshot_id=None):
+        self.id = snapshot_id or next(_snapshot_ids)
+        self.owner = owner
+        self.summary = summary
+        self.entries = {k: SnapshotRef(v.id) if isinstance(v, ContextSnapshot) else v for k, v in dict(entries).items()}
+        _snapshots[self.id] = self
+
+    def __repr__(self):
+        return f"<SNAPSHOT #{self.id} '{self.owner}' ({len(self.entries)})>"
+
+def get_snapshot(snapshot_id):
+    """Looks up a live snapshot by id, or None once nothing references it."""
+    return _snapshots.get(snapshot_id)
+
+def clip_value(value, max_chars=MAX_ENTRY_CHARS):
+    """Bounds an entry: long strings are truncated, large objects are reduced to a clipped repr."""
+    if isinstance(value, (ContextSnapshot, int, float)) or value is None:
+        return value
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= max_chars:
+        return value
+    return f"{text[:max_chars]}...[+{len(text) - max_chars}]"
+
+class ContextStore(MutableMapping):
+    """A core's context embeddings, bounded in entry size, entry count and age."""
+    def __init__(self, max_entries=MAX_ENTRIES, max_entry_chars=MAX_ENTRY_CHARS, max_age=MAX_AGE):
+        self.max_entries = max_entries
+        self.max_entry_chars = max_entry_chars
+        self.max_age = max_age
+        self._entries = OrderedDict()  # key -> (value, written_at), least recently used first
+        self.version = 0  # Bumped on every write, so checkpoints can spot changed stores
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        self._entries[key] = (clip_value(value, self.max_entry_chars), time.time())
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def __getitem__(self, key):
+        value, _ = self._entries[key]
+        self._entries.move_to_end(key)
+        return value
+
+    def __delitem__(self, key):
+        self.version += 1
+        del self._entries[key]
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def items(self):
+        """Entries in LRU order, read without refreshing their recency."""
+        return [(k, v) for k, (v, _) in self._entries.items()]
+
+    def values(self):
+        return [v for v, _ in self._entries.values()]
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            for key in [k for k, (_, t) in self._entries.items() if t < cutoff]:
+                del self._entries[key]
+
+    def snapshot(self, owner, summary=None):
+        """Freezes the current entries into an id-addressed ContextSnapshot."""
+        return ContextSnapshot(owner, self.items(), summary)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
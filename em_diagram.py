@@ -0,0 +1,151 @@
+# em_diagram.py
+#
+# Description:
+# Energy-maneuverability diagrams for Boyd cores. Specific excess power,
+#   Ps = (T * env - D) * V / W,  with  D = 95 * n^2 * env,
+# is evaluated over a whole thrust x load_factor x environment_factor mesh in
+# one broadcast, for a core's current velocity and weight. Only the (load
+# factor, thrust) plane of T - 95 n^2 depends on the mesh, so that plane is
+# what gets cached, per mesh; a core's diagram is that plane scaled by
+# env * V / W, and a slice costs one multiply. Diagrams export to .npz arrays,
+# a PNG heat map (cv2) or an SVG of iso-Ps contours.
+
+import functools
+import numpy as np
+
+from em_integrator import BASE_DRAG
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+DIAGRAM_RESOLUTION = 1000  # Samples along the thrust and load-factor axes
+THRUST_RANGE = (0.0, 400.0)
+LOAD_RANGE = (1.0, 2.5)
+ENVIRONMENT_FACTORS = (0.5, 1.0, 1.5)  # The sensor clips the environment factor to this range
+SVG_LEVELS = 9  # Iso-Ps contours drawn per SVG (the Ps = 0 envelope is always one of them)
+MESH_CACHE_SIZE = 2  # Cached excess-thrust planes (8 MB each at the default resolution)
+
+class EMDiagram:
+    """Ps over (environment, load factor, thrust), with the axes and the core state it was drawn for."""
+    def __init__(self, thrust, load_factor, environment, excess, velocity, weight):
+        self.thrust = thrust
+        self.load_factor = load_factor
+        self.environment = environment
+        self.excess = excess  # T - 95 n^2 over (load factors, thrusts), shared per mesh, read-only
+        self.scale = environment * velocity / weight  # Ps = scale[env] * excess
+        self.velocity = velocity
+        self.weight = weight
+        self._ps = None
+
+    @property
+    def ps(self):
+        """The full (environments, load factors, thrusts) cube, built on first use."""
+        if self._ps is None:
+            self._ps = self.scale[:, None, None] * self.excess[None]
+            self._ps.flags.writeable = False
+        return self._ps
+
+    def slice(self, environment=1.0):
+        """The (load factor, thrust) plane nearest to `environment`, and its index."""
+        index = int(np.argmin(np.abs(self.environment - environment)))
+        return self.scale[index] * self.excess, index
+
+    def envelope(self):
+        """Per environment and load factor, the least thrust on the mesh with Ps >= 0 (nan if none)."""
+        positive = self.ps >= 0
+        first = np.argmax(positive, axis=-1)
+        return np.where(positive.any(axis=-1), self.thrust[first], np.nan)
+
+    def save_npz(self, path):
+        with open(path, 'wb') as f:  # A file object, so numpy doesn't append its own .npz
+            np.savez(f, thrust=self.thrust, load_factor=self.load_factor, environment=self.environment,
+                     ps=self.ps, velocity=self.velocity, weight=self.weight)
+
+    def to_image(self, environment=1.0, marker=None):
+        """A BGR heat map of one slice: blue for energy loss, red for gain, white along Ps = 0.
+
+        Load factor increases upward and thrust to the right; `marker` is a (thrust, load) point to ring.
+        """
+        if not CV2_AVAILABLE: raise RuntimeError("DIAGRAMMA IMAGINIS REQUIRET OPENCV")
+        ps, _ = self.slice(environment)
+        scale = float(np.abs(ps).max()) or 1.0
+        levels = np.clip(127.5 + 127.5 * ps / scale, 0, 255).astype(np.uint8)[::-1]
+        image = cv2.applyColorMap(levels, cv2.COLORMAP_JET)
+        sign = np.signbit(ps[::-1]).astype(np.int8)
+        image[np.diff(sign, axis=1, prepend=sign[:, :1]) != 0] = 255
+        if marker is not None:
+            cv2.circle(image, self._pixel(*marker), max(3, len(self.thrust) // 100), (255, 255, 255), 2)
+        return image
+
+    def save_png(self, path, environment=1.0, marker=None):
+        cv2.imwrite(path, self.to_image(environment, marker))
+
+    def save_svg(self, path, environment=1.0, marker=None, levels=SVG_LEVELS):
+        """Iso-Ps contours of one slice as SVG polylines, with the Ps = 0 envelope in bold."""
+        if not CV2_AVAILABLE: raise RuntimeError("DIAGRAMMA SVG REQUIRET OPENCV")
+        ps, index = self.slice(environment)
+        h, w = ps.shape
+        bound = float(np.abs(ps).max()) or 1.0
+        values = np.linspace(-bound, bound, levels + 2)[1:-1]
+        values = np.unique(np.append(values - values[np.argmin(np.abs(values))], 0.0))  # Shift so 0 is a level
+        flipped = ps[::-1]
+        paths = []
+        for value in values:
+            mask = (flipped >= value).astype(np.uint8)
+            contours, _ = cv2.findContours(mask, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+            hue = 'black' if value == 0 else ('#c0392b' if value > 0 else '#2e86c1')
+            width = 3 if value == 0 else 1
+            for contour in contours:
+                points = " ".join(f"{x},{y}" for x, y in contour[:, 0])
+                paths.append(f'<polyline points="{points}" fill="none" stroke="{hue}" stroke-width="{width}">'
+                             f'<title>Ps = {value:.3g}</title></polyline>')
+        if marker is not None:
+            x, y = self._pixel(*marker)
+            paths.append(f'<circle cx="{x}" cy="{y}" r="{max(3, w // 100)}" fill="none" stroke="black" stroke-width="2"/>')
+        t0, t1 = self.thrust[0], self.thrust[-1]
+        n0, n1 = self.load_factor[0], self.load_factor[-1]
+        svg = (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="-60 -30 {w + 90} {h + 80}" width="{w + 90}" height="{h + 80}">\n'
+               f'<text x="0" y="-10" font-size="14">E-M diagram: V={self.velocity:.3g}, W={self.weight:.3g}, '
+               f'env={self.environment[index]:.3g}</text>\n'
+               f'<rect x="0" y="0" width="{w}" height="{h}" fill="none" stroke="gray"/>\n'
+               + "\n".join(paths) +
+               f'\n<text x="0" y="{h + 20}" font-size="12">T={t0:g}</text>'
+               f'<text x="{w}" y="{h + 20}" font-size="12" text-anchor="end">T={t1:g}</text>'
+               f'<text x="{w / 2}" y="{h + 40}" font-size="14" text-anchor="middle">thrust</text>'
+               f'<text x="-5" y="{h}" font-size="12" text-anchor="end">n={n0:g}</text>'
+               f'<text x="-5" y="12" font-size="12" text-anchor="end">n={n1:g}</text>\n</svg>\n')
+        with open(path, 'w') as f:
+            f.write(svg)
+
+    def save(self, path, environment=1.0, marker=None):
+        """Exports by extension: .npz arrays, .png heat map or .svg contours."""
+        extension = path.rsplit('.', 1)[-1].lower()
+        savers = {'npz': lambda: self.save_npz(path), 'png': lambda: self.save_png(path, environment, marker),
+                  'svg': lambda: self.save_svg(path, environment, marker)}
+        if extension not in savers: raise ValueError(f"FORMA '{extension.upper()}' IGNOTA")
+        savers[extension]()
+
+    def _pixel(self, thrust, load_factor):
+        x = int(round(np.interp(thrust, self.thrust, np.arange(len(self.thrust)))))
+        y = int(round(np.interp(load_factor, self.load_factor, np.arange(len(self.load_factor)))))
+        return x, len(self.load_factor) - 1 - y
+
+@functools.lru_cache(maxsize=MESH_CACHE_SIZE)
+def _mesh(thrust_range, load_range, resolution):
+    """The thrust and load-factor axes and the excess-thrust plane T - 95 n^2 over them."""
+    thrust = np.linspace(*thrust_range, resolution)
+    load_factor = np.linspace(*load_range, resolution)
+    excess = thrust[None, :] - BASE_DRAG * load_factor[:, None] ** 2
+    for array in (thrust, load_factor, excess):
+        array.flags.writeable = False
+    return thrust, load_factor, excess
+
+def em_diagram(core, thrust_range=THRUST_RANGE, load_range=LOAD_RANGE,
+               environments=ENVIRONMENT_FACTORS, resolution=DIAGRAM_RESOLUTION):
+    """The E-M diagram for a core's current velocity and weight (the mesh is cached, the core's scale is not)."""
+    thrust, load_factor, excess = _mesh(tuple(map(float, thrust_range)), tuple(map(float, load_range)), int(resolution))
+    environment = np.asarray(environments, dtype=np.float64)
+    return EMDiagram(thrust, load_factor, environment, excess, float(core.velocity), float(core.weight))
@@ -7,10 +7,19 @@
 
 import numpy as np
 import random
-import cv2
+import threading
 
-# Import the global sensor instance
-from sensor_hook import ferro_sensor
+# Cores read the sensor bound by their Contextus, else the global ferro_sensor (created on first use)
+import sensor_hook
+from context_store import ContextStore
+from ring_buffer import RingBuffer, MEMORY_CAPACITY
+from sextet import SEXTET_KEYS, SEXTET_TABLE, sextet_property
+from precision import add_at, get_precision, precision_of, to_compute, to_storage
+from tiled_grid import TiledGrid, TILE_SIZE
+from pyramid import Pyramid
+import kernels
+from kernels import Kernel
+from render import render
 
 # --- Geometric Primitives for Grid Initialization ---
 
@@ -64,13 +73,117 @@ def generate_kepler_lines(max_depth=4, size=128):
     _draw_kepler_recursive(lines, *p_tr, 0, max_depth)
     return lines
 
+# --- Calibrated Sensor Frames ---
+
+_frames = {}  # (sensor id, frame id, baseline ids, compute dtype) -> Pyramid of the calibrated frame
+_frames_lock = threading.Lock()  # Cores ground from the regulator, trainer and command threads at once
+
+def frame_pyramid(p, sensor=None):
+    """The current calibrated frame of `sensor` (default: the active one) as a pyramid in the policy's compute dtype.
+
+    Calibration and every resize happen once per sensor frame, however many
+    cores ground against it.
+    """
+    sensor = sensor if sensor is not None else sensor_hook.active_sensor()
+    with _frames_lock:
+        solenoid_baseline = sensor.get_solenoid_baseline()
+        toroid_baseline = sensor.get_toroid_baseline()
+        key = (id(sensor), sensor.frame_id, id(solenoid_baseline), id(toroid_baseline), p.compute)
+        pyramid = _frames.get(key)
+        if pyramid is not None: return pyramid
+
+        visual_grid_raw = sensor.get_visual_grid()
+        if visual_grid_raw is None: return None
+        visual_grid_raw = to_compute(visual_grid_raw, p)
+
+        # Combine baselines (e.g., by averaging them)
+        if solenoid_baseline is not None and toroid_baseline is not None:
+            combined_baseline = (to_compute(solenoid_baseline, p) + to_compute(toroid_baseline, p)) / 2
+            # Subtract the baseline noise/pattern from the main visual grid
+            calibrated_visual_grid = np.clip(visual_grid_raw - combined_baseline, 0, 1)
+        else:
+            # If baselines aren't available, use the raw data
+            calibrated_visual_grid = visual_grid_raw
+        calibrated_visual_grid.flags.writeable = False
+
+        pyramid = Pyramid(calibrated_visual_grid, key)
+        for stale in [k for k in _frames if k[0] == key[0] and k[1] != key[1]]:
+            del _frames[stale]
+        _frames[key] = pyramid
+        return pyramid
+
 # --- Core Simulation Entities ---
 
 class FluxCore:
-    """The fundamental unit of existence, grounded by the ferro_sensor."""
-    def __init__(self, size=128): # Default size now matches sensor resolution
+    """The fundamental unit of existence, grounded by a ferrocell sensor.
+
+    Cores are slotted: the sextet lives in a row of the shared SEXTET_TABLE rather
+    than in a per-core __dict__, so large plenums of small cores stay compact.
+    """
+    __slots__ = ('size', 'grid', 'energy', 'memory_patterns', 'identity_wave', 'context_embeddings',
+                 'anomaly', 'revision', '_rng', '_sensor', '_row', '_pyramid')
+    STATE = ('size', 'energy', 'identity_wave', 'anomaly', 'revision') + SEXTET_KEYS  # Scalar state, for DIALECTICA and SALVO
+    _table = SEXTET_TABLE
+
+    resistance = sextet_property('resistance')
+    capacitance = sextet_property('capacitance')
+    magnetism = sextet_property('magnetism')
+    permeability = sextet_property('permeability')
+    permittivity = sextet_property('permittivity')
+    dielectricity = sextet_property('dielectricity')
+
+    def __new__(cls, *args, **kwargs):
+        core = super().__new__(cls)
+        core._row = cls._table.acquire()  # Also taken by cores restored through __new__
+        return core
+
+    def __del__(self):
+        try:
+            self._table.release(self._row)
+        except (AttributeError, TypeError):
+            pass  # Interpreter shutdown
+
+    @property
+    def rng(self):
+        """Source of internal draws; a Contextus points this at its journaled RNG."""
+        try:
+            return self._rng
+        except AttributeError:
+            return random
+
+    @rng.setter
+    def rng(self, value):
+        self._rng = value
+
+    @property
+    def sensor(self):
+        """The sensor grounding the core; a Contextus points this at its own (default: the active one)."""
+        try:
+            return self._sensor
+        except AttributeError:
+            return sensor_hook.active_sensor()
+
+    @sensor.setter
+    def sensor(self, value):
+        self._sensor = value
+
+    @property
+    def precision(self):
+        """The grid's precision policy (see precision.py), implied by its storage dtype."""
+        return precision_of(self.grid)
+
+    @property
+    def sextet(self):
+        """A copy of the core's sextet as float64, ordered as SEXTET_KEYS (write through the properties)."""
+        return self._table.data[self._row].copy()
+
+    def state(self):
+        """The core's scalar state (sextet, energy, identity, size, ...) as a dict."""
+        return {key: getattr(self, key) for key in self.STATE}
+
+    def __init__(self, size=128, memory_capacity=MEMORY_CAPACITY, precision=None): # Default size now matches sensor resolution
         self.size = size
-        self.grid = np.zeros((size, size), dtype=np.float32)
+        self.grid = np.zeros((size, size), dtype=get_precision(precision).storage)
         
         lines = generate_kepler_lines(size=self.size)
         for p1, p2 in lines:
@@ -79,110 +192,139 @@ class FluxCore:
                     self.grid[py, px] = 1.0
 
         self.energy = 0.0
-        self.memory_patterns = []
+        self.memory_patterns = RingBuffer(memory_capacity)
         self.identity_wave = 0.0
-        self.context_embeddings = {}
+        self.context_embeddings = ContextStore()
         self.anomaly = None
+        self.revision = 0  # Bumped by every mutation; checkpoints compare it
 
         self._sync_sextet()
         self._ground_with_visual_truth() # Initial grounding
 
     def _sync_sextet(self):
-        """Syncs the core's physical properties from the global ferro_sensor."""
-        sensor_data = ferro_sensor.get_sextet()
-        for key, value in sensor_data.items():
-            setattr(self, key, value)
+        """Syncs the core's physical properties from its sensor."""
+        self._table.write(self._row, self.sensor.get_sextet_vector(SEXTET_KEYS))
 
-    def _ground_with_visual_truth(self):
-        """Merges the simulation grid with the calibrated real-world visual grid."""
-        visual_grid_raw = ferro_sensor.get_visual_grid()
-        if visual_grid_raw is None: return
+    def view(self, size):
+        """The grid at `size` x `size` (compute dtype, read-only) from the core's lazy pyramid.
 
-        # --- NEW: Get calibration baselines ---
-        solenoid_baseline = ferro_sensor.get_solenoid_baseline()
-        toroid_baseline = ferro_sensor.get_toroid_baseline()
+        The pyramid is rebuilt on first use after the core changes (its revision or grid object).
+        """
+        key = (self.revision, id(self.grid))
+        pyramid = getattr(self, '_pyramid', None)
+        if pyramid is None or pyramid.key != key:
+            pyramid = self._pyramid = Pyramid(to_compute(self.grid, self.precision), key)
+        return pyramid.level(size)
 
-        # Combine baselines (e.g., by averaging them)
-        if solenoid_baseline is not None and toroid_baseline is not None:
-            combined_baseline = (solenoid_baseline + toroid_baseline) / 2.0
-            # Subtract the baseline noise/pattern from the main visual grid
-            calibrated_visual_grid = np.clip(visual_grid_raw - combined_baseline, 0, 1)
-        else:
-            # If baselines aren't available, use the raw data
-            calibrated_visual_grid = visual_grid_raw
+    def _ground_with_visual_truth(self):
+        """Merges the simulation grid with the calibrated real-world visual grid."""
+        p = self.precision
+        frames = frame_pyramid(p, self.sensor)
+        if frames is None: return
+        visual_grid = frames.level(self.size)
 
-        # --- The rest of the function proceeds as before ---
-        if calibrated_visual_grid.shape != (self.size, self.size):
-            visual_grid = cv2.resize(calibrated_visual_grid, (self.size, self.size), interpolation=cv2.INTER_AREA)
-        else:
-            visual_grid = calibrated_visual_grid
+        weight = p.compute.type(np.clip(self.permeability, 0, 1))
+        self.grid = to_storage((to_compute(self.grid, p) * (1 - weight)) + (visual_grid * weight), p)
 
-        weight = np.clip(self.permeability, 0, 1)
-        self.grid = (self.grid * (1 - weight)) + (visual_grid * weight)
+    def touch(self):
+        """Marks the core as changed since the last checkpoint."""
+        self.revision += 1
 
     def perturb(self, x, y, amp, mod=1.0):
         """Applies a change to the grid, modulated by the current sextet."""
+        self.touch()
         self._sync_sextet()
         
         flux_change = amp * mod
-        self.grid[y, x] += flux_change
+        p = self.precision
+        self.grid[y, x] = to_storage(to_compute(self.grid[y, x], p) + flux_change, p)
         self.energy += abs(flux_change) * self.permittivity
         
         self._update_memory(flux_change)
         self._update_simulated_sextet(flux_change)
         self._ground_with_visual_truth() # Re-ground after perturbation
 
-    def converge(self):
-        """Applies a smoothing operation to the grid."""
+    def perturb_batch(self, xs, ys, amps, mod=1.0):
+        """Applies many perturbations as one scatter-add, syncing and grounding once."""
+        self.touch()
+        self._sync_sextet()
+
+        flux_changes = np.asarray(amps, dtype=np.float64) * mod
+        if flux_changes.size == 0: return
+        self._scatter_add(ys, xs, flux_changes)
+        self.energy += np.sum(np.abs(flux_changes)) * self.permittivity
+
+        self.memory_patterns.extend(flux_changes)
+        self._update_simulated_sextet(float(flux_changes[-1]))
+        self._ground_with_visual_truth()
+
+    def _scatter_add(self, ys, xs, flux_changes):
+        add_at(self.grid, (np.asarray(ys), np.asarray(xs)), flux_changes, self.precision)
+
+    def _grid_moments(self, compute):
+        """(mean, variance, sum) of the grid, accumulated in the compute dtype."""
+        return (np.mean(self.grid, dtype=compute), np.var(self.grid, dtype=compute),
+                np.sum(self.grid, dtype=compute))
+
+    def converge(self, kernel=None, iterations=1):
+        """Applies a smoothing operation to the grid (`iterations` passes, composed into one when exact)."""
+        self.touch()
         self._sync_sextet()
         
-        kernel = np.ones((3, 3), np.float32) / 9
-        self.grid = cv2.filter2D(self.grid, -1, kernel) + self.magnetism
-        np.clip(self.grid, 0, None, out=self.grid) # Prevent negative values
+        p = self.precision
+        kernel = kernel or Kernel.box(1)
+        grid = kernels.converge(to_compute(self.grid, p), kernel, iterations, self.magnetism) # Clips negative values
+        self.grid = to_storage(grid, p)
         
         self._update_simulated_sextet(0)
         self._ground_with_visual_truth() # Re-ground after convergence
 
     def _update_memory(self, change):
         """Records a change to the core's short-term memory."""
-        self.memory_patterns.append(change)
-        if len(self.memory_patterns) > 100: self.memory_patterns.pop(0)
+        self.memory_patterns.push(change)
 
     def _synthesize_identity(self):
-        """Calculates the core's self-awareness."""
-        if self.memory_patterns:
-            self.identity_wave = (self.energy / len(self.memory_patterns)) * self.dielectricity
+        """Calculates the core's self-awareness: its energy per remembered event."""
+        count = self.memory_patterns.count
+        if count:
+            self.identity_wave = (self.energy / count) * self.dielectricity
 
     def _update_simulated_sextet(self, change):
         """Updates the sextet based on internal simulation state."""
         self.capacitance += self.energy
-        self.resistance += np.var(self.grid) * (self.capacitance / 100)
-        self.magnetism += np.mean(self.grid)
+        mean, var, total = self._grid_moments(self.precision.compute)  # float16 grids are summarized in float32
+        self.resistance += var * (self.capacitance / 100)
+        self.magnetism += mean
         # Permeability is now primarily driven by the sensor, so we don't override it here.
         self.dielectricity = max(0.1, 1 / (1 + abs(change) + 1e-9))
         self.permittivity = 1.0 - self.dielectricity
 
         if self.anomaly == 'ENTROPIC_CASCADE':
             self.resistance *= 0.99
-            u = random.uniform(-1, 1)
+            u = self.rng.uniform(-1, 1)
             perturb_amp = 0.75 * (1 - u**2)
-            self.perturb(random.randint(0, self.size-1), random.randint(0, self.size-1), perturb_amp)
+            self.perturb(self.rng.randint(0, self.size-1), self.rng.randint(0, self.size-1), perturb_amp)
         
-        self.energy = np.sum(self.grid) / (self.resistance + 1e-9)
+        self.energy = total / (self.resistance + 1e-9)
         self._synthesize_identity()
 
-    def display(self):
-        """Returns a string representation of the core's state."""
-        context_str = "\n".join([f"  '{k}': {v}" for k, v in self.context_embeddings.items()])
+    def summary(self):
+        """Returns the flux and sextet lines that head the core's display."""
         return (f"FLUXUS: {self.energy:.2f} | IDENTITAS: {self.identity_wave:.2f} | MEMORIA: {len(self.memory_patterns)}\n"
-                f"SEXTET: R={self.resistance:.2e}, C={self.capacitance:.2f}, M={self.magnetism:.2f}, P={self.permeability:.2f}, Pt={self.permittivity:.2f}, D={self.dielectricity:.2f}\n"
-                f"CONTEXTUS:\n{context_str}")
+                f"SEXTET: R={self.resistance:.2e}, C={self.capacitance:.2f}, M={self.magnetism:.2f}, P={self.permeability:.2f}, Pt={self.permittivity:.2f}, D={self.dielectricity:.2f}")
+
+    def display(self, **options):
+        """Returns a string representation of the core's state (see render.render for options)."""
+        return render(self, **options)
 
 
 class Intellectus(FluxCore):
     """A specialized FluxCore with architecture-specific physics for learning."""
-    def __init__(self, architecture='TRANSFORMER', size=128):
-        super().__init__(size)
+    __slots__ = ('architecture',)
+    STATE = FluxCore.STATE + ('architecture',)
+
+    def __init__(self, architecture='TRANSFORMER', size=128, memory_capacity=MEMORY_CAPACITY, precision=None):
+        super().__init__(size, memory_capacity, precision)
         self.architecture = architecture
         if architecture == 'TRANSFORMER': self.magnetism = 0.1
 
@@ -192,6 +334,54 @@ class Intellectus(FluxCore):
         if self.architecture == 'TRANSFORMER':
             self.magnetism += np.log1p(abs(change)) * 0.1
 
+class TiledFluxCore(FluxCore):
+    """A FluxCore on a sparse TiledGrid, for very large planes with local activity.
+
+    It starts empty (no Kepler seed) and only touched tiles are allocated.
+    Converge smooths dirty tiles plus their halo. Grounding blends the whole
+    plane toward the sensor frame's mean level: the frame's pattern is far
+    coarser than the plane and would otherwise make every tile active.
+    """
+    __slots__ = ()
+
+    def __init__(self, size=2048, memory_capacity=MEMORY_CAPACITY, precision=None, tile=TILE_SIZE):
+        self.size = size
+        self.grid = TiledGrid(size, tile, get_precision(precision).storage)
+        self.energy = 0.0
+        self.memory_patterns = RingBuffer(memory_capacity)
+        self.identity_wave = 0.0
+        self.context_embeddings = ContextStore()
+        self.anomaly = None
+        self.revision = 0
+
+        self._sync_sextet()
+        self._ground_with_visual_truth()
+
+    @classmethod
+    def adopt_grid(cls, grid):
+        """Turns a dense grid (e.g. from a snapshot) back into tiles; a TiledGrid is kept as is."""
+        return grid if isinstance(grid, TiledGrid) else TiledGrid.from_dense(grid)
+
+    def _scatter_add(self, ys, xs, flux_changes):
+        self.grid.add_at(ys, xs, flux_changes)
+
+    def _grid_moments(self, compute):
+        return self.grid.moments()
+
+    def _ground_with_visual_truth(self):
+        frames = frame_pyramid(self.precision, self.sensor)
+        if frames is None: return
+        weight = float(np.clip(self.permeability, 0, 1))
+        self.grid.blend(float(frames.level(1)[0, 0]), weight)  # The 1x1 level is the frame's mean
+
+    def converge(self, kernel=None, iterations=1):
+        """Smooths only the active tiles of the grid."""
+        self.touch()
+        self._sync_sextet()
+        self.grid.converge(float(self.magnetism), kernel, self.precision.compute, iterations)
+        self._update_simulated_sextet(0)
+        self._ground_with_visual_truth()
+
 if __name__ == '__main__':
     print("--- Running flux_core.py standalone test (v4) ---")
     core = FluxCore()
@@ -0,0 +1,138 @@
+# journal.py
+#
+# Description:
+# The command journal and its replay engine. Every command a Contextus executes
+# is recorded with the seed its handlers drew from, the inflection modulus it
+# ran with (so the import-time 'AM' draw is pinned) and a digest of the RNG state
+# afterwards; the regulator's own perturb/converge actions are journaled too.
+# Replaying a journal into a fresh context, without the regulator and with
+# sleeps skipped, reproduces the same draws at full speed. SALVO snapshots are
+# recorded as markers, so fast-forwarding to any command starts from the nearest
+# snapshot instead of from the beginning.
+
+import json
+
+from persistence import snapshot_paths
+from checkpoint import recover_plenum
+
+JOURNAL_VERSION = 1
+REPLAY_SKIPPED = ('SALVO', 'DIARIUM', 'ITERO', 'TEMPUS')  # Verbs whose effects are outside the plenum (or journaled as ticks)
+
+def rng_digest(rng):
+    """A short, process-independent fingerprint of a random.Random state."""
+    return hash(rng.getstate()) & 0xFFFFFFFF
+
+class CommandJournal:
+    """An append-only list of executed commands, regulator actions and snapshot markers."""
+    def __init__(self, path=None, snapshot_every=None):
+        self.path = path
+        self.snapshot_every = snapshot_every  # Commands between automatic snapshots, if any
+        self.entries = []  # Commands and regulator actions, in execution order
+        self.markers = []  # {'index', 'path', 'generation'}: the plenum after entries[:index]
+        self._file = open(path, 'a') if path else None
+        if self._file and self._file.tell() == 0:
+            self._write({'journal': JOURNAL_VERSION})
+
+    def _write(self, record):
+        if not self._file: return
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+    def record(self, entry):
+        """Appends one command or regulator action; returns its index."""
+        entry = dict(entry, index=len(self.entries))
+        self.entries.append(entry)
+        self._write(entry)
+        return entry['index']
+
+    def mark(self, path, generation):
+        """Notes that the snapshot at `path` holds the plenum as of the next entry."""
+        marker = {'index': len(self.entries), 'path': path, 'generation': generation}
+        self.markers.append(marker)
+        self._write({'snapshot': marker})
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a journal file written by a previous session."""
+        journal = cls()
+        with open(path) as f:
+            for line in f:
+                if not line.strip(): continue
+                record = json.loads(line)
+                if 'journal' in record:
+                    if record['journal'] != JOURNAL_VERSION:
+                        raise ValueError(f"DIARIUM VERSIO {record['journal']} IGNOTA")
+                elif 'snapshot' in record:
+                    journal.markers.append(record['snapshot'])
+                else:
+                    journal.entries.append(record)
+        return journal
+
+def _snapshot_generation(path):
+    """The generation stored in a snapshot's sidecar, or None if it is gone."""
+    try:
+        with open(snapshot_paths(path)[1]) as f:
+            return json.load(f).get('generation')
+    except (OSError, ValueError):
+        return None
+
+def nearest_marker(journal, index):
+    """The latest marker at or before `index` whose snapshot is still the one recorded."""
+    for marker in sorted(journal.markers, key=lambda m: m['index'], reverse=True):
+        if marker['index'] <= index and _snapshot_generation(marker['path']) == marker['generation']:
+            return marker
+    return None
+
+class Replayer:
+    """Re-executes a journal into a context with sleeps skipped, reporting divergences."""
+    def __init__(self, context, journal):
+        self.context = context
+        self.journal = journal
+        self.position = 0  # Index of the next entry to replay
+        self.restored = False  # Whether the context was reset from one of the journal's snapshots
+        self.divergences = []  # (index, expected digest, replayed digest)
+
+    def step(self):
+        """Replays the next entry; returns its response (None for regulator actions)."""
+        entry = self.journal.entries[self.position]
+        self.position += 1
+        if 'regulator' in entry:
+            self.context.regulate(entry['name'], entry['regulator'], *entry.get('args', ()))
+            return None
+        if entry['verb'] in REPLAY_SKIPPED:
+            return entry.get('response')
+        response = self.context.execute_command(entry['command'], seed=entry['seed'], mod=entry['mod'])
+        digest = rng_digest(self.context.rng)
+        if digest != entry.get('rng', digest):
+            self.divergences.append((entry['index'], entry['rng'], digest))
+        return response
+
+    def replay(self, until=None):
+        """Replays entries up to (not including) index `until`; returns their responses."""
+        until = len(self.journal.entries) if until is None else min(until, len(self.journal.entries))
+        responses = []
+        pace, self.context.pace = self.context.pace, lambda seconds: None
+        try:
+            while self.position < until:
+                responses.append(self.step())
+        finally:
+            self.context.pace = pace
+        return responses
+
+    def fast_forward(self, index):
+        """Brings the context to the state just before entry `index`, from the nearest snapshot."""
+        marker = nearest_marker(self.journal, index)
+        if index < self.position or (marker and (not self.restored or marker['index'] > self.position)):
+            if not marker: raise ValueError(f"NULLUM SNAPSHOT ANTE MANDATUM {index}")
+            recover_plenum(self.context, marker['path'])
+            self.context.adopt_cores()
+            self.position, self.restored = marker['index'], True
+        return self.replay(index)
@@ -0,0 +1,209 @@
+# kernels.py
+#
+# Description:
+# The converge engine. A Kernel is a normalized smoothing kernel (box, Gaussian
+# or custom) with any radius; smooth() applies it with reflect-101 borders (the
+# cv2.filter2D default) and picks the implementation by kernel size: tiny 2D
+# kernels go straight to filter2D, box kernels use an integral image (constant
+# cost per cell at any radius), separable kernels two 1D passes, and wide ones
+# an FFT. k converge passes collapse into one pass with the k-fold composed
+# kernel whenever the per-pass clip at zero cannot bite. Separable kernels are
+# kept as their 1D factors; the 2D matrix is only built when an implementation
+# needs it, and both kernel caches are bounded.
+
+import functools
+import cv2
+import numpy as np
+
+DIRECT_MAX = 5  # 2D kernels up to 5x5 go straight to cv2.filter2D
+SEPARABLE_MAX = 65  # Separable kernels up to this many taps use two 1D passes; wider ones use the FFT
+METHODS = ('direct', 'integral', 'separable', 'fft')
+KERNEL_CACHE_SIZE = 32  # Box and Gaussian kernels kept per kind
+POWER_CACHE_SIZE = 16  # Composed kernels kept, across all kernels
+MAX_SPAN = 256  # Largest radius x passes a command may ask for (the composed kernel's radius)
+
+class Kernel:
+    """A square smoothing kernel: its 2D matrix, plus (column, row) 1D factors when separable.
+
+    A kernel built from factors alone (matrix None) builds its matrix on first use.
+    """
+    def __init__(self, matrix, kind='custom', factors=None):
+        self._matrix = None if matrix is None else np.asarray(matrix, dtype=np.float64)
+        shape = self._matrix.shape if matrix is not None else (len(factors[0]), len(factors[1]))
+        if len(shape) != 2 or shape[0] != shape[1] or shape[0] % 2 == 0:
+            raise ValueError("NUCLEUS DEBET ESSE QUADRATUM IMPAR")
+        self.kind = kind
+        self.factors = factors if factors is not None else _separate(self._matrix)
+        self._size = shape[0]
+
+    @classmethod
+    @functools.lru_cache(maxsize=KERNEL_CACHE_SIZE)
+    def box(cls, radius=1):
+        """The (2r+1)^2 mean filter."""
+        taps = np.full(2 * radius + 1, 1.0 / (2 * radius + 1))
+        return cls(None, 'box', (taps, taps))
+
+    @classmethod
+    @functools.lru_cache(maxsize=KERNEL_CACHE_SIZE)
+    def gaussian(cls, radius=1, sigma=None):
+        """A normalized Gaussian truncated at `radius` (sigma defaults to radius / 2)."""
+        sigma = sigma or max(radius / 2, 0.5)
+        x = np.arange(-radius, radius + 1)
+        taps = np.exp(-0.5 * (x / sigma) ** 2)
+        taps /= taps.sum()
+        return cls(None, 'gaussian', (taps, taps))
+
+    @classmethod
+    def custom(cls, matrix):
+        return cls(matrix)
+
+    @property
+    def matrix(self):
+        if self._matrix is None: self._matrix = np.outer(*self.factors)
+        return self._matrix
+
+    @property
+    def radius(self):
+        return self._size // 2
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def total(self):
+        """Sum of the weights; what a constant grid is multiplied by."""
+        if self.factors is not None: return float(self.factors[0].sum() * self.factors[1].sum())
+        return float(self.matrix.sum())
+
+    @property
+    def minimum(self):
+        """The smallest weight (from the factors' extremes when separable)."""
+        if self.factors is None: return float(self.matrix.min())
+        cols, rows = self.factors
+        return float(min(a * b for a in (cols.min(), cols.max()) for b in (rows.min(), rows.max())))
+
+    @property
+    def method(self):
+        """The implementation smooth() uses for this kernel."""
+        if self.size <= DIRECT_MAX: return 'direct'
+        if self.factors is not None and self.size <= SEPARABLE_MAX: return 'separable'
+        if self.kind == 'box': return 'integral'
+        return 'fft'
+
+    def power(self, k):
+        """The kernel equivalent to `k` successive passes of this one (cached)."""
+        if k < 1: raise ValueError("ITERATIONES DEBENT ESSE POSITIVAE")
+        return self if k == 1 else _power(self, k)
+
+    def _compose(self, other):
+        if self.factors is not None and other.factors is not None:
+            cols = np.convolve(self.factors[0], other.factors[0])
+            rows = np.convolve(self.factors[1], other.factors[1])
+            return Kernel(None, 'composed', (cols, rows))
+        return Kernel(_convolve_full(self.matrix, other.matrix), 'composed')
+
+    def __repr__(self):
+        return f"Kernel({self.kind}, {self.size}x{self.size}, {self.method})"
+
+@functools.lru_cache(maxsize=POWER_CACHE_SIZE)
+def _power(kernel, k):
+    """The k-fold composition of `kernel` (k > 1), by repeated squaring."""
+    half = kernel.power(k // 2)
+    composed = half._compose(half)
+    return composed._compose(kernel) if k % 2 else composed
+
+def _separate(matrix, tolerance=1e-10):
+    """(column, row) factors whose outer product is `matrix`, or None if it is not rank one."""
+    u, s, vt = np.linalg.svd(matrix)
+    if s[0] == 0 or (s.size > 1 and s[1] > tolerance * s[0]): return None
+    scale = np.sqrt(s[0])
+    return u[:, 0] * scale, vt[0] * scale
+
+def _convolve_full(a, b):
+    """Full 2D convolution of two small matrices via the FFT."""
+    shape = (a.shape[0] + b.shape[0] - 1, a.shape[1] + b.shape[1] - 1)
+    return np.fft.irfft2(np.fft.rfft2(a, shape) * np.fft.rfft2(b, shape), shape)
+
+# --- Implementations (all reflect-101 at the borders, like cv2.filter2D) ---
+
+def _direct(grid, kernel):
+    return cv2.filter2D(grid, -1, kernel.matrix.astype(grid.dtype))
+
+def _integral(grid, kernel):
+    r = kernel.radius
+    sums = cv2.integral(np.pad(grid, r, mode='reflect'), sdepth=cv2.CV_64F)  # np.pad also reflects past the far edge
+    w = 2 * r + 1
+    window = sums[w:, w:] - sums[:-w, w:] - sums[w:, :-w] + sums[:-w, :-w]
+    return (window * (kernel.factors[0][0] * kernel.factors[1][0])).astype(grid.dtype)
+
+def _separable(grid, kernel):
+    cols, rows = kernel.factors
+    return cv2.sepFilter2D(grid, -1, rows.astype(grid.dtype), cols.astype(grid.dtype))
+
+def _fft(grid, kernel):
+    r = kernel.radius
+    padded = np.pad(grid, r, mode='reflect')
+    shape = tuple(cv2.getOptimalDFTSize(n) for n in padded.shape)
+    image = np.zeros(shape, grid.dtype)
+    image[:padded.shape[0], :padded.shape[1]] = padded
+    flipped = np.zeros(shape, grid.dtype)
+    flipped[:kernel.size, :kernel.size] = kernel.matrix[::-1, ::-1]  # filter2D correlates
+    spectrum = cv2.mulSpectrums(cv2.dft(image), cv2.dft(flipped), 0)
+    out = cv2.idft(spectrum, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)
+    # The convolution is circular, but outputs from 2r on never wrap, so they equal the linear result
+    return out[2 * r:2 * r + grid.shape[0], 2 * r:2 * r + grid.shape[1]]
+
+_IMPLEMENTATIONS = dict(zip(METHODS, (_direct, _integral, _separable, _fft)))
+
+def smooth(grid, kernel, iterations=1, method=None):
+    """`grid` convolved with `kernel` (`iterations` times, as one composed pass), in the grid's dtype."""
+    kernel = kernel.power(iterations)
+    method = method or kernel.method
+    if method == 'integral' and kernel.kind != 'box':
+        raise ValueError("INTEGRALE TANTUM NUCLEO ARCAE")
+    if method == 'separable' and kernel.factors is None:
+        raise ValueError(f"{kernel} NON SEPARABILIS")
+    return _IMPLEMENTATIONS[method](np.ascontiguousarray(grid), kernel)
+
+def collapse(kernel, iterations, offset, floor):
+    """(kernel, offset) for one pass equal to `iterations` passes of smooth + offset + clip at zero.
+
+    Returns None when the clip could change an intermediate pass, i.e. unless the grid's
+    minimum `floor`, the offset and every weight are non-negative.
+    """
+    if iterations == 1: return kernel, offset
+    if floor < 0 or offset < 0 or kernel.minimum < 0: return None
+    s = kernel.total
+    return kernel.power(iterations), offset * sum(s ** j for j in range(iterations))
+
+def converge(grid, kernel, iterations=1, offset=0.0):
+    """`iterations` passes of smooth + offset + clip at zero, collapsed into one pass when exact."""
+    offset = grid.dtype.type(offset)
+    single = collapse(kernel, iterations, float(offset), float(grid.min()) if grid.size else 0.0)
+    passes = [single] if single else [(kernel, offset)] * iterations
+    for pass_kernel, pass_offset in passes:
+        grid = smooth(grid, pass_kernel) + grid.dtype.type(pass_offset)
+        np.clip(grid, 0, None, out=grid)
+    return grid
+
+# --- Interior-only box means (the aether_lang and legacy cores' converge) ---
+
+def window_sums(grid, radius=1):
+    """Sums over every full (2r+1)^2 window, as shifted-slice sums along each axis; the result is 2r smaller per side."""
+    grid = np.asarray(grid).astype(np.result_type(grid.dtype, np.float32), copy=False)  # float16 sums in float32
+    w = 2 * radius + 1
+    h, wd = grid.shape[0] - w + 1, grid.shape[1] - w + 1
+    rows = grid[:h].copy()
+    for k in range(1, w): rows += grid[k:k + h]
+    sums = rows[:, :wd].copy()
+    for k in range(1, w): sums += rows[:, k:k + wd]
+    return sums
+
+def interior_mean(grid, radius=1, offset=0.0):
+    """A copy of `grid` whose interior cells become their window mean plus `offset`; edges stay untouched."""
+    out = np.array(grid, copy=True)
+    r, w = radius, 2 * radius + 1
+    if min(grid.shape) > 2 * r:
+        out[r:-r, r:-r] = window_sums(grid, r) / (w * w) + offset
+    return out
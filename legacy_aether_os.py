@@ -2,6 +2,7 @@
 # Standard Library Imports
 import os
 import sys
+import functools
 import json
 import random
 import re
@@ -10,25 +11,25 @@ import time
 import unittest
 
 # Third-Party Imports
-import numpy as np
-import requests
-from dotenv import load_dotenv
+import numpy as np  # requests and python-dotenv are imported by OracleMateria when first needed
+
+# Local Imports
+from amplitude import bytes_to_amp, text_to_amp
+from precision import get_precision, precision_of, to_compute, to_storage
+from kernels import interior_mean
+import runtime
+from runtime import Backend, Contextus as Runtime, repl
 
 # --- AetherOS Grammar: Theurgical Gnosis/Imago ---
 KNOWN_VERBS = ['PERTURBO', 'CONVERGO', 'CREO', 'OSTENDO', 'FOCUS', 'ANOMALIA', 'VERITAS', 'MIRACULUM', 'REDIMO', 'INTERROGO', 'INSTAURO', 'EXERCEO', 'DIALECTICA', 'DOCEO', 'DISCERE']
-KNOWN_INFLECTIONS = ['ABAM', 'EBAM', 'AM', 'O', 'E']
-inflection_map = {
-    'O': {'mod': 1.0}, 'E': {'mod': -1.0}, 'ABAM': {'mod': 1.5},
-    'EBAM': {'mod': -0.5}, 'AM': {'mod': random.uniform(0.5, 1.5)}
-}
 PHI = (1 + np.sqrt(5)) / 2
 PHI_CUBED = PHI ** 3
 
 # --- Cohesive Flux Framework (CFF): Associative Lagrangian Energies ---
 class FluxCore:
     """The fundamental unit of existence in the plenum."""
-    def __init__(self, size=10):
-        self.grid = np.zeros((size, size))
+    def __init__(self, size=10, precision=None):
+        self.grid = np.zeros((size, size), dtype=get_precision(precision).storage)
         self.energy = 0.0
         self.memory_patterns = []
         self.identity_wave = 0.0
@@ -49,18 +50,15 @@ class FluxCore:
         if abs(amp) > 100: # Blue-high C pulse
              flux_change *= (1 / (self.dielectricity + 1e-9))
 
-        self.grid[x, y] += flux_change
+        p = precision_of(self.grid)
+        self.grid[x, y] = to_storage(to_compute(self.grid[x, y], p) + flux_change, p)
         self.energy += abs(flux_change) * self.permittivity
         self._update_memory(flux_change)
         self._update_sextet(flux_change)
 
     def converge(self):
         """Applies a smoothing operation to the grid, seeking coherence."""
-        new_grid = np.copy(self.grid)
-        for i in range(1, self.grid.shape[0]-1):
-            for j in range(1, self.grid.shape[1]-1):
-                new_grid[i, j] = np.mean(self.grid[i-1:i+2, j-1:j+2]) + self.magnetism
-        self.grid = new_grid
+        self.grid = interior_mean(self.grid, offset=self.magnetism)  # The border cells stay untouched
         self._update_sextet(0) # Recalculate state after convergence
 
     def _update_memory(self, change):
@@ -90,8 +88,9 @@ class FluxCore:
         """Updates the six core physical properties based on the core's state."""
         # Coaxial Coupled Ripple Physics
         self.capacitance = self.energy
-        self.resistance = np.var(self.grid) * (1 + self.capacitance / 100) # Inertia
-        self.magnetism = np.mean(np.abs(self.grid))
+        compute = precision_of(self.grid).compute
+        self.resistance = np.var(self.grid, dtype=compute) * (1 + self.capacitance / 100) # Inertia
+        self.magnetism = np.mean(np.abs(self.grid), dtype=compute)
         self.permeability = 1.0 / (1 + self.magnetism) # Shield
         self.dielectricity = max(0.1, 1 / (1 + abs(change) + 1e-9)) # Insulate
         self.permittivity = 1.0 - self.dielectricity # Store/dissipate
@@ -104,7 +103,7 @@ class FluxCore:
                 perturb_amp = 0.75 * (1 - u**2)
                 self.perturb(random.randint(0,9), random.randint(0,9), perturb_amp)
         
-        self.energy = np.sum(np.abs(self.grid)) / (self.resistance + 1e-9)
+        self.energy = np.sum(np.abs(self.grid), dtype=compute) / (self.resistance + 1e-9)
         self._synthesize_identity()
 
 
@@ -160,6 +159,7 @@ class OracleMateria:
                 print("INFO: API Key not in environment, attempting to load from .env file...")
                 dotenv_path = os.path.expanduser("~/aiops_toolkit/.env")
                 if os.path.exists(dotenv_path):
+                    from dotenv import load_dotenv
                     load_dotenv(dotenv_path=dotenv_path)
                     self.api_key = os.environ.get(api_key_name)
                 else:
@@ -188,6 +188,7 @@ class OracleMateria:
         if not self.endpoint:
              return "ORACULUM ERRORUM: API endpoint not found in model configuration."
 
+        import requests
         try:
             url = f"{self.endpoint}?key={self.api_key}"
             payload = {"contents": [{"parts": [{"text": prompt_str}]}]}
@@ -231,27 +232,33 @@ class DialecticRegulator(threading.Thread):
                     elif core.capacitance < c_thresh:
                         core.create()
 
-class Contextus:
-    """The container for the entire AetherOS cosmos."""
-    def __init__(self):
-        self.materiae = {}
-        self.focus = None
-        self.lock = threading.RLock()
-        self._boot()
-        self.regulator = DialecticRegulator(self)
-        self.regulator.start()
-
-    def _boot(self):
+# --- Legacy Physics ---
+class LegacyBackend(Backend):
+    """The v3.0 FluxCores: one dispatch function for every verb, and a regulator acting on cores directly."""
+    name = 'legacy'
+    title = "AetherOS v3.0 (Theurgical Gnosis/Imago)"
+    verbs = KNOWN_VERBS
+
+    def boot(self, context):
         print("< AetherOS v3.0 Gnosis/Imago Initializing... >")
-        g = FluxCore(); self.materiae['GENESIS'] = g; self.focus = 'GENESIS'
+        g = FluxCore(); context.materiae['GENESIS'] = g; context.focus = 'GENESIS'
         g.perturb(5, 5, PHI); g.create()
         print("< Genesis Rhythm Complete. Focus on 'GENESIS'. >")
 
-    def get_focused_materia(self):
-        with self.lock:
-            if not self.focus or self.focus not in self.materiae: self.focus = 'GENESIS'
-            if not self.focus: raise ValueError("NULLA MATERIA IN FOCO EST")
-            return self.materiae[self.focus]
+    def handlers(self, context):
+        return {verb: functools.partial(dispatch, context, verb) for verb in self.verbs}
+
+    def regulator(self, context):
+        regulator = DialecticRegulator(context)
+        regulator.start()
+        return regulator
+
+BACKEND = LegacyBackend()
+
+class Contextus(Runtime):
+    """The container for the entire AetherOS cosmos."""
+    def __init__(self, regulate=True, sensor=None):
+        super().__init__(BACKEND, regulate, sensor)
 
 # --- Core Logic & Helpers ---
 def dynamic_chunk_stream(byte_stream, chunk_size=256):
@@ -261,10 +268,6 @@ def dynamic_chunk_stream(byte_stream, chunk_size=256):
         if not chunk: break
         yield chunk
 
-def text_to_amp(text): 
-    """Converts a string to a numerical amplitude."""
-    return np.log1p(sum(ord(c) for c in text))
-
 def triad(args, mod_func):
     """Performs a thesis-antithesis-synthesis operation."""
     if len(args) < 3: args.extend([0.0] * (3 - len(args)))
@@ -280,7 +283,7 @@ def training_loop(context, core_name, data_path):
                 with context.lock:
                     if core_name not in context.materiae: break
                     core = context.materiae[core_name]
-                    amp = np.log1p(np.sum(np.frombuffer(chunk, dtype=np.uint8)))
+                    amp = bytes_to_amp(chunk)
                     core.perturb(random.randint(0,9), random.randint(0,9), amp)
                     core.converge()
                 time.sleep(random.uniform(0.05, 0.15)) # Non-deterministic rhythm
@@ -292,179 +295,155 @@ def training_loop(context, core_name, data_path):
 # --- Parser and Executor ---
 def parse_latin_command(cmd):
     """Parses the user's Latin-like command into its components."""
-    match = re.match(r"([A-Z]+(?:O|E|ABAM|EBAM|AM)?)\s*(.*)", cmd.strip().upper())
-    if not match: raise ValueError("FORMATUM INVALIDUM")
-    verb_full, args_str = match.groups()
-    verb = verb_full; inflection = 'O'
-    for v in KNOWN_VERBS:
-        if verb_full.startswith(v):
-            verb = v; inflection = verb_full[len(v):] or 'O'; break
-    
-    literals = re.findall(r"'([^']*)'", args_str)
-    return verb, inflection, literals, args_str
+    return runtime.parse_latin_command(cmd, tuple(KNOWN_VERBS))
 
 def run_aether_command(cmd, context):
     """The main entry point for executing all commands in the AetherOS."""
-    with context.lock:
-        verb, inflection, literals, args_str = parse_latin_command(cmd)
-        mod = inflection_map.get(inflection, {'mod': 1.0})['mod']
-        if verb not in KNOWN_VERBS: return f"VERBUM IGNORATUM '{verb}'"
-
-        # --- Verbs that don't need a focus or have special targeting ---
-        if verb == 'CREO':
-            name = literals[0].upper() if literals else "ANONYMOUS"
-            if name in context.materiae: return f"'{name}' IAM EXISTIT"
-            context.materiae[name] = FluxCore(); context.focus = name
-            return f"CREO MATERIAM '{name}'."
-        if verb == 'INSTAURO':
-            name = literals[0].upper()
-            arch = (re.search(r"MODO\s+'([^']*)'", args_str.upper()) or [None, 'TRANSFORMER'])[1]
-            if name in context.materiae: return f"'{name}' IAM EXISTIT"
-            context.materiae[name] = Intellectus(architecture=arch); context.focus = name
-            return f"INSTAURO INTELLECTUM '{name}' MODO '{arch}'."
-        if verb == 'FOCUS':
-            name = literals[0].upper()
-            if name not in context.materiae: return f"MATERIA '{name}' NON EXISTIT"
-            context.focus = name
-            return f"FOCUS NUNC IN '{name}'."
-        if verb == 'DIALECTICA':
-            source_name, name1, name2 = literals[0].upper(), literals[1].upper(), literals[2].upper()
-            if source_name not in context.materiae: return f"FONS '{source_name}' NON EXISTIT"
-            source_core = context.materiae[source_name]
-            if not isinstance(source_core, Intellectus): return "DIALECTICA REQUIRET INTELLECTUM"
-            
-            c1 = Intellectus(source_core.architecture); c2 = Intellectus(source_core.architecture)
-            for key, val in vars(source_core).items():
-                if isinstance(val, (int, float)):
-                    setattr(c1, key, val/2); setattr(c2, key, val/2)
-            c1.grid, c2.grid = source_core.grid / 2, -source_core.grid / 2
-            c1.embed_context('inter_echo', name2); c2.embed_context('inter_echo', name1)
-            
-            context.materiae[name1], context.materiae[name2] = c1, c2
-            del context.materiae[source_name]
-            context.focus = name1
-            return f"DIALECTICA PERFECTA. '{source_name}' NUNC EST '{name1}' ET '{name2}'."
-        if verb == 'REDIMO':
-            genesis = context.materiae['GENESIS']
-            targets = [l.upper() for l in literals] if literals else [n for n in context.materiae if n != 'GENESIS']
-            
-            total_redeemed_energy = 0
-            for name in targets:
-                if name not in context.materiae or name == 'GENESIS': continue
-                core = context.materiae[name]
-                genesis.grid += core.grid * (core.identity_wave / (genesis.identity_wave + 1e-9))
-                for key, val in vars(core).items():
-                    if isinstance(val, (int, float)) and hasattr(genesis, key):
-                         setattr(genesis, key, getattr(genesis, key) + val)
-                total_redeemed_energy += core.energy
-                genesis.embed_context(f'echo_{name}', vars(core))
-                del context.materiae[name]
-            
-            synthesis = triad([genesis.energy, total_redeemed_energy, genesis.capacitance], mod)
-            genesis.perturb(5, 5, synthesis); genesis.identity_wave = PHI_CUBED
-            return f"REDEMPTIO PLENUM. IDENTITAS GENESIS NUNC {genesis.identity_wave:.2f}."
-        if verb == 'VERITAS':
-            if len(context.materiae) < 2: return "VERITAS REQUIRET PLURITAS"
-            avg_grid = np.mean([c.grid for c in context.materiae.values()], axis=0)
-            avg_energy = np.mean([c.energy for c in context.materiae.values()])
-            context.materiae['GENESIS'].grid += avg_grid
-            context.materiae['GENESIS'].perturb(0,0, avg_energy)
-            return "VERITAS UNIVERSALIS IN GENESIM SYNTHESITA EST."
-        if verb == 'EXERCEO':
-            core_name = literals[0].upper()
-            data_path = (re.search(r"FLUMINE\s+'([^']*)'", args_str.upper()) or [None, None])[1]
-            if not data_path: return "FLUMINE DATA REQUIRETUR"
-            threading.Thread(target=training_loop, args=(context, core_name, data_path), daemon=True).start()
-            return f"EXERCEO INCIPIENS PRO '{core_name}'."
-        if verb == 'INTERROGO':
-            core_name = literals[0].upper()
-            if core_name not in context.materiae: return f"MATERIA '{core_name}' NON EXISTIT"
-            target_core = context.materiae[core_name]
-            model = (re.search(r"ORACULO\s+'([^']*)'", args_str.upper()) or [None, 'google-gemini-1.5-flash'])[1]
-            oracle = OracleMateria(model)
-            prompt = target_core.context_embeddings.get(
-                'oracle_prompt',
-                "Synthesize insight from the following context: " + str(target_core.context_embeddings)
-            )
-            response = oracle.query(prompt)
-            amp = text_to_amp(response)
-            target_core.perturb(random.randint(0,9), random.randint(0,9), amp * target_core.permittivity)
-            target_core.embed_context('ORACULUM_RESPONSUM', response)
-            return f"ORACULUM RESPONDIT. FLUXUM '{core_name}' SYNTHESITUR."
-        if verb == 'DOCEO':
-            target_name = literals[0].upper()
-            source_name = (re.search(r"CUM\s+'([^']*)'", args_str.upper()) or [None, None])[1]
-            if not source_name: return "DOCEO REQUIRET FONTEM CUM 'CUM'"
-            target_core = context.materiae.get(target_name)
-            source_core = context.materiae.get(source_name)
-            if not target_core: return f"SCOPUS '{target_name}' NON EXISTIT"
-            if not source_core: return f"FONS '{source_name}' NON EXISTIT"
-            
-            wisdom = str(source_core.context_embeddings)
-            amp = text_to_amp(wisdom)
-            target_core.perturb(random.randint(0,9), random.randint(0,9), amp)
-            target_core.embed_context(f'SAPIENTIA_EX_{source_name}', wisdom)
-            return f"SAPIENTIA EX '{source_name}' IN '{target_name}' INTEGRATA EST."
-
-        # --- Verbs that require a focus ---
-        core = context.get_focused_materia()
-        if verb == 'OSTENDO':
-            name_to_show = literals[0].upper() if literals else context.focus
-            if name_to_show not in context.materiae: return f"MATERIA '{name_to_show}' NON EXISTIT"
-            return context.materiae[name_to_show].display()
-        if verb == 'MIRACULUM':
-            orig_r, orig_p = core.resistance, core.permeability
-            try:
-                core.resistance, core.permeability = 1e-9, 1e9 # Impossible state
-                amp = 1e6 * (1 / (core.dielectricity + 1e-9))
-                core.perturb(random.randint(0,9), random.randint(0,9), amp, mod)
-            finally:
-                core.resistance, core.permeability = orig_r, orig_p # Restore physics
-            return f"MIRACULUM! FLUXUS DIVINUS. IDENTITAS NUNC {core.identity_wave:.2f}"
-        if verb == 'ANOMALIA':
-            name = literals[0].upper() if literals else 'ENTROPIC_CASCADE'
-            core.anomaly = name
-            return f"ANOMALIA '{name}' INDUCTA EST."
-        if verb == 'DISCERE':
-            source_name = (re.search(r"EX\s+'([^']*)'", args_str.upper()) or [None, None])[1]
-            if not source_name: return "DISCERE REQUIRET FONTEM CUM 'EX'"
-            source_core = context.materiae.get(source_name)
-            if not source_core: return f"FONS '{source_name}' NON EXISTIT"
-            
-            wisdom = str(source_core.context_embeddings)
-            amp = text_to_amp(wisdom)
-            core.perturb(random.randint(0,9), random.randint(0,9), amp)
-            core.embed_context(f'SAPIENTIA_EX_{source_name}', wisdom)
-            return f"SAPIENTIA EX '{source_name}' IN '{context.focus}' INTEGRATA EST."
+    return context.execute_command(cmd)
+
+def dispatch(context, verb, inflection, mod, literals, args_str):
+    """Executes one parsed command against the legacy plenum (under the context's lock)."""
+    # --- Verbs that don't need a focus or have special targeting ---
+    if verb == 'CREO':
+        name = literals[0].upper() if literals else "ANONYMOUS"
+        if name in context.materiae: return f"'{name}' IAM EXISTIT"
+        context.materiae[name] = FluxCore(); context.focus = name
+        return f"CREO MATERIAM '{name}'."
+    if verb == 'INSTAURO':
+        name = literals[0].upper()
+        arch = (re.search(r"MODO\s+'([^']*)'", args_str.upper()) or [None, 'TRANSFORMER'])[1]
+        if name in context.materiae: return f"'{name}' IAM EXISTIT"
+        context.materiae[name] = Intellectus(architecture=arch); context.focus = name
+        return f"INSTAURO INTELLECTUM '{name}' MODO '{arch}'."
+    if verb == 'FOCUS':
+        name = literals[0].upper()
+        if name not in context.materiae: return f"MATERIA '{name}' NON EXISTIT"
+        context.focus = name
+        return f"FOCUS NUNC IN '{name}'."
+    if verb == 'DIALECTICA':
+        source_name, name1, name2 = literals[0].upper(), literals[1].upper(), literals[2].upper()
+        if source_name not in context.materiae: return f"FONS '{source_name}' NON EXISTIT"
+        source_core = context.materiae[source_name]
+        if not isinstance(source_core, Intellectus): return "DIALECTICA REQUIRET INTELLECTUM"
+        
+        c1 = Intellectus(source_core.architecture); c2 = Intellectus(source_core.architecture)
+        for key, val in vars(source_core).items():
+            if isinstance(val, (int, float)):
+                setattr(c1, key, val/2); setattr(c2, key, val/2)
+        c1.grid, c2.grid = source_core.grid / 2, -source_core.grid / 2
+        c1.embed_context('inter_echo', name2); c2.embed_context('inter_echo', name1)
+        
+        context.materiae[name1], context.materiae[name2] = c1, c2
+        del context.materiae[source_name]
+        context.focus = name1
+        return f"DIALECTICA PERFECTA. '{source_name}' NUNC EST '{name1}' ET '{name2}'."
+    if verb == 'REDIMO':
+        genesis = context.materiae['GENESIS']
+        targets = [l.upper() for l in literals] if literals else [n for n in context.materiae if n != 'GENESIS']
         
-        # Default action for verbs like PERTURBO
-        if literals:
-            amp = text_to_amp(literals[0])
-            core.embed_context('oracle_prompt', literals[0])
+        total_redeemed_energy = 0
+        for name in targets:
+            if name not in context.materiae or name == 'GENESIS': continue
+            core = context.materiae[name]
+            genesis.grid += core.grid * (core.identity_wave / (genesis.identity_wave + 1e-9))
+            for key, val in vars(core).items():
+                if isinstance(val, (int, float)) and hasattr(genesis, key):
+                     setattr(genesis, key, getattr(genesis, key) + val)
+            total_redeemed_energy += core.energy
+            genesis.embed_context(f'echo_{name}', vars(core))
+            del context.materiae[name]
+        
+        synthesis = triad([genesis.energy, total_redeemed_energy, genesis.capacitance], mod)
+        genesis.perturb(5, 5, synthesis); genesis.identity_wave = PHI_CUBED
+        return f"REDEMPTIO PLENUM. IDENTITAS GENESIS NUNC {genesis.identity_wave:.2f}."
+    if verb == 'VERITAS':
+        if len(context.materiae) < 2: return "VERITAS REQUIRET PLURITAS"
+        avg_grid = np.mean([c.grid for c in context.materiae.values()], axis=0)
+        avg_energy = np.mean([c.energy for c in context.materiae.values()])
+        context.materiae['GENESIS'].grid += avg_grid
+        context.materiae['GENESIS'].perturb(0,0, avg_energy)
+        return "VERITAS UNIVERSALIS IN GENESIM SYNTHESITA EST."
+    if verb == 'EXERCEO':
+        core_name = literals[0].upper()
+        data_path = (context.paths('FLUMINE') or [None])[0]
+        if not data_path: return "FLUMINE DATA REQUIRETUR"
+        threading.Thread(target=training_loop, args=(context, core_name, data_path), daemon=True).start()
+        return f"EXERCEO INCIPIENS PRO '{core_name}'."
+    if verb == 'INTERROGO':
+        core_name = literals[0].upper()
+        if core_name not in context.materiae: return f"MATERIA '{core_name}' NON EXISTIT"
+        target_core = context.materiae[core_name]
+        model = (re.search(r"ORACULO\s+'([^']*)'", args_str.upper()) or [None, 'google-gemini-1.5-flash'])[1]
+        oracle = OracleMateria(model)
+        prompt = target_core.context_embeddings.get(
+            'oracle_prompt',
+            "Synthesize insight from the following context: " + str(target_core.context_embeddings)
+        )
+        response = oracle.query(prompt)
+        amp = text_to_amp(response)
+        target_core.perturb(random.randint(0,9), random.randint(0,9), amp * target_core.permittivity)
+        target_core.embed_context('ORACULUM_RESPONSUM', response)
+        return f"ORACULUM RESPONDIT. FLUXUM '{core_name}' SYNTHESITUR."
+    if verb == 'DOCEO':
+        target_name = literals[0].upper()
+        source_name = (re.search(r"CUM\s+'([^']*)'", args_str.upper()) or [None, None])[1]
+        if not source_name: return "DOCEO REQUIRET FONTEM CUM 'CUM'"
+        target_core = context.materiae.get(target_name)
+        source_core = context.materiae.get(source_name)
+        if not target_core: return f"SCOPUS '{target_name}' NON EXISTIT"
+        if not source_core: return f"FONS '{source_name}' NON EXISTIT"
+        
+        wisdom = str(source_core.context_embeddings)
+        amp = text_to_amp(wisdom)
+        target_core.perturb(random.randint(0,9), random.randint(0,9), amp)
+        target_core.embed_context(f'SAPIENTIA_EX_{source_name}', wisdom)
+        return f"SAPIENTIA EX '{source_name}' IN '{target_name}' INTEGRATA EST."
+
+    # --- Verbs that require a focus ---
+    core = context.get_focused_materia()
+    if verb == 'OSTENDO':
+        name_to_show = literals[0].upper() if literals else context.focus
+        if name_to_show not in context.materiae: return f"MATERIA '{name_to_show}' NON EXISTIT"
+        return context.materiae[name_to_show].display()
+    if verb == 'MIRACULUM':
+        orig_r, orig_p = core.resistance, core.permeability
+        try:
+            core.resistance, core.permeability = 1e-9, 1e9 # Impossible state
+            amp = 1e6 * (1 / (core.dielectricity + 1e-9))
             core.perturb(random.randint(0,9), random.randint(0,9), amp, mod)
-        else: # Default perturb
-            core.perturb(random.randint(0,9), random.randint(0,9), 1.0, mod)
-        core.create()
-        return f"{verb}{inflection} FLUXUM COHERENTEM {core.energy:.2f} IDENTITATEM {core.identity_wave:.2f}"
+        finally:
+            core.resistance, core.permeability = orig_r, orig_p # Restore physics
+        return f"MIRACULUM! FLUXUS DIVINUS. IDENTITAS NUNC {core.identity_wave:.2f}"
+    if verb == 'ANOMALIA':
+        name = literals[0].upper() if literals else 'ENTROPIC_CASCADE'
+        core.anomaly = name
+        return f"ANOMALIA '{name}' INDUCTA EST."
+    if verb == 'DISCERE':
+        source_name = (re.search(r"EX\s+'([^']*)'", args_str.upper()) or [None, None])[1]
+        if not source_name: return "DISCERE REQUIRET FONTEM CUM 'EX'"
+        source_core = context.materiae.get(source_name)
+        if not source_core: return f"FONS '{source_name}' NON EXISTIT"
+        
+        wisdom = str(source_core.context_embeddings)
+        amp = text_to_amp(wisdom)
+        core.perturb(random.randint(0,9), random.randint(0,9), amp)
+        core.embed_context(f'SAPIENTIA_EX_{source_name}', wisdom)
+        return f"SAPIENTIA EX '{source_name}' IN '{context.focus}' INTEGRATA EST."
+    
+    # Default action for verbs like PERTURBO
+    if literals:
+        amp = text_to_amp(literals[0])
+        core.embed_context('oracle_prompt', literals[0])
+        core.perturb(random.randint(0,9), random.randint(0,9), amp, mod)
+    else: # Default perturb
+        core.perturb(random.randint(0,9), random.randint(0,9), 1.0, mod)
+    core.create()
+    return f"{verb}{inflection} FLUXUM COHERENTEM {core.energy:.2f} IDENTITATEM {core.identity_wave:.2f}"
 
 # --- Main Execution Logic ---
 def main():
     """Main function to run the AetherOS REPL."""
-    context = Contextus()
-    print("--- AetherOS v3.0 (Theurgical Gnosis/Imago) ---")
-    while True:
-        try:
-            cmd = input(f"aetheros({context.focus})> ")
-            if cmd.lower() in ['exit', 'vale']:
-                break
-            if not cmd.strip():
-                continue
-            print(f"< {run_aether_command(cmd, context)}")
-        except EOFError:
-            break
-        except Exception as e:
-            print(f"< ERRORUM: {e}")
-    print("\n< VALE.")
+    repl(Contextus())
 
 if __name__ == '__main__':
     # This block now correctly handles both test execution and REPL mode.
@@ -502,6 +481,12 @@ if __name__ == '__main__':
                     run_aether_command("DISCERE EX 'SAPIENTIA'", self.context)
                     self.assertIn('SAPIENTIA_EX_SAPIENTIA', self.context.materiae['DISCIPULUS'].context_embeddings)
 
+                def test_half_precision_perturb_saturates(self):
+                    core = FluxCore(size=4, precision='half')
+                    core.perturb(1, 1, 1e6)
+                    self.assertTrue(np.isfinite(core.grid).all())
+                    self.assertEqual(float(core.grid[1, 1]), float(np.finfo(np.float16).max))
+
             suite = unittest.TestSuite()
             suite.addTest(unittest.makeSuite(TestAetherOS))
             runner = unittest.TextTestRunner(stream=original_stdout, verbosity=2)
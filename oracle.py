@@ -2,9 +2,9 @@
 
 import os
 import json
-import requests
-from dotenv import load_dotenv
-import google.generativeai as genai
+
+# requests and python-dotenv are imported on first query, so importing the OS
+# (which never needs them unless INTERROGO runs) stays light
 
 # --- Base Oracle Class ---
 
@@ -31,6 +31,7 @@ class GeminiOracle(Oracle):
         if not self.api_key:
             return "ORACULUM ERRORUM: GEMINI_API_KEY not found in .env file."
 
+        import requests
         try:
             url = f"{self.endpoint}?key={self.api_key}"
             payload = {"contents": [{"parts": [{"text": prompt_str}]}]}
@@ -57,6 +58,7 @@ class OllamaOracle(Oracle):
         self.endpoint = "http://localhost:11434/api/generate"
 
     def query(self, prompt_str):
+        import requests
         try:
             # Check if Ollama is running
             response = requests.get(self.endpoint.rsplit('/', 1)[0] + '/tags', timeout=5)
@@ -75,6 +77,7 @@ def get_oracle(model_name):
     """
     Factory function that returns the correct oracle instance based on the model name.
     """
+    from dotenv import load_dotenv
     load_dotenv() # Ensure .env is loaded
     
     # Add any other specific API models here in the future
@@ -0,0 +1,240 @@
+# persistence.py
+#
+# Description:
+# SALVO/RESTITUO: snapshotting a whole plenum to disk and bringing it back.
+# Every core's grid is packed into one raw, memory-mappable '.grids' file; the
+# sextet, memory patterns and context embeddings go into a compact '.json'
+# sidecar. Restoring maps the grids copy-on-write, so cores are rebuilt without
+# re-running their boot physics, pages are read only when touched, and several
+# processes restoring the same snapshot share the page cache. Both files carry
+# the same random stamp, so a .grids left beside another save's .json is refused.
+
+import contextlib
+import importlib
+import json
+import mmap
+import os
+import sys
+import numpy as np
+
+from context_store import ContextSnapshot, ContextStore, SnapshotRef
+from ring_buffer import RingBuffer
+
+SNAPSHOT_VERSION = 2
+ALIGNMENT = 64  # Byte alignment of each grid inside the .grids file
+GRIDS_MAGIC = b'AETHERGR'  # Starts the .grids header, followed by the save's stamp
+STAMP_BYTES = 16
+# The core classes a sidecar may name; RESTITUO imports nothing else
+CORE_CLASSES = frozenset({
+    'flux_core.FluxCore', 'flux_core.Intellectus', 'flux_core.TiledFluxCore',
+    'boyd_flux_core.FluxCore', 'boyd_flux_core.Intellectus',
+    'legacy_aether_os.FluxCore', 'legacy_aether_os.Intellectus',
+})
+_SKIPPED = ('grid', 'memory_patterns', 'context_embeddings')
+
+def snapshot_paths(path):
+    """Returns the (.grids, .json) pair for a snapshot base path."""
+    base, ext = os.path.splitext(path)
+    if ext not in ('.grids', '.json'): base = path
+    return base + '.grids', base + '.json'
+
+# --- Encoding ---
+
+def _plain(value):
+    """Converts numpy scalars to JSON-native values; returns None for anything else."""
+    if isinstance(value, np.generic): value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)): return value
+    return None
+
+def core_state(core):
+    """The scalar attributes of a core (sextet, energy, identity, size, ...)."""
+    state = {}
+    items = core.state() if hasattr(core, 'state') else vars(core)
+    for key, value in items.items():
+        if key in _SKIPPED or key.startswith('_'): continue
+        plain = _plain(value)
+        if plain is not None or value is None: state[key] = plain
+    return state
+
+def _encode_value(value, snapshots):
+    if isinstance(value, SnapshotRef):
+        value = value.resolve()
+        if value is None: return None  # A nested level nothing holds any more
+    if isinstance(value, ContextSnapshot):
+        snapshots.setdefault(value.id, value)  # Encoded later by encode_snapshots, without recursing
+        return {'$snapshot': value.id}
+    plain = _plain(value)
+    if plain is not None or value is None: return plain
+    if isinstance(value, (list, tuple)): return [_encode_value(v, snapshots) for v in value]
+    return str(value)
+
+def encode_snapshots(snapshots, known=()):
+    """The JSON table of the snapshots collected by encode_core and of those they reference.
+
+    Walks the references with a worklist, so a chain of any depth encodes without recursion.
+    Ids in `known` (already written, e.g. earlier in a checkpoint log) are referenced, not repeated.
+    """
+    table, pending = {}, list(snapshots.values())
+    while pending:
+        snapshot = pending.pop()
+        if str(snapshot.id) in table or snapshot.id in known: continue
+        found = {}
+        table[str(snapshot.id)] = {'owner': snapshot.owner, 'summary': snapshot.summary,
+                                   'entries': [[k, _encode_value(v, found)] for k, v in snapshot.entries.items()]}
+        pending.extend(found.values())
+    return table
+
+def _decode_value(value, snapshots, nested=False):
+    if isinstance(value, dict) and '$snapshot' in value:
+        snapshot = snapshots[value['$snapshot']]
+        return SnapshotRef(snapshot.id) if nested else snapshot
+    if isinstance(value, list): return [_decode_value(v, snapshots, nested) for v in value]
+    return value
+
+def memory_values(memory):
+    return memory.tolist() if isinstance(memory, RingBuffer) else list(memory)
+
+def memory_layout(memory):
+    """Capacity, dtype and statistics field of a RingBuffer memory (None for plain lists)."""
+    if not isinstance(memory, RingBuffer): return None
+    return {'capacity': memory.capacity, 'dtype': memory.data.dtype.descr, 'field': memory.field}
+
+def restore_memory(values, layout):
+    if layout is None: return list(values)
+    dtype = np.dtype([tuple(f) for f in layout['dtype']]) if layout['dtype'][0][0] else np.dtype(layout['dtype'][0][1])
+    memory = RingBuffer(layout['capacity'], dtype, layout['field'])
+    memory.extend([tuple(v) for v in values] if dtype.names else values)
+    return memory
+
+# --- SALVO ---
+
+def core_entry(name, core, snapshots):
+    """The sidecar entry of one core, without its grid's cells; snapshots it references join `snapshots`."""
+    return {
+        'name': name,
+        'class': f"{type(core).__module__}.{type(core).__qualname__}",
+        'dtype': np.dtype(core.grid.dtype).str, 'shape': list(core.grid.shape),
+        'state': core_state(core),
+        'memory': [_encode_value(p, snapshots) for p in memory_values(core.memory_patterns)],
+        'memory_layout': memory_layout(core.memory_patterns),
+        'context': encode_context(core, snapshots),
+    }
+
+def encode_core(name, core, snapshots):
+    """Returns (sidecar entry, contiguous grid) for one core."""
+    return core_entry(name, core, snapshots), np.ascontiguousarray(core.grid)
+
+def encode_context(core, snapshots):
+    return [[k, _encode_value(v, snapshots)] for k, v in core.context_embeddings.items()]
+
+def save_plenum(context, path, generation=0):
+    """Writes every core of the context to a .grids/.json snapshot pair.
+
+    Both files are written to temporary paths and renamed into place, so a failed save
+    leaves neither a partial pair nor a stray .grids file behind. The renames are two
+    steps, so both files record a fresh stamp and read_snapshot refuses a mismatched pair.
+    """
+    grids_path, meta_path = snapshot_paths(path)
+    tmp_grids, tmp_meta = grids_path + '.tmp', meta_path + '.tmp'
+    stamp = os.urandom(STAMP_BYTES)
+    snapshots, cores, offset = {}, [], ALIGNMENT
+    try:
+        with context.lock:
+            with open(tmp_grids, 'wb') as f:
+                f.write((GRIDS_MAGIC + stamp).ljust(ALIGNMENT, b'\0'))
+                for name, core in context.materiae.items():
+                    entry, grid = encode_core(name, core, snapshots)
+                    pad = -offset % ALIGNMENT
+                    f.write(b'\0' * pad)
+                    offset += pad
+                    f.write(grid.tobytes())
+                    entry['offset'] = offset
+                    cores.append(entry)
+                    offset += grid.nbytes
+            meta = {'version': SNAPSHOT_VERSION, 'generation': generation, 'stamp': stamp.hex(),
+                    'grids_bytes': offset, 'focus': context.focus, 'cores': cores,
+                    'snapshots': encode_snapshots(snapshots)}
+            with open(tmp_meta, 'w') as f:
+                json.dump(meta, f, separators=(',', ':'))
+        os.replace(tmp_grids, grids_path)
+        os.replace(tmp_meta, meta_path)
+    except BaseException:
+        for tmp in (tmp_grids, tmp_meta):
+            with contextlib.suppress(FileNotFoundError): os.remove(tmp)
+        raise
+    return len(cores)
+
+# --- RESTITUO ---
+
+def _load_class(qualified):
+    """Resolves a sidecar's core class, refusing any outside CORE_CLASSES."""
+    module, _, name = qualified.rpartition('.')
+    script = os.path.splitext(os.path.basename(getattr(sys.modules['__main__'], '__file__', None) or ''))[0]
+    if f"{script if module == '__main__' else module}.{name}" not in CORE_CLASSES:
+        raise ValueError(f"CLASSIS '{qualified}' NON PERMISSA")
+    return getattr(importlib.import_module(module), name)
+
+def decode_snapshots(raw, snapshots=None):
+    """Rebuilds a snapshot table under fresh ids, resolving references between snapshots."""
+    snapshots = {} if snapshots is None else snapshots
+    for k, v in raw.items():
+        snapshots.setdefault(int(k), ContextSnapshot(v['owner'], {}, v['summary']))
+    for k, v in raw.items():
+        snapshots[int(k)].entries = {key: _decode_value(val, snapshots, nested=True) for key, val in v['entries']}
+    return snapshots
+
+def map_grids(grids_path, meta):
+    """Maps the .grids file copy-on-write: pages load lazily and writes stay private.
+
+    Raises ValueError unless the file's size and stamp match the sidecar `meta`.
+    """
+    with open(grids_path, 'rb') as f:
+        header = f.read(len(GRIDS_MAGIC) + STAMP_BYTES)
+        if os.fstat(f.fileno()).st_size != meta.get('grids_bytes') or header != GRIDS_MAGIC + bytes.fromhex(meta.get('stamp', '')):
+            raise ValueError("SNAPSHOT '.grids' ET '.json' NON CONGRUUNT")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+def restore_core(entry, grid, snapshots):
+    """Rebuilds one core from its sidecar entry without running its constructor."""
+    cls = _load_class(entry['class'])
+    core = cls.__new__(cls)
+    for key, value in entry['state'].items():
+        setattr(core, key, value)
+    core.grid = cls.adopt_grid(grid) if hasattr(cls, 'adopt_grid') else grid
+    core.memory_patterns = restore_memory(entry['memory'], entry.get('memory_layout'))
+    core.context_embeddings = restore_context(entry['context'], snapshots)
+    return core
+
+def restore_context(entries, snapshots):
+    store = ContextStore()
+    for key, value in entries:
+        store[key] = _decode_value(value, snapshots)
+    return store
+
+def read_snapshot(path):
+    """Rebuilds the cores of a snapshot; returns (materiae, snapshot table, sidecar metadata)."""
+    grids_path, meta_path = snapshot_paths(path)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"SNAPSHOT VERSIO {meta.get('version')} IGNOTA")
+    buffer = map_grids(grids_path, meta)
+    snapshots = decode_snapshots(meta['snapshots'])
+    materiae = {}
+    for entry in meta['cores']:
+        grid = np.ndarray(tuple(entry['shape']), dtype=np.dtype(entry['dtype']), buffer=buffer, offset=entry['offset'])
+        materiae[entry['name']] = restore_core(entry, grid, snapshots)
+    return materiae, snapshots, meta
+
+def install_plenum(context, materiae, focus):
+    """Swaps a rebuilt set of cores into the context."""
+    with context.lock:
+        context.materiae.clear()
+        context.materiae.update(materiae)
+        context.focus = focus if focus in materiae else None
+    return len(materiae)
+
+def load_plenum(context, path):
+    """Replaces the context's materiae with those of a snapshot; returns the core count."""
+    materiae, _, meta = read_snapshot(path)
+    return install_plenum(context, materiae, meta['focus'])
@@ -0,0 +1,62 @@
+# precision.py
+#
+# Description:
+# The grid precision policy. Every core stores its grid in one dtype and does
+# its arithmetic (grounding blends, convergence, sextet statistics) in another:
+# 'half' keeps float16 grids but computes in float32, halving the memory of
+# large plenums; 'single' and 'double' store and compute in float32/float64.
+# Sensor frames and baselines are brought to the compute dtype once, so a blend
+# never silently upcasts a grid to float64. Values are saturated to the storage
+# dtype's finite range on the way back, so a large perturbation can't store inf.
+
+from collections import namedtuple
+import numpy as np
+
+Precision = namedtuple('Precision', 'name storage compute')
+
+PRECISIONS = {
+    'half': Precision('half', np.dtype(np.float16), np.dtype(np.float32)),
+    'single': Precision('single', np.dtype(np.float32), np.dtype(np.float32)),
+    'double': Precision('double', np.dtype(np.float64), np.dtype(np.float64)),
+}
+DEFAULT_PRECISION = 'single'
+_BY_STORAGE = {p.storage: p for p in PRECISIONS.values()}
+
+def get_precision(precision=None):
+    """Resolves a policy name (or a Precision, or None for the default) to a Precision."""
+    if isinstance(precision, Precision): return precision
+    name = (precision or DEFAULT_PRECISION).lower()
+    if name not in PRECISIONS:
+        raise ValueError(f"PRAECISIO '{name.upper()}' IGNOTA")
+    return PRECISIONS[name]
+
+def set_default_precision(precision):
+    """Changes the policy used by cores created without an explicit precision."""
+    global DEFAULT_PRECISION
+    DEFAULT_PRECISION = get_precision(precision).name
+
+def precision_of(grid):
+    """The policy a grid is stored under, judged by its dtype."""
+    dtype = grid.dtype if hasattr(grid, 'dtype') else np.asarray(grid).dtype
+    return _BY_STORAGE.get(dtype, PRECISIONS['double'])
+
+def to_compute(array, precision):
+    """A view or copy of `array` in the policy's compute dtype."""
+    return np.asarray(array).astype(precision.compute, copy=False)
+
+def to_storage(array, precision):
+    """A view or copy of `array` in the policy's storage dtype, saturated to its finite range."""
+    array = np.asarray(array)
+    if array.dtype.kind == 'f' and array.dtype.itemsize > precision.storage.itemsize:
+        limit = np.finfo(precision.storage).max
+        array = np.clip(array, -limit, limit)  # Narrowing would turn large values into inf
+    return array.astype(precision.storage, copy=False)
+
+def add_at(grid, index, values, precision):
+    """np.add.at(grid, index, values), summed in the compute dtype and saturated on store."""
+    if precision.storage == precision.compute:
+        np.add.at(grid, index, values)
+        return
+    cells, inverse = np.unique(np.ravel_multi_index(index, grid.shape), return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=np.broadcast_to(values, inverse.shape).ravel())
+    grid.flat[cells] = to_storage(to_compute(grid.flat[cells], precision) + sums.astype(precision.compute), precision)
@@ -0,0 +1,47 @@
+# pyramid.py
+#
+# Description:
+# Lazily built image pyramids. A pyramid keeps a grid at its own resolution
+# and fills in power-of-two reductions (exact 2x2 area means) only when asked;
+# any other size is resampled once from the nearest cached level rather than
+# from full resolution, and then cached as well. Cores use it for REDIMO and
+# DIALECTICA resizes, and grounding uses it for the sensor frame.
+
+import cv2
+import numpy as np
+
+def halve(grid):
+    """Area-averages a grid down to half its size (what INTER_AREA does for an exact halving)."""
+    h, w = grid.shape
+    if h % 2 or w % 2:
+        return cv2.resize(grid, (w // 2, h // 2), interpolation=cv2.INTER_AREA)
+    return grid.reshape(h // 2, 2, w // 2, 2).mean(axis=(1, 3), dtype=grid.dtype)
+
+class Pyramid:
+    """A grid and its lazily computed lower resolutions, keyed by side length."""
+    def __init__(self, base, key=None):
+        self.key = key  # Whatever identifies the base's contents; owners rebuild when it changes
+        self.levels = {base.shape[0]: base}
+
+    @property
+    def base(self):
+        return self.levels[max(self.levels)]
+
+    def level(self, size):
+        """The grid at `size` x `size`. Derived levels are shared and read-only."""
+        cached = self.levels.get(size)
+        if cached is not None: return cached
+        sizes = list(self.levels)  # A snapshot: frame pyramids are shared across threads
+        larger = [s for s in sizes if s >= size]
+        src_size = min(larger) if larger else max(sizes)
+        src = self.levels[src_size]
+        while src_size // 2 >= size:
+            src = halve(src)
+            src_size = src.shape[0]
+            src.flags.writeable = False
+            self.levels[src_size] = src
+        if src_size != size:
+            src = cv2.resize(src, (size, size), interpolation=cv2.INTER_AREA)
+            src.flags.writeable = False
+            self.levels[size] = src
+        return src
@@ -0,0 +1,85 @@
+# render.py
+#
+# Description:
+# The OSTENDO rendering layer. A core is shown section by section (summary,
+# one page of context, an optional grid preview), and every value is clipped
+# before it is formatted, so showing a core inherited from a long story costs
+# the same as showing a fresh one. MODO 'MACHINA' yields the same sections as
+# JSON lines for tools and story runners.
+
+import itertools
+import json
+import reprlib
+import numpy as np
+
+PAGE_SIZE = 20
+MAX_VALUE_CHARS = 200
+GRID_THRESHOLD = 100  # Grids with more cells than this are summarized with '...'
+RENDER_MODES = ('PLENUM', 'SUMMA', 'MACHINA')
+
+_clipper = reprlib.Repr()
+_clipper.maxstring = _clipper.maxother = MAX_VALUE_CHARS
+_clipper.maxlist = _clipper.maxtuple = _clipper.maxdict = 8
+_clipper.maxlevel = 2
+
+def clip(value, max_chars=MAX_VALUE_CHARS):
+    """Formats a value in bounded time: long strings are sliced, containers are abbreviated."""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else f"{value[:max_chars]}...[+{len(value) - max_chars}]"
+    text = _clipper.repr(value)
+    return text if len(text) <= max_chars else f"{text[:max_chars]}..."
+
+def grid_preview(grid):
+    """A corner-and-edge summary of the grid rather than every cell."""
+    return np.array2string(np.asarray(grid), threshold=GRID_THRESHOLD, edgeitems=3, precision=2)
+
+def core_summary(core):
+    if hasattr(core, 'summary'):
+        return core.summary()
+    return f"FLUXUS: {core.energy:.2f} | MEMORIA: {len(core.memory_patterns)}"
+
+def iter_sections(core, page=1, page_size=PAGE_SIZE, max_value_chars=MAX_VALUE_CHARS, grid=False):
+    """Lazily yields (section, payload) pairs describing a core."""
+    yield 'summary', core_summary(core)
+
+    total = len(core.context_embeddings)
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
+    entries = itertools.islice(iter(core.context_embeddings.items()), start, start + page_size)
+    yield 'context', {'page': page, 'pages': pages, 'total': total,
+                      'entries': [(str(k), clip(v, max_value_chars)) for k, v in entries]}
+
+    if grid:
+        g = np.asarray(core.grid)
+        yield 'grid', {'shape': list(g.shape), 'mean': float(g.mean()), 'max': float(g.max()),
+                       'preview': grid_preview(g)}
+
+def iter_machine(core, **kwargs):
+    """MODO 'MACHINA': one JSON object per section, produced on demand."""
+    for section, payload in iter_sections(core, **kwargs):
+        yield json.dumps({'section': section, 'data': payload})
+
+def render(core, mode='PLENUM', page=1, page_size=PAGE_SIZE, max_value_chars=MAX_VALUE_CHARS, grid=False):
+    """Renders a core for OSTENDO in PLENUM (paged), SUMMA or MACHINA mode."""
+    mode = mode.upper()
+    if mode not in RENDER_MODES:
+        raise ValueError(f"MODUS '{mode}' IGNOTUS")
+    if mode == 'SUMMA':
+        return core_summary(core)
+    kwargs = dict(page=page, page_size=page_size, max_value_chars=max_value_chars, grid=grid)
+    if mode == 'MACHINA':
+        return "\n".join(iter_machine(core, **kwargs))
+
+    lines = []
+    for section, payload in iter_sections(core, **kwargs):
+        if section == 'summary':
+            lines.append(payload)
+        elif section == 'context':
+            lines.append("CONTEXTUS:")
+            lines.extend(f"  '{k}': {v}" for k, v in payload['entries'])
+            if payload['pages'] > 1:
+                lines.append(f"  [PAGINA {payload['page']}/{payload['pages']}, {payload['total']} ENTRIES]")
+        elif section == 'grid':
+            lines.append(f"GRIDUM:\n{payload['preview']}")
+    return "\n".join(lines)
@@ -0,0 +1,137 @@
+# ring_buffer.py
+#
+# Description:
+# The fixed-capacity memory behind every core's memory_patterns. Events live
+# in a preallocated numpy array written round-robin, so remembering is O(1)
+# whatever the capacity, and a running sum / sum of squares keeps the window's
+# mean and variance available without rescanning it. Cores with structured
+# memories (the Boyd E-M log) name the field their statistics follow.
+
+import numpy as np
+
+MEMORY_CAPACITY = 100  # The classic short-term memory of a FluxCore
+INTELLECTUS_MEMORY = 10_000  # Largest memory an Intellectus may opt into (INSTAURO ... MEMORIA n)
+_RESUM_EVERY = 4096  # Pushes between exact recomputations of the running sums (at least one capacity's worth)
+
+class RingBuffer:
+    """A fixed-capacity, oldest-first event buffer with O(1) push and running window statistics."""
+    def __init__(self, capacity=MEMORY_CAPACITY, dtype=np.float64, field=None):
+        self.capacity = int(capacity)
+        self.data = np.zeros(self.capacity, dtype=dtype)
+        self.field = field  # For structured dtypes, the field the statistics follow
+        self.start = 0
+        self.count = 0
+        self.total = 0.0  # Running sum of the window
+        self.total_sq = 0.0  # Running sum of squares of the window
+        self._since_resum = 0
+
+    def _scalar(self, value):
+        return float(value[self.field]) if self.field else float(value)
+
+    def push(self, value):
+        """Remembers one event, forgetting the oldest once full."""
+        end = (self.start + self.count) % self.capacity
+        if self.count == self.capacity:
+            old = self._scalar(self.data[end])
+            self.total -= old
+            self.total_sq -= old * old
+            self.start = (self.start + 1) % self.capacity
+        else:
+            self.count += 1
+        self.data[end] = value
+        new = self._scalar(self.data[end])
+        self.total += new
+        self.total_sq += new * new
+        self._since_resum += 1
+        if self._since_resum >= max(_RESUM_EVERY, self.capacity): self._resum()
+
+    append = push
+
+    def extend(self, values):
+        """Remembers many events with one or two slice writes, updating the sums by the slots replaced."""
+        values = np.asarray(values, dtype=self.data.dtype)
+        if values.size == 0: return
+        values = values[-self.capacity:]
+        n = len(values)
+        end = (self.start + self.count) % self.capacity
+        overflow = max(0, self.count + n - self.capacity)
+        old = self._stat(self._segment(self.start, overflow))  # The oldest events, about to be overwritten
+        first = min(n, self.capacity - end)
+        self.data[end:end + first] = values[:first]
+        self.data[:n - first] = values[first:]
+        self.count = min(self.capacity, self.count + n)
+        self.start = (self.start + overflow) % self.capacity
+        new = self._stat(values)
+        self.total += float(new.sum() - old.sum())
+        self.total_sq += float(np.dot(new, new) - np.dot(old, old))
+        self._since_resum += n
+        if self._since_resum >= max(_RESUM_EVERY, self.capacity): self._resum()
+
+    def _resum(self):
+        window = self.stat_values()
+        self.total = float(window.sum())
+        self.total_sq = float(np.dot(window, window))
+        self._since_resum = 0
+
+    def _segment(self, first, n):
+        """`n` slots from `first`, wrapping around (a view when they don't wrap)."""
+        end = first + n
+        if end <= self.capacity: return self.data[first:end]
+        return np.concatenate((self.data[first:], self.data[:end - self.capacity]))
+
+    def _stat(self, events):
+        return (events[self.field] if self.field else events).astype(np.float64)
+
+    def array(self):
+        """The remembered events, oldest first, as a new array."""
+        window = self._segment(self.start, self.count)
+        return window.copy() if window.base is self.data else window
+
+    def stat_values(self):
+        return self._stat(self._segment(self.start, self.count))
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def var(self):
+        if not self.count: return 0.0
+        mean = self.mean()
+        return max(0.0, self.total_sq / self.count - mean * mean)
+
+    def std(self):
+        return float(np.sqrt(self.var()))
+
+    def window(self, n):
+        """The last `n` events, oldest first."""
+        return self.array()[-n:] if n > 0 else self.data[:0].copy()
+
+    def window_stats(self, n=None):
+        """Vectorized mean/std/min/max over the last `n` events (all of them by default)."""
+        values = self.stat_values()
+        if n is not None: values = values[-n:] if n > 0 else values[:0]
+        if values.size == 0:
+            return {'count': 0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
+        return {'count': int(values.size), 'mean': float(values.mean()), 'std': float(values.std()),
+                'min': float(values.min()), 'max': float(values.max())}
+
+    def tolist(self):
+        return self.array().tolist()
+
+    def clear(self):
+        self.start = self.count = 0
+        self.total = self.total_sq = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return iter(self.array())
+
+    def __getitem__(self, index):
+        return self.array()[index]
+
+    def __repr__(self):
+        return f"RingBuffer({self.count}/{self.capacity})"
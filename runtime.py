@@ -0,0 +1,311 @@
+# runtime.py
+#
+# Description:
+# The shared AetherOS runtime. Every OS variant (ferro, Boyd, legacy) is a
+# Contextus driven by one parser, one dispatcher, one journal and one
+# persistence layer; what differs between them is the physics, which lives in
+# a Backend strategy: the cores a plenum boots with, the autonomous actions
+# its regulator may take, and the verbs it adds. Verb resolution is compiled
+# and cached once here, so every variant gets the same fast path.
+#
+# Usage:
+#   python runtime.py [ferro|boyd|legacy] [test]   (or set AETHER_BACKEND)
+
+import functools
+import importlib
+import os
+import random
+import re
+import runpy
+import sys
+import threading
+import time
+
+from persistence import save_plenum
+from ring_buffer import MEMORY_CAPACITY, INTELLECTUS_MEMORY
+from checkpoint import Checkpointer, recover_plenum, CHECKPOINT_INTERVAL
+from journal import CommandJournal, Replayer, rng_digest
+from sensor_hook import bound_sensor
+
+# --- Shared Grammar ---
+KNOWN_INFLECTIONS = ['ABAM', 'EBAM', 'AM', 'O', 'E']
+inflection_map = {
+    'O': {'mod': 1.0}, 'E': {'mod': -1.0}, 'ABAM': {'mod': 1.5},
+    'EBAM': {'mod': -0.5}, 'AM': {'mod': random.uniform(0.5, 1.5)}
+}
+COMMAND = re.compile(r"([A-Z]+(?:O|E|ABAM|EBAM|AM)?)\s*(.*)", re.DOTALL)
+LITERAL = re.compile(r"'([^']*)'")
+PERSISTENCE_VERBS = ['SALVO', 'RESTITUO', 'DIARIUM', 'ITERO']  # Handled here, for every backend
+UNJOURNALED = ('DIARIUM', 'ITERO')  # Verbs that manage the journal itself
+
+# Backend name -> the module defining its BACKEND, Contextus and run_tests (imported on selection)
+BACKENDS = {'ferro': 'aether_os', 'boyd': 'boyd_aether_os', 'legacy': 'legacy_aether_os'}
+DEFAULT_BACKEND = 'ferro'
+
+@functools.lru_cache(maxsize=1024)
+def resolve_verb(word, verbs):
+    """Splits a command's first word into (verb, inflection) against a tuple of known verbs."""
+    for verb in verbs:
+        if word.startswith(verb):
+            return verb, word[len(verb):] or 'O'
+    return word, 'O'
+
+def parse_latin_command(cmd, verbs):
+    """Parses a command into verb, inflection, quoted literals and the raw argument string."""
+    match = COMMAND.match(cmd.strip().upper())
+    if not match: raise ValueError("FORMATUM INVALIDUM")
+    word, args_str = match.groups()
+    verb, inflection = resolve_verb(word, verbs)
+    return verb, inflection, LITERAL.findall(args_str), args_str
+
+def modulus(inflection):
+    return inflection_map.get(inflection, {'mod': 1.0})['mod']
+
+# --- Physics Strategy ---
+class Backend:
+    """The physics behind a Contextus: its boot sequence, verbs and autonomous actions.
+
+    Verb handlers take (inflection, mod, literals, args) and return the response string;
+    by default a verb maps to the context's `_handle_<verb>` method, if it has one.
+    """
+    name = None
+    title = "AetherOS"  # Shown by the REPL
+    verbs = ()
+
+    def boot(self, context):
+        pass
+
+    def handlers(self, context):
+        handlers = {verb: getattr(context, f"_handle_{verb.lower()}", None) for verb in self.verbs}
+        return {verb: handler for verb, handler in handlers.items() if handler}
+
+    def regulator(self, context):
+        """The started autonomous regulator for `context`, or None if this physics has none."""
+        return None
+
+    def regulate(self, context, name, action, args):
+        """Applies one autonomous action; returns whether it happened (and so is journaled)."""
+        return False
+
+    def close(self, context):
+        pass
+
+# --- Shared Context and Executor ---
+class Contextus:
+    """The container for a plenum and command execution, for any physics backend.
+
+    `sensor` grounds every core of the plenum (see sensor_hook.SensorManager); None uses the
+    global ferro_sensor, which is only created once a core needs it.
+    """
+    def __init__(self, backend, regulate=True, sensor=None):
+        self.backend = backend
+        self.sensor = sensor
+        self.materiae = {}
+        self.focus = None
+        self.lock = threading.RLock()
+        self.verbs = tuple(backend.verbs) + tuple(v for v in PERSISTENCE_VERBS if v not in backend.verbs)
+        self.verb_handlers = {'SALVO': self._handle_salvo, 'RESTITUO': self._handle_restituo,
+                              'DIARIUM': self._handle_diarium, 'ITERO': self._handle_itero}
+        self.verb_handlers.update(backend.handlers(self))
+        self.checkpointer = None
+        self.rng = random.Random()  # Reseeded per command, so every draw can be journaled
+        self.pace = time.sleep  # Replays swap this for a no-op
+        self.journal = None
+        self.command = ''  # The command being executed, in its original case (for file paths)
+        self._depth = 0  # Nesting of execute_command; only top-level commands are journaled
+
+        with bound_sensor(sensor):
+            backend.boot(self)
+        self.regulator = backend.regulator(self) if regulate else None
+
+    def get_focused_materia(self):
+        with self.lock:
+            if not self.focus or self.focus not in self.materiae:
+                self.focus = 'GENESIS' if 'GENESIS' in self.materiae else None
+            if not self.focus:
+                raise ValueError("NULLA MATERIA IN FOCO EST")
+            return self.materiae[self.focus]
+
+    def execute_command(self, cmd, seed=None, mod=None):
+        """Parses and executes a command using the handler mapping.
+
+        Handlers draw from self.rng, reseeded here; replays pass the journaled seed and mod.
+        """
+        with self.lock, bound_sensor(self.sensor):
+            if seed is None:
+                seed = self.rng.getrandbits(64) if self._depth else random.getrandbits(64)
+            self.rng.seed(seed)
+            self.adopt_cores()
+            verb, outer = None, self.command
+            self.command = cmd
+            self._depth += 1
+            try:
+                verb, inflection, literals, args_str = self._parse_latin_command(cmd)
+                if mod is None: mod = modulus(inflection)
+                handler = self.verb_handlers.get(verb)
+                response = handler(inflection, mod, literals, args_str) if handler else f"VERBUM IGNORATUM '{verb}'"
+            except Exception as e:
+                response = f"ERRORUM INTERNUM: {e}"
+            finally:
+                self._depth -= 1
+                self.command = outer
+            if self.journal is not None and not self._depth and verb not in UNJOURNALED:
+                index = self.journal.record({'command': cmd, 'verb': verb, 'seed': seed, 'mod': mod,
+                                             'rng': rng_digest(self.rng), 'response': response})
+                every = self.journal.snapshot_every
+                if every and (index + 1) % every == 0:
+                    self._journal_snapshot(f"{self.journal.path}.{index + 1}")
+            return response
+
+    def _parse_latin_command(self, cmd):
+        return parse_latin_command(cmd, self.verbs)
+
+    def paths(self, keyword=None):
+        """The current command's quoted literals in their original case, or those after `keyword`.
+
+        The parser uppercases literals (they name cores); file paths must keep their case.
+        """
+        if keyword: return re.findall(rf"{keyword}\s+'([^']*)'", self.command, re.IGNORECASE)
+        return LITERAL.findall(self.command)
+
+    def memory_capacity(self, args):
+        """Reads an optional MEMORIA n clause (an Intellectus opting into a larger memory)."""
+        memory = re.search(r"MEMORIA\s+(-?\d+)", args.upper())
+        if not memory: return MEMORY_CAPACITY
+        capacity = int(memory.group(1))
+        if not 1 <= capacity <= INTELLECTUS_MEMORY:
+            raise ValueError(f"MEMORIA DEBET ESSE INTER 1 ET {INTELLECTUS_MEMORY}")
+        return capacity
+
+    def adopt_cores(self):
+        """Points every core's internal draws (e.g. ENTROPIC_CASCADE) at the context RNG, and at its sensor."""
+        for core in self.materiae.values():
+            core.rng = self.rng
+            if self.sensor is not None: core.sensor = self.sensor
+
+    def regulate(self, name, action, *args):
+        """Applies (and journals) one of the backend's autonomous actions.
+
+        Actions are journaled even inside a command (e.g. TEMPUS GRADUS), since replays skip
+        the verbs that issue them.
+        """
+        with self.lock, bound_sensor(self.sensor):
+            if self.backend.regulate(self, name, action, args) and self.journal is not None:
+                self.journal.record({'regulator': action, 'name': name, 'args': list(args)})
+
+    def close(self):
+        """Stops the background checkpointer and closes the journal and the backend's services."""
+        if self.checkpointer:
+            self.checkpointer.stop()
+            self.checkpointer = None
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self.backend.close(self)
+
+    def _journal_snapshot(self, path):
+        """Saves a snapshot and marks it in the journal as a fast-forward point."""
+        generation = time.time_ns()
+        count = save_plenum(self, path, generation)
+        if self.journal is not None: self.journal.mark(path, generation)
+        return count
+
+    # --- Persistence Verbs ---
+    def _handle_salvo(self, inf, mod, lit, args):
+        """Snapshots the whole plenum to disk; CONTINUO keeps checkpointing changed cores, CESSO stops."""
+        if re.search(r"\bCESSO\b", args.upper()):
+            if not self.checkpointer: return "NULLA SALVATIO CONTINUA."
+            self.checkpointer.stop()
+            written, self.checkpointer = self.checkpointer.cores_written, None
+            return f"SALVATIO CONTINUA CESSAT: {written} MATERIAE INCREMENTALITER SALVAE."
+        lit = self.paths()
+        if not lit: return "SALVO REQUIRET NOMEN ARCHIVI"
+        if re.search(r"\bCONTINUO\b", args.upper()):
+            interval = float((re.search(r"INTERVALLO\s+([\d.]+)", args.upper()) or [None, CHECKPOINT_INTERVAL])[1])
+            if self.checkpointer: self.checkpointer.stop()
+            self.checkpointer = Checkpointer(self, lit[0], interval)
+            self.checkpointer.start()
+            return f"SALVATIO CONTINUA IN '{lit[0]}' OMNI {interval:g}S."
+        count = self._journal_snapshot(lit[0])
+        return f"PLENUM SALVUM: {count} MATERIAE IN '{lit[0]}'."
+
+    def _handle_restituo(self, inf, mod, lit, args):
+        """Replaces the plenum with a snapshot plus its checkpoint log, mapping grids lazily."""
+        lit = self.paths()
+        if not lit: return "RESTITUO REQUIRET NOMEN ARCHIVI"
+        try:
+            count = recover_plenum(self, lit[0])
+        except FileNotFoundError:
+            return f"ARCHIVUM '{lit[0]}' NON INVENTUM"
+        return f"PLENUM RESTITUTUM: {count} MATERIAE. FOCUS IN '{self.focus}'."
+
+    def _handle_diarium(self, inf, mod, lit, args):
+        """Journals every command to a file (OMNI n also snapshots every n commands); CESSO stops."""
+        if re.search(r"\bCESSO\b", args.upper()):
+            if self.journal is None: return "NULLUM DIARIUM APERTUM."
+            self.journal.close()
+            count, self.journal = len(self.journal), None
+            return f"DIARIUM CLAUSUM: {count} MANDATA."
+        lit = self.paths()
+        if not lit: return "DIARIUM REQUIRET NOMEN ARCHIVI"
+        every = re.search(r"OMNI\s+(\d+)", args.upper())
+        if self.journal is not None: self.journal.close()
+        self.journal = CommandJournal(lit[0], int(every.group(1)) if every else None)
+        self._journal_snapshot(f"{lit[0]}.{len(self.journal)}")  # The plenum the journal starts from
+        return f"DIARIUM APERTUM IN '{lit[0]}'."
+
+    def _handle_itero(self, inf, mod, lit, args):
+        """Replays a journal into this plenum at full speed, optionally only up to command AD n."""
+        lit = self.paths()
+        if not lit: return "ITERO REQUIRET NOMEN ARCHIVI"
+        try:
+            journal = CommandJournal.load(lit[0])
+        except FileNotFoundError:
+            return f"DIARIUM '{lit[0]}' NON INVENTUM"
+        until = re.search(r"AD\s+(\d+)", args.upper())
+        replayer = Replayer(self, journal)
+        replayer.fast_forward(int(until.group(1)) if until else len(journal))
+        if replayer.divergences:
+            return f"ITERATIO DIVERGIT AD MANDATUM {replayer.divergences[0][0]}."
+        return f"ITERATIO PERFECTA: {replayer.position} MANDATA. FOCUS IN '{self.focus}'."
+
+# --- Startup ---
+def load_backend(name):
+    """The module implementing backend `name`, imported on first selection."""
+    if name not in BACKENDS: raise ValueError(f"PHYSICA '{name}' IGNOTA")
+    return importlib.import_module(BACKENDS[name])
+
+def create_context(name=DEFAULT_BACKEND, **kwargs):
+    return load_backend(name).Contextus(**kwargs)
+
+def repl(context, run_tests=None):
+    """Reads commands into `context` until 'vale'; 'test' runs the backend's tests if given."""
+    print(f"\n--- {context.backend.title} REPL ---")
+    print("Type 'test' to run the unit tests, or 'vale' to quit." if run_tests else "Type 'vale' to quit.")
+    while True:
+        try:
+            cmd = input(f"aetheros({context.focus})> ")
+            if cmd.lower() in ['exit', 'vale']: break
+            if not cmd.strip(): continue
+            if run_tests and cmd.lower() == 'test':
+                run_tests()
+                continue
+            print(f"< {context.execute_command(cmd)}")
+        except (EOFError, KeyboardInterrupt):
+            break
+        except Exception as e:
+            print(f"< FATAL ERRORUM: {e}")
+    context.close()
+    print("\n< VALE.")
+
+def main(argv=None):
+    """Runs the backend named on the command line (or in AETHER_BACKEND) as its own script would."""
+    argv = sys.argv[1:] if argv is None else argv
+    names = [a.lower() for a in argv if a.lower() in BACKENDS]
+    name = names[0] if names else os.environ.get('AETHER_BACKEND', DEFAULT_BACKEND).lower()
+    if name not in BACKENDS: raise ValueError(f"PHYSICA '{name}' IGNOTA")
+    sys.argv = [f"{BACKENDS[name]}.py"] + [a for a in argv if a.lower() not in BACKENDS]
+    runpy.run_module(BACKENDS[name], run_name='__main__', alter_sys=True)
+
+if __name__ == '__main__':
+    main()
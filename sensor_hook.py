@@ -1,5 +1,18 @@
 #!/usr/bin/env python3
+# sensor_hook.py
+#
+# Description:
+# Ferrocell sensors and their lifecycle. A FerrocellSensor polls a physical
+# cell (or its mock) on a background thread at a configurable rate; it can be
+# stopped and restarted, or stepped synchronously instead. SynchronousSensor is
+# a seeded mock that never starts a thread, and RecordedSensor plays back a
+# recording made with record_sensor(). A SensorManager creates named sensors
+# and shares them by reference count, so several plenums can bind to different
+# cells; the global ferro_sensor is just the manager's 'ferro' sensor, created
+# on first use.
 
+import contextlib
+import contextvars
 import threading
 import time
 import random
@@ -20,14 +33,23 @@ try:
 except ImportError:
     CAMERA_AVAILABLE = False
 
+POLL_INTERVAL = 0.1  # Default seconds between polls
+
 class FerrocellSensor:
     """
     Interface to ferrocell sensors for real-time sextet and visual data.
-    This class polls all sensor data in a background thread.
+    This class polls all sensor data in a background thread (see start/stop).
     """
-    def __init__(self, mock_mode=True, port='/dev/ttyACM2', baud=9600, resolution=(128, 128)):
+    rng = random  # Sources of the mock data; a SynchronousSensor seeds its own
+    np_rng = np.random
+
+    def __init__(self, mock_mode=True, port='/dev/ttyACM2', baud=9600, resolution=(128, 128),
+                 poll_interval=POLL_INTERVAL, autostart=True):
         self.mock_mode = mock_mode
-        self.resolution = resolution
+        self.resolution = tuple(resolution)
+        self.poll_interval = poll_interval
+        self.thread = None
+        self._stopped = threading.Event()
         self.ser = None
         self.camera = None
         self.raw_capture = None
@@ -65,17 +87,42 @@ class FerrocellSensor:
         self.sextet = {'resistance': 1e-9, 'capacitance': 0.0, 'permeability': 1.0,
                        'magnetism': 0.0, 'permittivity': 1.0, 'dielectricity': 0.0}
         self.visual_grid = np.zeros(self.resolution, dtype=np.float32)
+        self.frame_id = 0  # Bumped with every new visual grid, so consumers can cache derived frames
 
         # --- Calibration Baselines ---
         self.solenoid_baseline = None
         self.toroid_baseline = None
         self._capture_baselines()  # Initial capture
 
-        # Start the background thread for polling.
-        self.thread = threading.Thread(target=self._poll_sensors, daemon=True)
+        if autostart: self.start()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Starts the background polling thread (once)."""
+        if self.running: return
+        self._stopped.clear()
+        self.thread = threading.Thread(target=self._poll_sensors, daemon=True, name='FerrocellSensor')
         self.thread.start()
         print("INFO: FerrocellSensor thread started.")
 
+    def stop(self):
+        """Stops the polling thread; the last frame and sextet stay readable."""
+        self._stopped.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=max(1.0, 2 * self.poll_interval))
+        self.thread = None
+
+    def step(self, frames=1):
+        """Polls `frames` times on the caller's thread (for a sensor that is not running)."""
+        for _ in range(frames):
+            self.poll()
+
+    def _now(self):
+        return time.time()
+
     def _capture_baselines(self):
         """Captures baseline images from solenoid and toroid ferrocells (mocked if no hardware)."""
         print("INFO: Capturing calibration baselines...")
@@ -98,10 +145,10 @@ class FerrocellSensor:
                 print(f"ERROR: Failed to capture baselines: {e}")
         else:
             # Mock baselines
-            self.solenoid_baseline = np.random.uniform(0, 0.1, self.resolution)
-            self.toroid_baseline = np.random.uniform(0, 0.15, self.resolution)
+            self.solenoid_baseline = self.np_rng.uniform(0, 0.1, self.resolution)
+            self.toroid_baseline = self.np_rng.uniform(0, 0.15, self.resolution)
         
-        self.last_calibration_time = time.time()
+        self.last_calibration_time = self._now()
         print("INFO: Baseline capture complete.")
 
     def get_solenoid_baseline(self):
@@ -113,66 +160,250 @@ class FerrocellSensor:
         return self.toroid_baseline if self.toroid_baseline is not None else None
 
     def _poll_sensors(self):
-        """The main loop for the sensor polling thread. Updates all sensor data."""
-        while True:
-            # --- Check for Recalibration ---
-            if time.time() - self.last_calibration_time > self.calibration_interval:
-                print("\n< Sensor Hook: Calibration interval elapsed. Recapturing baselines. >")
-                self._capture_baselines()
-
-            # --- Poll Sextet Data ---
-            if self.ser and self.ser.is_open:
-                # Real hardware read
-                try:
-                    self.ser.write(b'READ_SEXTET\n')
-                    data = self.ser.readline().decode().strip()
-                    if data and len(data.split(',')) == 6:
-                        values = list(map(float, data.split(',')))
-                        keys = list(self.sextet.keys())
-                        self.sextet = dict(zip(keys, values))
-                except Exception as e:
-                    print(f"ERROR: Failed to read from serial device: {e}")
-            else:
-                # Mock sextet data
-                t = time.time()
-                self.sextet['permeability'] = 0.5 + (np.sin(t * 0.1) * 0.5)
-                self.sextet['magnetism'] = random.uniform(0.0, 0.2)
-
-            # --- Poll Visual Data ---
-            if self.camera:
-                # Real camera capture
-                try:
-                    self.camera.capture(self.raw_capture, format="bgr", use_video_port=True)
-                    image = self.raw_capture.array
-                    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                    self.visual_grid = gray_image / 255.0
-                    self.raw_capture.truncate(0)
-                except Exception as e:
-                    print(f"ERROR: Failed to capture from PiCamera: {e}")
-            else:
-                # Mock visual data
-                x = np.linspace(-np.pi, np.pi, self.resolution[1])
-                y = np.linspace(-np.pi, np.pi, self.resolution[0])
-                xx, yy = np.meshgrid(x, y)
-                t = time.time()
-                self.visual_grid = 0.5 * (1 + np.sin(xx * 2 + t) * np.cos(yy * 2 + t))
+        """The main loop for the sensor polling thread: one poll every poll_interval until stopped."""
+        while not self._stopped.is_set():
+            self.poll()
+            self._stopped.wait(self.poll_interval)
 
-            time.sleep(0.1)
+    def poll(self):
+        """Reads the sextet and the visual grid once, recalibrating when the interval has elapsed."""
+        # --- Check for Recalibration ---
+        if self._now() - self.last_calibration_time > self.calibration_interval:
+            print("\n< Sensor Hook: Calibration interval elapsed. Recapturing baselines. >")
+            self._capture_baselines()
+
+        # --- Poll Sextet Data ---
+        if self.ser and self.ser.is_open:
+            # Real hardware read
+            try:
+                self.ser.write(b'READ_SEXTET\n')
+                data = self.ser.readline().decode().strip()
+                if data and len(data.split(',')) == 6:
+                    values = list(map(float, data.split(',')))
+                    keys = list(self.sextet.keys())
+                    self.sextet = dict(zip(keys, values))
+            except Exception as e:
+                print(f"ERROR: Failed to read from serial device: {e}")
+        else:
+            # Mock sextet data
+            t = self._now()
+            self.sextet['permeability'] = 0.5 + (np.sin(t * 0.1) * 0.5)
+            self.sextet['magnetism'] = self.rng.uniform(0.0, 0.2)
+
+        # --- Poll Visual Data ---
+        if self.camera:
+            # Real camera capture
+            try:
+                self.camera.capture(self.raw_capture, format="bgr", use_video_port=True)
+                image = self.raw_capture.array
+                gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                self.visual_grid = gray_image / 255.0
+                self.frame_id += 1
+                self.raw_capture.truncate(0)
+            except Exception as e:
+                print(f"ERROR: Failed to capture from PiCamera: {e}")
+        else:
+            # Mock visual data
+            x = np.linspace(-np.pi, np.pi, self.resolution[1])
+            y = np.linspace(-np.pi, np.pi, self.resolution[0])
+            xx, yy = np.meshgrid(x, y)
+            t = self._now()
+            self.visual_grid = 0.5 * (1 + np.sin(xx * 2 + t) * np.cos(yy * 2 + t))
+            self.frame_id += 1
 
     def get_sextet(self):
         """Provides a thread-safe copy of the latest sextet data."""
         return self.sextet.copy()
 
+    def get_sextet_vector(self, keys):
+        """The latest sextet as a float64 vector ordered by `keys`."""
+        sextet = self.sextet
+        return np.fromiter((sextet[k] for k in keys), dtype=np.float64, count=len(keys))
+
     def get_visual_grid(self):
         """Provides a thread-safe copy of the latest visual grid data."""
         return self.visual_grid.copy() if self.visual_grid is not None else None
 
-# Create a single, global instance of the sensor.
-ferro_sensor = FerrocellSensor(mock_mode=True, resolution=(128, 128))
+class SynchronousSensor(FerrocellSensor):
+    """A seeded mock sensor with no thread: each step() is one poll on a simulated clock, so runs repeat exactly."""
+    def __init__(self, resolution=(128, 128), seed=0, poll_interval=POLL_INTERVAL):
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.ticks = 0
+        super().__init__(mock_mode=True, resolution=resolution, poll_interval=poll_interval, autostart=False)
+        self.poll()  # The first frame, as a started sensor would have
+
+    def _now(self):
+        return self.ticks * self.poll_interval
+
+    def start(self):
+        pass  # Never threaded
+
+    def step(self, frames=1):
+        for _ in range(frames):
+            self.ticks += 1
+            self.poll()
+
+class RecordedSensor(FerrocellSensor):
+    """Plays back a record_sensor() recording, looping; stepped, or threaded at the recorded rate."""
+    def __init__(self, path, loop=True, poll_interval=None, autostart=False):
+        with np.load(path) as data:
+            self.keys = [str(k) for k in data['keys']]
+            self.sextets = data['sextet']
+            self.frames = data['visual']
+            self.recorded_baselines = tuple(data[k] if k in data else None for k in ('solenoid_baseline', 'toroid_baseline'))
+            recorded_interval = float(data['poll_interval'])
+        self.loop = loop
+        self.position = 0  # Index of the next frame
+        super().__init__(mock_mode=True, resolution=self.frames.shape[1:], poll_interval=poll_interval or recorded_interval,
+                         autostart=autostart)
+        self.poll()
+
+    def _capture_baselines(self):
+        self.solenoid_baseline, self.toroid_baseline = self.recorded_baselines
+        self.last_calibration_time = self._now()
+
+    def poll(self):
+        if self.position >= len(self.frames):
+            if not self.loop: return
+            self.position = 0
+        self.sextet = dict(zip(self.keys, self.sextets[self.position].tolist()))
+        self.visual_grid = self.frames[self.position]
+        self.position += 1
+        self.frame_id += 1
+
+def record_sensor(sensor, path, frames):
+    """Records the next `frames` polls of a sensor (stepping it if it isn't running) to an .npz for RecordedSensor."""
+    keys = list(sensor.get_sextet())
+    sextets = np.empty((frames, len(keys)))
+    visual = np.empty((frames,) + sensor.resolution, sensor.get_visual_grid().dtype)
+    for i in range(frames):
+        if sensor.running:
+            seen = sensor.frame_id
+            while sensor.frame_id == seen: time.sleep(sensor.poll_interval / 4)
+        else:
+            sensor.step()
+        sextets[i] = sensor.get_sextet_vector(keys)
+        visual[i] = sensor.get_visual_grid()
+    baselines = {k: v for k, v in (('solenoid_baseline', sensor.get_solenoid_baseline()),
+                                   ('toroid_baseline', sensor.get_toroid_baseline())) if v is not None}
+    with open(path, 'wb') as f:  # A file object, so numpy doesn't append its own .npz
+        np.savez(f, keys=np.array(keys), sextet=sextets, visual=visual, poll_interval=sensor.poll_interval, **baselines)
+
+# --- Sensor Lifecycle ---
+SENSOR_KINDS = {
+    'mock': lambda **options: FerrocellSensor(mock_mode=True, autostart=False, **options),
+    'hardware': lambda **options: FerrocellSensor(mock_mode=False, autostart=False, **options),
+    'synchronous': SynchronousSensor,
+    'recorded': RecordedSensor,
+}
+
+class SensorManager:
+    """Named sensors shared by reference count: the first acquire() creates and starts one, the last release() stops it."""
+    def __init__(self):
+        self.sensors = {}
+        self.users = {}
+        self.lock = threading.Lock()
+
+    def create(self, name, kind='mock', **options):
+        """A new, stopped sensor of `kind` registered as `name` (options go to its constructor)."""
+        with self.lock:
+            if name in self.sensors: raise ValueError(f"SENSUS '{name}' IAM EXISTIT")
+            return self._create(name, kind, options)
+
+    def _create(self, name, kind, options):
+        if kind not in SENSOR_KINDS: raise ValueError(f"SENSUS '{kind}' IGNOTUS")
+        sensor = self.sensors[name] = SENSOR_KINDS[kind](**options)
+        self.users[name] = 0
+        return sensor
+
+    def get(self, name):
+        sensor = self.sensors.get(name)
+        if sensor is None: raise ValueError(f"SENSUS '{name}' NON EXISTIT")
+        return sensor
+
+    def acquire(self, name, kind='mock', **options):
+        """The started sensor `name`, with one more user; created from `kind` and `options` if new."""
+        with self.lock:
+            sensor = self.sensors.get(name) or self._create(name, kind, options)
+            self.users[name] += 1
+        sensor.start()
+        return sensor
+
+    def release(self, name):
+        """Drops one user of `name`; the last one stops the sensor and forgets it."""
+        with self.lock:
+            self.get(name)
+            self.users[name] -= 1
+            if self.users[name] > 0: return
+            sensor = self.sensors.pop(name)
+            del self.users[name]
+        sensor.stop()
+
+    def start(self, name):
+        self.get(name).start()
+
+    def stop(self, name):
+        self.get(name).stop()
+
+    def set_rate(self, name, poll_interval):
+        """Changes how often `name` polls; a running thread picks it up after its current wait."""
+        if poll_interval <= 0: raise ValueError("INTERVALLUM DEBET ESSE POSITIVUM")
+        self.get(name).poll_interval = poll_interval
+
+    def close(self):
+        """Stops and forgets every sensor."""
+        with self.lock:
+            sensors = list(self.sensors.values())
+            self.sensors.clear()
+            self.users.clear()
+        for sensor in sensors:
+            sensor.stop()
+
+SENSORS = SensorManager()
+FERRO_SENSOR = 'ferro'  # The manager's name for the global sensor
+
+# The global sensor is created on first access of sensor_hook.ferro_sensor, so
+# importing this module captures no baselines and starts no polling thread.
+_sensor_lock = threading.Lock()
+
+def get_ferro_sensor():
+    """The global sensor, acquired from SENSORS (and so created and started) on first use."""
+    sensor = globals().get('ferro_sensor')
+    if sensor is None:
+        with _sensor_lock:
+            sensor = globals().get('ferro_sensor')
+            if sensor is None:
+                sensor = SENSORS.acquire(FERRO_SENSOR, 'mock', resolution=(128, 128))
+                globals()['ferro_sensor'] = sensor  # Later lookups are plain attribute reads
+    return sensor
+
+def __getattr__(name):
+    if name == 'ferro_sensor': return get_ferro_sensor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Cores created or grounded while a command runs use the sensor bound here by
+# their Contextus, unless they have one of their own
+_bound = contextvars.ContextVar('bound_sensor', default=None)
+
+def active_sensor():
+    """The sensor bound to the running command, else the global ferro_sensor."""
+    sensor = _bound.get()
+    return sensor if sensor is not None else get_ferro_sensor()
+
+@contextlib.contextmanager
+def bound_sensor(sensor):
+    """Makes `sensor` the active one inside the block (None keeps the global)."""
+    token = _bound.set(sensor)
+    try:
+        yield sensor
+    finally:
+        _bound.reset(token)
 
 if __name__ == '__main__':
     print("--- Running sensor_hook.py standalone test (v5) ---")
     print("This demonstrates automatic recalibration after a short interval.")
+    ferro_sensor = get_ferro_sensor()
     ferro_sensor.calibration_interval = 5 # Set to 5 seconds for testing
     print("Press Ctrl+C to stop.")
     try:
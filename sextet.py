@@ -0,0 +1,58 @@
+# sextet.py
+#
+# Description:
+# The shared sextet table. Instead of six attributes in every core's __dict__,
+# each FluxCore owns one row of a plenum-wide float64 table, so syncing from the
+# ferro_sensor is a single row copy, a core's sextet costs 48 bytes, and every
+# core's sextet can be read as one array. Writes go through the table lock,
+# since growing the table rebinds its array.
+
+import threading
+import numpy as np
+
+SEXTET_KEYS = ('resistance', 'capacitance', 'magnetism', 'permeability', 'permittivity', 'dielectricity')
+_INITIAL_ROWS = 1024
+
+class SextetTable:
+    """A growable (rows, 6) float64 table; rows are handed out to cores and recycled when they die."""
+    def __init__(self, rows=_INITIAL_ROWS):
+        self.data = np.zeros((rows, len(SEXTET_KEYS)), dtype=np.float64)
+        self._free = list(range(rows - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reserves a zeroed row and returns its index."""
+        with self._lock:
+            if not self._free:
+                rows = len(self.data)
+                self.data = np.concatenate((self.data, np.zeros_like(self.data)))  # Cores hold indices, not views
+                self._free = list(range(2 * rows - 1, rows - 1, -1))
+            row = self._free.pop()
+            self.data[row] = 0.0
+            return row
+
+    def write(self, row, value, column=slice(None)):
+        """Writes a row (or one column of it) under the lock, so a concurrent growth can't drop it."""
+        with self._lock:
+            self.data[row, column] = value
+
+    def release(self, row):
+        with self._lock:
+            self._free.append(row)
+
+    def __len__(self):
+        return len(self.data) - len(self._free)
+
+SEXTET_TABLE = SextetTable()
+
+def sextet_property(key):
+    """A property reading and writing column `key` of the core's table row."""
+    column = SEXTET_KEYS.index(key)
+
+    def fget(self):
+        return self._table.data[self._row, column]
+
+    def fset(self, value):
+        self._table.write(self._row, value, column)
+
+    return property(fget, fset, doc=f"The core's {key}, stored in the shared sextet table.")
@@ -0,0 +1,50 @@
+# sim_clock.py
+#
+# Description:
+# The simulation clock for the Boyd OS. Between commands, cores keep flying:
+# every tick integrates each core's current thrust and drag over a fixed dt,
+# all cores at once in one state array. A SimulationClock thread ticks the
+# plenum at a fixed wall-clock interval through Contextus.regulate, so its
+# ticks are journaled and replay exactly like commands.
+
+import threading
+import numpy as np
+
+from em_integrator import COAST, advance
+
+TICK_DT = 0.1  # Simulated time integrated by one tick
+TICK_INTERVAL = 0.1  # Wall-clock seconds between ticks while the clock runs
+
+def tick_cores(cores, steps=1, dt=TICK_DT):
+    """Coasts every E-M core through `steps` ticks of `dt` in one vectorized pass; returns the count."""
+    cores = [core for core in cores if hasattr(core, 'em_state')]
+    if not cores or steps < 1: return 0
+    state = np.concatenate([core.em_state() for core in cores])
+    advance(state, np.full(steps, COAST, np.uint8), dt=dt)
+    for i, core in enumerate(cores):
+        core.touch()
+        core.adopt_em_state(state[i:i + 1])
+    return len(cores)
+
+class SimulationClock(threading.Thread):
+    """Ticks a context's plenum every `interval` seconds until stopped."""
+    def __init__(self, context, dt=TICK_DT, interval=TICK_INTERVAL):
+        super().__init__(daemon=True)
+        self.context = context
+        self.dt = dt
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            while not self.context.lock.acquire(timeout=self.interval):
+                if self.stopped.is_set(): return  # stop() may hold the plenum lock while joining
+            try:
+                if not self.stopped.is_set(): self.context.regulate(None, 'tick', 1, self.dt)
+            finally:
+                self.context.lock.release()
+
+    def stop(self):
+        """Stops ticking and waits out a tick in flight, so none lands after the clock is stopped."""
+        self.stopped.set()
+        if self.is_alive() and self is not threading.current_thread(): self.join()
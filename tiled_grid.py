@@ -0,0 +1,250 @@
+# tiled_grid.py
+#
+# Description:
+# A sparse, tiled grid for very large, mostly-empty cores. The plane is cut
+# into fixed-size tiles that are allocated on first write; everything else is
+# a single background value. Writes mark their tile dirty, and converge only
+# smooths dirty tiles plus a one-tile halo, keeping a tile dirty until it
+# settles. Per-tile sums are cached, so the grid-wide statistics the sextet
+# needs cost O(tiles touched) rather than O(size^2).
+
+import numpy as np
+from kernels import Kernel, collapse, smooth
+from precision import add_at, precision_of
+
+TILE_SIZE = 64
+SETTLE_TOLERANCE = 1e-6  # A converged tile whose cells move less than this is no longer dirty
+
+class TiledGrid:
+    """A size x size grid stored as lazily allocated tiles over a uniform background."""
+    def __init__(self, size, tile=TILE_SIZE, dtype=np.float32, fill=0.0):
+        self.size = size
+        self.tile = tile
+        self.dtype = np.dtype(dtype)
+        self.shape = (size, size)
+        self.ntiles = -(-size // tile)  # Tiles per side
+        self.fill = float(fill)  # Value of every cell outside an allocated tile
+        self.tiles = {}  # (ti, tj) -> ndarray
+        self.dirty = set()
+        self._stats = {}  # (ti, tj) -> (sum, sum of squares), valid until the tile changes
+
+    # --- Tile bookkeeping ---
+
+    def _bounds(self, key):
+        ti, tj = key
+        y0, x0 = ti * self.tile, tj * self.tile
+        return y0, min(y0 + self.tile, self.size), x0, min(x0 + self.tile, self.size)
+
+    def _tile(self, key):
+        """The tile at `key`, allocated at the background value if needed."""
+        tile = self.tiles.get(key)
+        if tile is None:
+            y0, y1, x0, x1 = self._bounds(key)
+            tile = self.tiles[key] = np.full((y1 - y0, x1 - x0), self.fill, self.dtype)
+        return tile
+
+    def _touch(self, key):
+        self.dirty.add(key)
+        self._stats.pop(key, None)
+
+    def _neighbors(self, key, reach=1):
+        ti, tj = key
+        for di in range(-reach, reach + 1):
+            for dj in range(-reach, reach + 1):
+                ni, nj = ti + di, tj + dj
+                if 0 <= ni < self.ntiles and 0 <= nj < self.ntiles:
+                    yield ni, nj
+
+    def block(self, y0, y1, x0, x1, dtype=None):
+        """A dense copy of rows y0:y1 and columns x0:x1, assembled from tiles and background."""
+        out = np.full((y1 - y0, x1 - x0), self.fill, dtype or self.dtype)
+        t = self.tile
+        for ti in range(y0 // t, (y1 - 1) // t + 1):
+            for tj in range(x0 // t, (x1 - 1) // t + 1):
+                tile = self.tiles.get((ti, tj))
+                if tile is None: continue
+                ty0, tx0 = ti * t, tj * t
+                sy0, sy1 = max(y0, ty0), min(y1, ty0 + tile.shape[0])
+                sx0, sx1 = max(x0, tx0), min(x1, tx0 + tile.shape[1])
+                out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = tile[sy0 - ty0:sy1 - ty0, sx0 - tx0:sx1 - tx0]
+        return out
+
+    # --- Element access and writes ---
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple) and len(index) == 2 and all(isinstance(i, (int, np.integer)) for i in index):
+            y, x = index
+            tile = self.tiles.get((y // self.tile, x // self.tile))
+            return self.dtype.type(self.fill) if tile is None else tile[y % self.tile, x % self.tile]
+        return np.asarray(self)[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, tuple) and len(index) == 2 and all(isinstance(i, (int, np.integer)) for i in index):
+            y, x = index
+            key = (y // self.tile, x // self.tile)
+            self._tile(key)[y % self.tile, x % self.tile] = value
+            self._touch(key)
+            return
+        dense = np.asarray(self)
+        dense[index] = value
+        self._load(dense)
+
+    def add_at(self, ys, xs, values):
+        """Unbuffered scatter-add (like np.add.at), grouped so each touched tile is visited once."""
+        ys, xs = np.asarray(ys, dtype=np.int64).ravel(), np.asarray(xs, dtype=np.int64).ravel()
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), ys.shape)
+        if ys.size == 0: return
+        keys = (ys // self.tile) * self.ntiles + xs // self.tile
+        order = np.argsort(keys, kind='stable')
+        keys, ys, xs, values = keys[order], ys[order], xs[order], values[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        for start, end in zip(starts, np.r_[starts[1:], keys.size]):
+            key = divmod(int(keys[start]), self.ntiles)
+            tile = self._tile(key)
+            add_at(tile, (ys[start:end] % self.tile, xs[start:end] % self.tile), values[start:end], precision_of(tile))
+            self._touch(key)
+
+    def _load(self, dense):
+        """Replaces the contents with a dense array, keeping only tiles that differ from the background."""
+        dense = np.asarray(dense)
+        flat = dense.ravel()
+        values, counts = np.unique(flat[:: max(1, flat.size // 4096)], return_counts=True)
+        self.fill = float(values[np.argmax(counts)]) if values.size else 0.0
+        self.tiles, self.dirty, self._stats = {}, set(), {}
+        for ti in range(self.ntiles):
+            for tj in range(self.ntiles):
+                y0, y1, x0, x1 = self._bounds((ti, tj))
+                block = dense[y0:y1, x0:x1]
+                if np.any(block != self.fill):
+                    self.tiles[(ti, tj)] = block.astype(self.dtype)
+
+    @classmethod
+    def from_dense(cls, dense, tile=TILE_SIZE):
+        dense = np.asarray(dense)
+        grid = cls(dense.shape[0], tile, dense.dtype)
+        grid._load(dense)
+        return grid
+
+    def pack(self):
+        """(layout, bytes) of the background and allocated tiles, without densifying the plane."""
+        keys = sorted(self.tiles)
+        layout = {'size': self.size, 'tile': self.tile, 'fill': self.fill, 'tiles': [list(key) for key in keys]}
+        return layout, b''.join(np.ascontiguousarray(self.tiles[key]).tobytes() for key in keys)
+
+    @classmethod
+    def unpack(cls, layout, payload, dtype):
+        """Rebuilds a grid from pack()'s layout and bytes."""
+        grid = cls(layout['size'], layout['tile'], dtype, layout['fill'])
+        offset = 0
+        for key in map(tuple, layout['tiles']):
+            y0, y1, x0, x1 = grid._bounds(key)
+            count = (y1 - y0) * (x1 - x0)
+            grid.tiles[key] = np.frombuffer(payload, grid.dtype, count, offset).reshape(y1 - y0, x1 - x0).copy()
+            offset += count * grid.dtype.itemsize
+        return grid
+
+    def __array__(self, dtype=None, copy=None):
+        return self.block(0, self.size, 0, self.size, dtype)
+
+    def astype(self, dtype, copy=True):
+        return np.asarray(self).astype(dtype, copy=False)
+
+    @property
+    def nbytes(self):
+        """Bytes held by allocated tiles."""
+        return sum(tile.nbytes for tile in self.tiles.values())
+
+    # --- Statistics ---
+
+    def _tile_sums(self, key):
+        stats = self._stats.get(key)
+        if stats is None:
+            tile = self.tiles[key].astype(np.float64)
+            stats = self._stats[key] = (float(tile.sum()), float(np.vdot(tile, tile)))
+        return stats
+
+    def tile_stats(self):
+        """Per-tile (mean, variance) of every allocated tile."""
+        stats = {}
+        for key, tile in self.tiles.items():
+            s, ss = self._tile_sums(key)
+            mean = s / tile.size
+            stats[key] = (mean, max(0.0, ss / tile.size - mean * mean))
+        return stats
+
+    def moments(self):
+        """(mean, variance, sum) of the whole plane, from cached tile sums and the background."""
+        n = self.size * self.size
+        covered = sum(tile.size for tile in self.tiles.values())
+        total = (n - covered) * self.fill
+        total_sq = (n - covered) * self.fill * self.fill
+        for key in self.tiles:
+            s, ss = self._tile_sums(key)
+            total += s
+            total_sq += ss
+        mean = total / n
+        return mean, max(0.0, total_sq / n - mean * mean), total
+
+    def mean(self):
+        return self.moments()[0]
+
+    def max(self):
+        peaks = [float(tile.max()) for tile in self.tiles.values()]
+        if sum(tile.size for tile in self.tiles.values()) < self.size * self.size: peaks.append(self.fill)
+        return max(peaks)
+
+    def blend(self, level, weight):
+        """Moves every cell toward `level` by `weight` (0..1), i.e. grid * (1 - weight) + level * weight."""
+        for tile in self.tiles.values():
+            compute = np.result_type(tile.dtype, np.float32)
+            tile[:] = tile.astype(compute) * (1 - weight) + level * weight
+        self.fill = self.fill * (1 - weight) + level * weight
+        self._stats.clear()
+
+    # --- Convergence ---
+
+    def converge(self, offset=0.0, kernel=None, compute=np.float32, iterations=1):
+        """Smooths dirty tiles plus their halo, adds `offset` everywhere and clips at zero."""
+        kernel = kernel or Kernel.box(1)
+        floor = min([self.fill] + [float(tile.min()) for tile in self.tiles.values()])
+        single = collapse(kernel, iterations, offset, floor)
+        if single is None:
+            for _ in range(iterations): self._converge(offset, kernel, compute)
+        else:
+            self._converge(single[1], single[0], compute)
+
+    def _converge(self, offset, kernel, compute):
+        compute = np.dtype(compute).type
+        pad = kernel.radius
+        reach = -(-pad // self.tile)  # A wide kernel's halo spans several tiles
+        active = {n for key in self.dirty for n in self._neighbors(key, reach)}
+        updated = {}
+        for key in active:
+            y0, y1, x0, x1 = self._bounds(key)
+            ry0, ry1 = max(0, y0 - pad), min(self.size, y1 + pad)
+            rx0, rx1 = max(0, x0 - pad), min(self.size, x1 + pad)
+            region = self.block(ry0, ry1, rx0, rx1, compute)
+            smoothed = smooth(region, kernel)[y0 - ry0:y1 - ry0, x0 - rx0:x1 - rx0] + compute(offset)
+            updated[key] = np.clip(smoothed, 0, None, out=smoothed)
+
+        for key, tile in self.tiles.items():
+            if key not in updated:
+                tile += offset
+                np.clip(tile, 0, None, out=tile)
+                self._stats.pop(key, None)
+        self.fill = max(0.0, self.fill + offset)
+
+        self.dirty = set()
+        for key, block in updated.items():
+            old = self.tiles.get(key)
+            previous = np.full(block.shape, self.fill, compute) if old is None else old.astype(compute) + compute(offset)
+            self._stats.pop(key, None)
+            if np.max(np.abs(block - previous)) > SETTLE_TOLERANCE:
+                self.dirty.add(key)
+            elif np.max(np.abs(block - compute(self.fill))) <= SETTLE_TOLERANCE:
+                self.tiles.pop(key, None)  # Settled back into the background
+                continue
+            self.tiles[key] = block.astype(self.dtype)
+
+    def __repr__(self):
+        return f"TiledGrid({self.size}x{self.size}, {len(self.tiles)}/{self.ntiles ** 2} tiles, {len(self.dirty)} dirty)"
@@ -0,0 +1,334 @@
+# training.py
+#
+# Description:
+# The EXERCEO training machinery. A data stream is memory-mapped and reduced to
+# one amplitude per chunk in a single vectorized pass. The amplitudes are then
+# applied to the target Intellectus in batches, so the plenum lock is taken once
+# per batch instead of once per chunk. Every stream into every core runs on one
+# TrainingScheduler: a bounded reader pool maps and reduces blocks while a single
+# applier interleaves their batches fairly per core and reports progress.
+
+import collections
+import glob
+import itertools
+import mmap
+import os
+import queue
+import random
+import threading
+import time
+import numpy as np
+
+CHUNK_SIZE = 256
+CONVERGE_EVERY = 64  # Chunks applied between convergences
+THROTTLE = (0.05, 0.15)  # The old jittered rhythm, now opt-in
+QUEUE_DEPTH = 8  # Reduced blocks in flight per job
+REPORT_INTERVAL = 5.0  # Seconds between progress reports
+MAX_WORKERS = 4  # Reader/compute threads shared by all scheduled streams
+FINISHED_KEPT = 32  # Finished jobs held until their status is reported
+
+# --- Amplitude Kernels ---
+
+def chunk_amplitudes(buffer, chunk_size=CHUNK_SIZE):
+    """Reduces a byte buffer to one log-amplitude per chunk (reshape, sum, log1p)."""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    full = len(data) - len(data) % chunk_size
+    sums = data[:full].reshape(-1, chunk_size).sum(axis=1, dtype=np.uint64)
+    if full < len(data):
+        sums = np.append(sums, data[full:].sum(dtype=np.uint64))
+    return np.log1p(sums)
+
+def stream_amplitudes(data_path, chunk_size=CHUNK_SIZE):
+    """Memory-maps a data file and returns the amplitude of every chunk."""
+    with open(data_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return np.zeros(0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return chunk_amplitudes(mm, chunk_size)
+
+def apply_amplitudes(core, amps, rng, mod=1.0):
+    """Scatters a batch of amplitudes across the core, then converges once."""
+    xs, ys = rng.integers(0, core.size, size=(2, len(amps)))
+    core.perturb_batch(xs, ys, amps, mod)
+    core.converge()
+
+def mapped_blocks(path, block_size, offset=0):
+    """Memory-maps a data file and yields (offset, block) views from `offset` on."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= offset: return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(offset, len(mm), block_size):
+                yield start, mm[start:start + block_size]
+
+_DONE = object()  # End-of-stream marker passed from the workers to the applier
+
+# --- Multi-Stream Scheduling ---
+
+def expand_flumina(patterns):
+    """Expands file globs and directories into a sorted list of data files."""
+    paths = []
+    for pattern in patterns:
+        for match in sorted(glob.glob(os.path.expanduser(pattern))) or [pattern]:
+            if os.path.isdir(match):
+                paths.extend(sorted(os.path.join(match, n) for n in os.listdir(match)
+                                    if os.path.isfile(os.path.join(match, n))))
+            elif os.path.isfile(match):
+                paths.append(match)
+    return paths
+
+class TrainingJob:
+    """One core's share of an EXERCEO request: a list of files streamed into it."""
+    _ids = itertools.count(1)
+
+    def __init__(self, core_name, core, paths, block_size, queue_depth=QUEUE_DEPTH, throttle=None):
+        self.id = next(self._ids)
+        self.core_name = core_name
+        self.core = core
+        self.paths = list(paths)
+        self.block_size = block_size
+        self.throttle = throttle
+        self.state = 'QUEUED'
+        self.batches = queue.Queue(maxsize=queue_depth)
+        self.pending = list(self.paths)  # Files not yet claimed by a worker
+        self.offsets = {}  # path -> byte offset to resume from, for files parked while paused
+        self.files_done = 0
+        self.bytes_done = 0
+        self.chunks_done = 0
+        self.started_at = None
+        self.reported_at = None  # Last progress report, set when the first file is claimed
+        self.due = 0.0  # Earliest time the applier may serve this job again
+        self.paused = threading.Event()
+        self.cancelled = threading.Event()
+
+    def alive(self, context):
+        return not self.cancelled.is_set() and context.materiae.get(self.core_name) is self.core
+
+    def status(self):
+        elapsed = max(time.time() - (self.started_at or time.time()), 1e-9)
+        return {'id': self.id, 'core': self.core_name, 'state': self.state,
+                'files': len(self.paths), 'files_done': self.files_done,
+                'bytes': self.bytes_done, 'chunks': self.chunks_done,
+                'bytes_per_s': self.bytes_done / elapsed, 'chunks_per_s': self.chunks_done / elapsed}
+
+    def report(self, interval=REPORT_INTERVAL):
+        """Prints throughput at most once per `interval` seconds."""
+        now = time.time()
+        if self.reported_at is None or now - self.reported_at < interval: return
+        self.reported_at = now
+        p = self.status()
+        print(f"\n< EXERCEO '{self.core_name}' (#{self.id}): {p['bytes'] / 1e6:.1f} MB, "
+              f"{p['bytes_per_s'] / 1e6:.2f} MB/s, {p['chunks_per_s']:.0f} chunks/s >")
+
+class TrainingScheduler:
+    """Runs every EXERCEO stream of a plenum on a bounded worker pool.
+
+    Workers read and reduce files, taking turns across jobs. A single applier
+    drains the per-job batch queues in rounds. Each round applies at most one batch
+    per core and takes the plenum lock once, so many concurrent streams don't
+    contend for the lock and no core starves another.
+    """
+    def __init__(self, context, max_workers=MAX_WORKERS, chunk_size=CHUNK_SIZE,
+                 converge_every=CONVERGE_EVERY, queue_depth=QUEUE_DEPTH, rng=None,
+                 report_interval=REPORT_INTERVAL):
+        self.context = context
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.converge_every = converge_every
+        self.queue_depth = queue_depth
+        self.rng = rng or np.random.default_rng()
+        self.report_interval = report_interval
+        self.jobs = []  # Jobs in flight
+        self.finished = collections.deque(maxlen=FINISHED_KEPT)  # Settled jobs not yet reported
+        self._cursor = 0  # Rotates which job the workers serve first
+        self._mutex = threading.Condition()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def submit(self, core_names, patterns, converge_every=None, throttle=None):
+        """Queues the files matching `patterns` for each named core; returns the new jobs."""
+        paths = expand_flumina(patterns)
+        if not paths: return []
+        jobs = []
+        for name in core_names:
+            core = self.context.materiae.get(name)
+            if core is None: raise ValueError(f"MATERIA '{name}' NON EXISTIT")
+            block_size = self.chunk_size * (converge_every or self.converge_every)
+            jobs.append(TrainingJob(name, core, paths, block_size, self.queue_depth, throttle))
+        with self._mutex:
+            self.jobs.extend(jobs)
+            self._ensure_started()
+            self._mutex.notify_all()
+        for job in jobs:
+            print(f"\n< EXERCEO begins for '{job.core_name}' with {len(paths)} flumina (#{job.id}) >")
+        return jobs
+
+    def status(self, core_names=None):
+        """Rows for the named cores' jobs; settled jobs are dropped once reported."""
+        with self._mutex:
+            rows = [job for job in itertools.chain(self.jobs, self.finished)
+                    if not core_names or job.core_name in core_names]
+            for job in rows:
+                if job in self.finished: self.finished.remove(job)
+            return [job.status() for job in rows]
+
+    def select(self, core_names=None):
+        """Jobs still in flight, optionally restricted to the named cores."""
+        with self._mutex:
+            return [job for job in self.jobs if not core_names or job.core_name in core_names]
+
+    def pause(self, core_names=None):
+        with self._mutex:
+            jobs = self.select(core_names)
+            for job in jobs:
+                job.paused.set()
+                job.state = 'PAUSED'
+        return len(jobs)
+
+    def resume(self, core_names=None):
+        with self._mutex:
+            jobs = [job for job in self.select(core_names) if job.paused.is_set()]
+            for job in jobs:
+                job.paused.clear()
+                job.state = 'RUNNING' if job.started_at else 'QUEUED'
+            self._mutex.notify_all()
+        return len(jobs)
+
+    def cancel(self, core_names=None):
+        jobs = self.select(core_names)
+        for job in jobs:
+            job.cancelled.set()
+            self._settle(job, 'CANCELLED')
+        self._wakeup.set()
+        return len(jobs)
+
+    def shutdown(self):
+        """Cancels every job and stops the pool; called when the context closes."""
+        self.cancel()
+        self._stopped.set()
+        with self._mutex:
+            self._mutex.notify_all()
+        for t in self._threads:
+            if t is not threading.current_thread(): t.join(timeout=1.0)
+
+    def _ensure_started(self):
+        if self._threads: return
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(self.max_workers)]
+        self._threads.append(threading.Thread(target=self._apply, daemon=True))
+        for t in self._threads: t.start()
+
+    # --- Worker pool: read and reduce ---
+
+    def _next_task(self):
+        """Claims the next file, rotating across jobs so one large job can't hog the pool."""
+        with self._mutex:
+            while not self._stopped.is_set():
+                for i in range(len(self.jobs)):
+                    job = self.jobs[(self._cursor + i) % len(self.jobs)]
+                    if job.pending and not job.paused.is_set() and not job.cancelled.is_set():
+                        self._cursor = (self._cursor + i + 1) % len(self.jobs)
+                        if job.started_at is None:
+                            job.started_at = job.reported_at = time.time()
+                            job.state = 'RUNNING'
+                        return job, job.pending.pop(0)
+                self._mutex.wait(0.5)
+        return None, None
+
+    def _work(self):
+        while True:
+            job, path = self._next_task()
+            if job is None: return
+            parked = False
+            try:
+                for offset, block in mapped_blocks(path, job.block_size, job.offsets.pop(path, 0)):
+                    if not job.alive(self.context): break
+                    if job.paused.is_set() or not self._offer(job, (chunk_amplitudes(block, self.chunk_size), len(block))):
+                        parked = job.paused.is_set() and job.alive(self.context) and not self._stopped.is_set()
+                        if parked: self._park(job, path, offset)
+                        break
+            except (OSError, ValueError) as e:
+                print(f"\n< EXERCEO: Flumine '{path}' skipped: {e} >")
+            if parked: continue
+            with self._mutex:
+                job.files_done += 1
+                last = job.files_done == len(job.paths)
+            if last: self._offer(job, _DONE)
+
+    def _park(self, job, path, offset):
+        """Hands a paused job's file back with its offset, freeing the worker for other jobs."""
+        with self._mutex:
+            job.offsets[path] = offset
+            job.pending.insert(0, path)
+
+    def _offer(self, job, item):
+        """Blocks while the job's batch queue is full, giving up if the job dies or is paused."""
+        while job.alive(self.context) and not self._stopped.is_set():
+            if job.paused.is_set() and item is not _DONE: return False
+            try:
+                job.batches.put(item, timeout=0.1)
+                self._wakeup.set()
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # --- Applier: fair rounds under one lock ---
+
+    def _apply(self):
+        while not self._stopped.is_set():
+            round_ = self._collect_round()
+            if not round_:
+                self._wakeup.wait(0.1)
+                self._wakeup.clear()
+                continue
+            with self.context.lock:
+                for job, batch in round_:
+                    if batch is _DONE or not job.alive(self.context): continue
+                    apply_amplitudes(job.core, batch[0], self.rng)
+            now = time.time()
+            for job, batch in round_:
+                if batch is _DONE:
+                    self._finish(job)
+                    continue
+                job.bytes_done += batch[1]
+                job.chunks_done += len(batch[0])
+                job.report(self.report_interval)
+                if job.throttle: job.due = now + random.uniform(*job.throttle)
+
+    def _collect_round(self):
+        """Takes at most one ready batch per core, retiring dead jobs on the way."""
+        round_, served = [], set()
+        now = time.time()
+        with self._mutex:
+            jobs = list(self.jobs)
+        for job in jobs:
+            if not job.alive(self.context):
+                self._retire(job)
+                continue
+            if job.core_name in served or job.paused.is_set() or job.due > now: continue
+            try:
+                batch = job.batches.get_nowait()
+            except queue.Empty:
+                continue
+            served.add(job.core_name)
+            round_.append((job, batch))
+        return round_
+
+    def _settle(self, job, state):
+        """Moves a job out of flight into the finished list; False if it had already settled."""
+        with self._mutex:
+            if job not in self.jobs: return False
+            self.jobs.remove(job)
+            job.state = state
+            self.finished.append(job)
+            return True
+
+    def _finish(self, job):
+        if not self._settle(job, 'COMPLETE'): return
+        p = job.status()
+        print(f"\n< EXERCEO complete for '{job.core_name}' (#{job.id}): {p['chunks']} chunks, "
+              f"{p['bytes_per_s'] / 1e6:.2f} MB/s, {p['chunks_per_s']:.0f} chunks/s. >")
+
+    def _retire(self, job):
+        if job.cancelled.is_set() or not self._settle(job, 'ABORTED'): return
+        print(f"\n< EXERCEO aborted: '{job.core_name}' no longer exists. >")